@@ -2,20 +2,69 @@
 Admin Commands for Robo Nexus Birthday Bot
 Administrative slash commands for server configuration
 """
+import csv
+import io
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 import logging
+import time
+from typing import List, Optional, Tuple
+from columnar_export import ColumnarExporter, columnar_formats
+from database import birthday_db
+from date_parser import DateParser
+from metrics_registry import timed_task
+from verification_stats import get_verification_stats
 
 logger = logging.getLogger(__name__)
 
 class AdminCommands(commands.Cog):
     """Cog containing administrative commands"""
     
+    # Birthday CSV import limits
+    IMPORT_CHUNK_SIZE = 500
+    IMPORT_MAX_BYTES = 2 * 1024 * 1024
+    IMPORT_MAX_ERRORS_SHOWN = 15
+    
     def __init__(self, bot):
         self.bot = bot
         from async_supabase_wrapper import get_async_supabase
         self.db = get_async_supabase()
+        # Live verification counts; the full reconcile only runs every few hours
+        self.verification_counts = get_verification_stats()
+        self.reconcile_verification_stats.start()
+    
+    def cog_unload(self):
+        self.reconcile_verification_stats.cancel()
+    
+    @tasks.loop(hours=6)
+    @timed_task("reconcile_verification_stats")
+    async def reconcile_verification_stats(self):
+        """Rebuild verification counts from the database in case an event was missed"""
+        try:
+            await self.verification_counts.reconcile(self.db, self.bot.guilds)
+        except Exception as e:
+            logger.error(f"Error reconciling verification stats: {e}")
+    
+    @reconcile_verification_stats.before_loop
+    async def before_reconcile_verification_stats(self):
+        await self.bot.wait_until_ready()
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self.verification_counts.on_member_join(member)
+    
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.verification_counts.on_member_remove(member)
+    
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        self.verification_counts.on_member_update(before, after)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.verification_counts.on_guild_remove(guild)
     
     @app_commands.command(name="set_birthday_channel", description="[ADMIN] Set the channel for birthday announcements")
     @app_commands.describe(channel="The channel where birthday messages will be sent")
@@ -210,60 +259,31 @@ class AdminCommands(commands.Cog):
                 await interaction.followup.send(embed=embed)
                 return
             
-            # Get verification data from database
-            from async_supabase_wrapper import get_async_supabase
-            db = get_async_supabase()
+            # Counts are kept current by member events and profile writes
+            stats = self.verification_counts.get(interaction.guild.id)
+            if stats is None:
+                await self.verification_counts.reconcile(self.db, [interaction.guild])
+                stats = self.verification_counts.get(interaction.guild.id)
+            if stats is None:
+                await interaction.followup.send("❌ Could not load verification data. Please try again later.")
+                return
             
-            # Get all user profiles (verified users)
-            try:
-                profiles = await db.get_all_user_profiles()
-            except Exception as e:
-                logger.error(f"Error getting user profiles: {e}")
-                profiles = []
-            
-            # Count verification statuses
-            verified_count = 0
-            pending_count = 0
-            self_role_count = 0
-            manual_verify_count = 0
-            
-            verified_users = []
+            total_members = stats.humans
+            verified_count = stats.verified
+            pending_count = len(stats.pending)
+            self_role_count = stats.self_role
+            manual_verify_count = stats.manual
+            unverified_count = stats.unverified
+            
+            verified_users = [
+                f"• {member.display_name} ({self.verification_counts.username(member.id)})"
+                for member in self.verification_counts.verified_members(interaction.guild)
+            ]
             pending_users = []
-            
-            for profile in profiles:
-                user_id = profile.get('user_id')
-                username = profile.get('username')
-                status = profile.get('verification_status', 'verified')  # Default to verified
-                stage = profile.get('verification_stage', 'complete')    # Default to complete
-                
-                # Try to get member from guild
-                try:
-                    member = interaction.guild.get_member(int(user_id))
-                    if not member:
-                        continue  # Skip users not in this guild
-                    
-                    if status == 'verified':
-                        verified_count += 1
-                        verified_users.append(f"• {member.display_name} ({username})")
-                        
-                        # Check if they have self-roles (assuming verified role exists)
-                        has_verified_role = any(role.name.lower() in ['verified', 'member'] for role in member.roles)
-                        if has_verified_role:
-                            self_role_count += 1
-                        else:
-                            manual_verify_count += 1
-                            
-                    elif status == 'pending':
-                        pending_count += 1
-                        pending_users.append(f"• {member.display_name} ({username}) - Stage: {stage}")
-                        
-                except Exception as e:
-                    logger.warning(f"Error processing user {user_id}: {e}")
-                    continue
-            
-            # Get total server members (excluding bots)
-            total_members = sum(1 for member in interaction.guild.members if not member.bot)
-            unverified_count = total_members - verified_count - pending_count
+            for user_id, stage in list(stats.pending.items())[:10]:
+                member = interaction.guild.get_member(user_id)
+                if member:
+                    pending_users.append(f"• {member.display_name} ({self.verification_counts.username(user_id)}) - Stage: {stage}")
             
             # Create embed
             embed = discord.Embed(
@@ -306,8 +326,8 @@ class AdminCommands(commands.Cog):
             # Recent verified users (last 10)
             if verified_users:
                 recent_verified = "\n".join(verified_users[:10])
-                if len(verified_users) > 10:
-                    recent_verified += f"\n... and {len(verified_users) - 10} more"
+                if verified_count > len(verified_users):
+                    recent_verified += f"\n... and {verified_count - len(verified_users)} more"
                 embed.add_field(
                     name="✅ Recently Verified Users",
                     value=recent_verified[:1024],  # Discord field limit
@@ -317,15 +337,16 @@ class AdminCommands(commands.Cog):
             # Pending users
             if pending_users:
                 pending_list = "\n".join(pending_users[:10])
-                if len(pending_users) > 10:
-                    pending_list += f"\n... and {len(pending_users) - 10} more"
+                if pending_count > len(pending_users):
+                    pending_list += f"\n... and {pending_count - len(pending_users)} more"
                 embed.add_field(
                     name="⏳ Pending Verification",
                     value=pending_list[:1024],  # Discord field limit
                     inline=False
                 )
             
-            embed.set_footer(text="🔐 Robo Nexus Verification System")
+            reconciled_minutes = int((time.time() - stats.reconciled_at) // 60)
+            embed.set_footer(text=f"🔐 Robo Nexus Verification System • Live counts, full recount {reconciled_minutes}m ago")
             embed.timestamp = discord.utils.utcnow()
             
             await interaction.followup.send(embed=embed)
@@ -495,6 +516,237 @@ class AdminCommands(commands.Cog):
             )
 
 
+    @staticmethod
+    def _parse_import_user_id(value: str) -> Optional[int]:
+        """Accept a raw Discord ID or a <@mention>"""
+        value = value.strip()
+        if value.startswith('<@') and value.endswith('>'):
+            value = value[2:-1].lstrip('!')
+        if value.isdigit() and 15 <= len(value) <= 20:
+            return int(value)
+        return None
+    
+    async def _flush_birthday_chunk(self, pending: List[Tuple[int, int, str]], errors: List[str]) -> Tuple[int, int]:
+        """
+        Validate a chunk of rows and upsert the valid ones in bulk
+        
+        Args:
+            pending: (line number, user ID, raw birthday) tuples
+            errors: List that validation errors are appended to
+        
+        Returns:
+            (valid rows, rows written)
+        """
+        parsed = DateParser.parse_many([raw for _, _, raw in pending])
+        batch = {}
+        
+        for (line_no, user_id, raw), birthday in zip(pending, parsed):
+            if birthday is None:
+                errors.append(f"Line {line_no}: invalid birthday `{raw[:20]}`")
+            else:
+                batch[user_id] = birthday.strftime("%m-%d")
+        
+        pending.clear()
+        if not batch:
+            return 0, 0
+        return len(batch), await birthday_db.bulk_add_birthdays(batch)
+    
+    async def _import_birthday_rows(self, reader) -> Tuple[int, int, List[str]]:
+        """
+        Stream CSV rows, validating and writing them chunk by chunk
+        
+        Returns:
+            (valid rows, rows written, error messages)
+        """
+        user_col, birthday_col = 0, 1
+        seen = {}
+        pending = []
+        errors = []
+        valid = written = 0
+        
+        try:
+            for line_no, row in enumerate(reader, start=1):
+                if not row or not any(cell.strip() for cell in row):
+                    continue
+                
+                # Optional header row: use it to locate the columns
+                if line_no == 1:
+                    header = [cell.strip().lower() for cell in row]
+                    if 'user_id' in header or 'birthday' in header:
+                        if 'user_id' not in header or 'birthday' not in header:
+                            errors.append("Line 1: header must contain both `user_id` and `birthday` columns")
+                            return 0, 0, errors
+                        user_col, birthday_col = header.index('user_id'), header.index('birthday')
+                        continue
+                
+                if len(row) <= max(user_col, birthday_col):
+                    errors.append(f"Line {line_no}: expected user_id and birthday columns")
+                    continue
+                
+                user_id = self._parse_import_user_id(row[user_col])
+                if user_id is None:
+                    errors.append(f"Line {line_no}: invalid user ID `{row[user_col].strip()[:25]}`")
+                    continue
+                
+                if user_id in seen:
+                    errors.append(f"Line {line_no}: duplicate of line {seen[user_id]}, skipped")
+                    continue
+                seen[user_id] = line_no
+                
+                pending.append((line_no, user_id, row[birthday_col].strip()))
+                if len(pending) >= self.IMPORT_CHUNK_SIZE:
+                    chunk_valid, chunk_written = await self._flush_birthday_chunk(pending, errors)
+                    valid += chunk_valid
+                    written += chunk_written
+        
+        except (csv.Error, UnicodeDecodeError) as e:
+            errors.append(f"Stopped reading file: {str(e)[:100]}")
+        
+        if pending:
+            chunk_valid, chunk_written = await self._flush_birthday_chunk(pending, errors)
+            valid += chunk_valid
+            written += chunk_written
+        
+        return valid, written, errors
+    
+    @app_commands.command(name="import_birthdays", description="[ADMIN] Import birthdays from a CSV file")
+    @app_commands.describe(file="CSV file with user_id and birthday columns (e.g., 123456789012345678,03-15)")
+    @app_commands.default_permissions(administrator=True)
+    async def import_birthdays(self, interaction: discord.Interaction, file: discord.Attachment):
+        """Bulk import birthdays from an uploaded CSV file (Admin only)"""
+        try:
+            if not interaction.user.guild_permissions.administrator:
+                await interaction.response.send_message(
+                    "❌ You need Administrator permissions to use this command.",
+                    ephemeral=True
+                )
+                return
+            
+            if not file.filename.lower().endswith('.csv'):
+                await interaction.response.send_message(
+                    "❌ Please upload a `.csv` file.",
+                    ephemeral=True
+                )
+                return
+            
+            if file.size > self.IMPORT_MAX_BYTES:
+                await interaction.response.send_message(
+                    f"❌ File is too large (max {self.IMPORT_MAX_BYTES // 1024 // 1024} MB).",
+                    ephemeral=True
+                )
+                return
+            
+            await interaction.response.defer(ephemeral=True)
+            
+            # Decode lazily so rows are validated and written as they are read
+            data = await file.read()
+            reader = csv.reader(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8-sig', newline=''))
+            valid, written, errors = await self._import_birthday_rows(reader)
+            
+            if written and not errors and written == valid:
+                title, color = "✅ Birthday Import Complete", discord.Color.green()
+            elif written:
+                title, color = "⚠️ Birthday Import Finished With Errors", discord.Color.orange()
+            else:
+                title, color = "❌ Birthday Import Failed", discord.Color.red()
+            
+            embed = discord.Embed(
+                title=title,
+                description=f"Imported **{written}** birthday(s) from `{file.filename}`",
+                color=color
+            )
+            embed.add_field(name="✅ Valid Rows", value=str(valid), inline=True)
+            embed.add_field(name="❌ Errors", value=str(len(errors)), inline=True)
+            
+            if written < valid:
+                embed.add_field(
+                    name="💾 Save Failures",
+                    value=f"{valid - written} valid row(s) could not be saved. Check the logs and re-run the import.",
+                    inline=False
+                )
+            
+            if errors:
+                shown = errors[:self.IMPORT_MAX_ERRORS_SHOWN]
+                error_text = "\n".join(shown)
+                if len(errors) > len(shown):
+                    error_text += f"\n... and {len(errors) - len(shown)} more"
+                embed.add_field(name="📋 Row Errors", value=error_text[:1024], inline=False)
+            
+            embed.set_footer(text="Birthday formats: MM-DD, MM/DD, MM-DD-YYYY, MM/DD/YYYY")
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            logger.info(f"{interaction.user} imported {written}/{valid} birthdays from {file.filename} ({len(errors)} errors)")
+        
+        except Exception as e:
+            logger.error(f"Error in import_birthdays: {e}")
+            error_message = f"❌ Error importing birthdays: {str(e)[:100]}"
+            if interaction.response.is_done():
+                await interaction.followup.send(error_message, ephemeral=True)
+            else:
+                await interaction.response.send_message(error_message, ephemeral=True)
+    
+    @app_commands.command(name="export_data", description="[ADMIN] Export members, teams and competitions as Parquet/Arrow")
+    @app_commands.describe(format="Columnar file format (default: Parquet)")
+    @app_commands.choices(format=[
+        app_commands.Choice(name="Parquet (pandas, DuckDB, Spark)", value="parquet"),
+        app_commands.Choice(name="Arrow IPC / Feather", value="arrow")
+    ])
+    @app_commands.default_permissions(administrator=True)
+    async def export_data(self, interaction: discord.Interaction, format: str = "parquet"):
+        """Export profiles, birthdays, teams, team members and competitions as typed columnar files (Admin only)"""
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message(
+                "❌ You need Administrator permissions to use this command.",
+                ephemeral=True
+            )
+            return
+        
+        available = columnar_formats()
+        if format not in available:
+            hint = f"Available here: {', '.join(available)}." if available else "Install `pyarrow` on the bot host to enable it."
+            await interaction.response.send_message(
+                f"❌ {format.title()} export is not available. {hint}",
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        result = None
+        try:
+            result = await ColumnarExporter(self.db, birthday_db, interaction.guild.id, format).export()
+            
+            limit = interaction.guild.filesize_limit
+            if result.size > limit:
+                await interaction.followup.send(
+                    f"❌ Export is {result.size / 1024 / 1024:.1f} MB, over this server's "
+                    f"{limit / 1024 / 1024:.0f} MB upload limit.",
+                    ephemeral=True
+                )
+                return
+            
+            embed = discord.Embed(
+                title="📦 Data Exported",
+                description=f"Exported **{result.rows}** rows as {format.title()} in {result.elapsed:.1f}s",
+                color=discord.Color.green()
+            )
+            embed.add_field(
+                name="📁 Tables",
+                value="\n".join(f"`{f.filename}` - {f.rows} rows, {f.size / 1024:.1f} KB" for f in result.files),
+                inline=False
+            )
+            embed.set_footer(text="Typed, zstd-compressed columnar files, one per table")
+            
+            files = [discord.File(f.path, filename=f.filename) for f in result.files]
+            await interaction.followup.send(embed=embed, files=files, ephemeral=True)
+            logger.info(f"{interaction.user} exported {result.rows} rows as {format} ({result.size} bytes)")
+        
+        except Exception as e:
+            logger.error(f"Error in export_data: {e}")
+            await interaction.followup.send(f"❌ Error exporting data: {str(e)[:100]}", ephemeral=True)
+        finally:
+            if result:
+                result.close()
+    
     @app_commands.command(name="clear_duplicate_commands", description="[ADMIN] Clear duplicate slash commands")
     @app_commands.default_permissions(administrator=True)
     async def clear_duplicate_commands(self, interaction: discord.Interaction):
@@ -5,105 +5,230 @@ Tracks usage, performance metrics, and error reporting
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
+import asyncio
 import logging
-import json
-import os
 import psutil
 import time
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from analytics_store import ALL_TIME, AnalyticsStore, minute_bucket
+from sketches import HeavyHitters, HyperLogLog
+from error_digest import ErrorDigest
+from ring_buffer import RingBuffer
+from latency_histogram import get_latency_tracker
+from metrics_registry import timed_task
+from config import Config
 
 logger = logging.getLogger(__name__)
 
 class Analytics(commands.Cog):
     """Analytics and performance monitoring system"""
     
+    # Days of per-day unique-user sketches kept in memory for the dashboards
+    UNIQUE_USER_DAYS = 30
+    # Fingerprints listed in one digest embed (Discord allows 25 fields)
+    DIGEST_MAX_FIELDS = 10
+    
     def __init__(self, bot):
         self.bot = bot
         self.start_time = datetime.now()
         
         # Analytics data
         self.command_usage = defaultdict(int)
-        self.user_activity = defaultdict(int)
+        # Fixed-size sketches instead of a count per user: unique users per day and all time, most active users
+        self.unique_users: Dict[str, HyperLogLog] = {}
+        self.active_users = HeavyHitters()
         self.error_log = deque(maxlen=100)  # Keep last 100 errors
-        self.performance_metrics = deque(maxlen=1000)  # Keep last 1000 command executions
-        self.daily_stats = defaultdict(lambda: defaultdict(int))
+        # Columnar ring buffers: system samples every 30s, one timing per command run
+        self.system_metrics = RingBuffer(1000, (
+            "timestamp", "cpu_percent", "memory_percent", "memory_used_mb", "latency_ms", "guild_count"
+        ))
+        self.command_timings = RingBuffer(1000, ("timestamp", "command_id", "execution_time_ms"))
+        self._command_ids: Dict[str, int] = {}
+        self._command_names: List[str] = []
+        
+        # Changes since the last save, flushed to the store incrementally
+        self._pending_counters = defaultdict(int)
+        self._pending_series = defaultdict(int)
+        self._pending_errors = []
+        self._pending_active = HeavyHitters()
+        self._dirty_unique_days = set()
+        
+        # Errors grouped by fingerprint; repeats go out in periodic digests
+        self.error_digest = ErrorDigest()
+        self._dev_channel_id: Optional[int] = None
         
         # Load existing analytics
+        self.store = AnalyticsStore(Config.ANALYTICS_DB_PATH, self._rollup_retention())
+        self.store.migrate_legacy_json()
         self.load_analytics()
         
         # Start monitoring tasks
         self.save_analytics_task.start()
+        self.compact_analytics_task.start()
         self.performance_monitor.start()
+        self.error_digest_task.start()
         
         logger.info("Analytics system initialized")
     
     def cog_unload(self):
         """Clean up when cog is unloaded"""
         self.save_analytics_task.cancel()
+        self.compact_analytics_task.cancel()
         self.performance_monitor.cancel()
+        self.error_digest_task.cancel()
         # Save analytics one last time before unloading
         self.save_analytics()
+        self.store.close()
         logger.info("Analytics cog unloaded - data saved")
     
+    @staticmethod
+    def _rollup_retention() -> Dict[str, Optional[timedelta]]:
+        """Per-tier retention from the config, 0 means keep forever"""
+        def keep(amount: int, unit: timedelta) -> Optional[timedelta]:
+            return amount * unit if amount > 0 else None
+        
+        return {
+            "minute": keep(Config.ANALYTICS_MINUTE_RETENTION_HOURS, timedelta(hours=1)),
+            "hour": keep(Config.ANALYTICS_HOUR_RETENTION_DAYS, timedelta(days=1)),
+            "day": keep(Config.ANALYTICS_DAY_RETENTION_DAYS, timedelta(days=1)),
+            "month": keep(Config.ANALYTICS_MONTH_RETENTION_MONTHS, timedelta(days=31)),
+        }
+    
     def load_analytics(self):
-        """Load analytics data from file"""
+        """Load analytics data from the store"""
         try:
-            if os.path.exists("analytics.json"):
-                with open("analytics.json", 'r') as f:
-                    data = json.load(f)
-                    
-                    # Load command usage
-                    self.command_usage.update(data.get("command_usage", {}))
-                    
-                    # Load user activity
-                    self.user_activity.update(data.get("user_activity", {}))
-                    
-                    # Load daily stats
-                    for date, stats in data.get("daily_stats", {}).items():
-                        self.daily_stats[date].update(stats)
-                    
-                    # FIX: Load error log from persisted data
-                    error_log_data = data.get("error_log", [])
-                    for error in error_log_data:
-                        self.error_log.append(error)
-                    
-                    logger.info("Analytics data loaded successfully")
+            counters = self.store.load_counters()
+            self.command_usage.update(counters.get("command", {}))
+            
+            since = (datetime.now() - timedelta(days=self.UNIQUE_USER_DAYS)).strftime("%Y-%m-%d")
+            self.unique_users.update(self.store.load_sketches("unique_users", since))
+            self.active_users = self.store.load_sketches("active_users").get(ALL_TIME) or HeavyHitters()
+            
+            if counters.get("user"):
+                self._migrate_user_counters(counters["user"])
+            
+            self.error_log.extend(self.store.load_errors(self.error_log.maxlen))
+            
+            logger.info("Analytics data loaded successfully")
         except Exception as e:
             logger.error(f"Error loading analytics: {e}")
     
+    def _migrate_user_counters(self, user_counts: Dict[str, int]):
+        """Fold the old per-user counters into the sketches and drop them"""
+        unique = HyperLogLog()
+        active = HeavyHitters()
+        for user_id, count in user_counts.items():
+            unique.add(user_id)
+            active.add(user_id, count)
+        
+        self.store.apply({}, {}, [], {("unique_users", ALL_TIME): unique, ("active_users", ALL_TIME): active})
+        self.store.delete_counters("user")
+        self._unique_users_for(ALL_TIME).merge(unique)
+        self.active_users.merge(active)
+        logger.info(f"Moved {len(user_counts)} per-user counters into analytics sketches")
+    
+    def _unique_users_for(self, bucket: str) -> HyperLogLog:
+        sketch = self.unique_users.get(bucket)
+        if sketch is None:
+            sketch = self.unique_users[bucket] = HyperLogLog()
+        return sketch
+    
+    def count_unique_users(self, days: int = None) -> int:
+        """Estimated distinct users over the last `days` days, or all time when None"""
+        if days is None:
+            return self._unique_users_for(ALL_TIME).count()
+        
+        today = datetime.now()
+        buckets = [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+        return HyperLogLog.union([self.unique_users[b] for b in buckets if b in self.unique_users]).count()
+    
+    def _take_pending(self) -> Optional[Tuple]:
+        """
+        Swap out the changes since the last save as store.apply() arguments
+        
+        Runs on the event loop, where the changes are recorded, so none land in a batch being written.
+        """
+        if not (self._pending_counters or self._pending_series or self._pending_errors or self._dirty_unique_days):
+            return None
+        
+        counters, self._pending_counters = self._pending_counters, defaultdict(int)
+        series, self._pending_series = self._pending_series, defaultdict(int)
+        errors, self._pending_errors = self._pending_errors, []
+        active, self._pending_active = self._pending_active, HeavyHitters()
+        dirty, self._dirty_unique_days = self._dirty_unique_days, set()
+        
+        # HyperLogLog merges are idempotent, so the full in-memory sketch is saved
+        # (copied, the live one keeps counting while the batch is written);
+        # Count-Min merges add up, so only the counts since the last save are
+        sketches = {
+            ("unique_users", bucket): HyperLogLog.from_bytes(self.unique_users[bucket].to_bytes())
+            for bucket in dirty
+        }
+        if active.total:
+            sketches[("active_users", ALL_TIME)] = active
+        return counters, series, errors, sketches
+    
+    def _restore_pending(self, batch: Tuple):
+        """Put a batch that failed to save back, so the next save retries it"""
+        counters, series, errors, sketches = batch
+        for key, delta in counters.items():
+            self._pending_counters[key] += delta
+        for key, delta in series.items():
+            self._pending_series[key] += delta
+        self._pending_errors[:0] = errors
+        for (name, bucket), sketch in sketches.items():
+            if name == "active_users":
+                self._pending_active.merge(sketch)
+            else:
+                self._dirty_unique_days.add(bucket)
+    
     def save_analytics(self):
-        """Save analytics data to file atomically"""
+        """Flush changes since the last save to the store, blocking (used on unload)"""
+        batch = self._take_pending()
+        if batch is None:
+            return
         try:
-            # FIX: Also save error log to persist errors
-            data = {
-                "command_usage": dict(self.command_usage),
-                "user_activity": dict(self.user_activity),
-                "daily_stats": dict(self.daily_stats),
-                "error_log": list(self.error_log),  # Persist error log
-                "last_updated": datetime.now().isoformat()
-            }
-            
-            # Write to temp file first, then rename (atomic operation)
-            import tempfile
-            with tempfile.NamedTemporaryFile('w', delete=False, dir='.', prefix='analytics_', suffix='.tmp') as f:
-                json.dump(data, f, indent=2)
-                temp_path = f.name
-            
-            # Atomic rename
-            import os
-            os.replace(temp_path, "analytics.json")
-                
+            self.store.apply(*batch)
         except Exception as e:
             logger.error(f"Error saving analytics: {e}")
+            self._restore_pending(batch)
+    
+    async def flush_analytics(self):
+        """Flush changes since the last save to the store from a worker thread"""
+        batch = self._take_pending()
+        if batch is None:
+            return
+        try:
+            # The store lock can be held by compaction, so never wait for it on the event loop
+            await asyncio.to_thread(self.store.apply, *batch)
+        except Exception as e:
+            logger.error(f"Error saving analytics: {e}")
+            self._restore_pending(batch)
     
     @tasks.loop(minutes=10)  # Save analytics every 10 minutes
+    @timed_task("save_analytics")
     async def save_analytics_task(self):
         """Periodically save analytics data"""
-        self.save_analytics()
+        await self.flush_analytics()
+    
+    @tasks.loop(hours=24)
+    @timed_task("compact_analytics")
+    async def compact_analytics_task(self):
+        """Trim old analytics rows and reclaim space"""
+        try:
+            await asyncio.to_thread(self.store.compact)
+            
+            # Day sketches past the dashboard window are only needed on disk
+            cutoff = (datetime.now() - timedelta(days=self.UNIQUE_USER_DAYS)).strftime("%Y-%m-%d")
+            for bucket in [b for b in self.unique_users if b != ALL_TIME and b < cutoff]:
+                del self.unique_users[bucket]
+        except Exception as e:
+            logger.error(f"Error compacting analytics: {e}")
     
     @tasks.loop(seconds=30)  # Monitor performance every 30 seconds
+    @timed_task("performance_monitor")
     async def performance_monitor(self):
         """Monitor bot performance metrics"""
         try:
@@ -116,41 +241,98 @@ class Analytics(commands.Cog):
             guild_count = len(self.bot.guilds)
             
             # Store metrics
-            metric = {
-                "timestamp": datetime.now().isoformat(),
-                "cpu_percent": cpu_percent,
-                "memory_percent": memory.percent,
-                "memory_used_mb": round(memory.used / 1024 / 1024, 2),
-                "latency_ms": latency,
-                "guild_count": guild_count
-            }
-            
-            self.performance_metrics.append(metric)
+            self.system_metrics.append(
+                time.time(),
+                cpu_percent,
+                memory.percent,
+                memory.used / 1024 / 1024,
+                latency,
+                guild_count
+            )
             
         except Exception as e:
             logger.error(f"Error in performance monitor: {e}")
     
+    @tasks.loop(minutes=5)
+    @timed_task("error_digest")
+    async def error_digest_task(self):
+        """Post one embed summarising errors not reported individually"""
+        entries = self.error_digest.drain()
+        if not entries:
+            return
+        
+        try:
+            channel = await self.get_dev_channel()
+            if not channel:
+                return
+            
+            total = sum(count for _, count in entries)
+            embed = discord.Embed(
+                title="🧾 Error Digest",
+                description=f"**{total}** errors across **{len(entries)}** fingerprints in the last 5 minutes",
+                color=discord.Color.orange()
+            )
+            
+            for group, count in entries[:self.DIGEST_MAX_FIELDS]:
+                embed.add_field(
+                    name=f"{count}× {group.error_type} `{group.fingerprint}`",
+                    value=f"`{group.origin}`\n{group.message[:150] or 'No message'}\n{group.count} since boot",
+                    inline=False
+                )
+            
+            if len(entries) > self.DIGEST_MAX_FIELDS:
+                embed.set_footer(text=f"🤖 ...and {len(entries) - self.DIGEST_MAX_FIELDS} more fingerprints")
+            else:
+                embed.set_footer(text="🤖 Automatic error digest")
+            
+            await channel.send(embed=embed)
+        except Exception as e:
+            logger.error(f"Failed to send error digest: {e}")
+            self.error_digest.restore(entries)
+            self._dev_channel_id = None
+    
     @save_analytics_task.before_loop
+    @compact_analytics_task.before_loop
     @performance_monitor.before_loop
+    @error_digest_task.before_loop
     async def before_tasks(self):
         """Wait for bot to be ready"""
         await self.bot.wait_until_ready()
     
-    def cog_unload(self):
-        """Clean up when cog is unloaded"""
-        self.save_analytics_task.cancel()
-        self.performance_monitor.cancel()
-        self.save_analytics()
-    
     def track_command_usage(self, command_name: str, user_id: int):
         """Track command usage"""
-        today = datetime.now().strftime("%Y-%m-%d")
+        minute = minute_bucket()
         
         # Update counters
         self.command_usage[command_name] += 1
-        self.user_activity[str(user_id)] += 1
-        self.daily_stats[today]["commands"] += 1
-        self.daily_stats[today][f"cmd_{command_name}"] += 1
+        
+        day = minute[:10]
+        self._unique_users_for(day).add(user_id)
+        self._unique_users_for(ALL_TIME).add(user_id)
+        self._dirty_unique_days.update((day, ALL_TIME))
+        self.active_users.add(user_id)
+        self._pending_active.add(user_id)
+        
+        # Record the same changes for the next incremental save
+        self._pending_counters[("command", command_name)] += 1
+        self._pending_series[(minute, "commands")] += 1
+        self._pending_series[(minute, f"cmd_{command_name}")] += 1
+    
+    async def daily_counts(self, key: str, days: int = 7) -> List[int]:
+        """
+        Per-day totals of a series key, oldest first, ending today
+        
+        Reads the precomputed day tier and adds deltas not saved yet.
+        """
+        today = datetime.now()
+        dates = [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days - 1, -1, -1)]
+        
+        stored = await asyncio.to_thread(self.store.load_series, "day", dates[0], [key])
+        totals = {date: stats.get(key, 0) for date, stats in stored.items()}
+        for (bucket, pending_key), delta in self._pending_series.items():
+            if pending_key == key and bucket[:10] >= dates[0]:
+                totals[bucket[:10]] = totals.get(bucket[:10], 0) + delta
+        return [totals.get(date, 0) for date in dates]
     
     def track_error(self, error: Exception, context: str = ""):
         """Track errors for reporting"""
@@ -162,19 +344,19 @@ class Analytics(commands.Cog):
         }
         
         self.error_log.append(error_data)
+        self._pending_errors.append(error_data)
         
         # Log to file as well
         logger.error(f"Tracked error: {error_data}")
     
     def track_performance(self, command_name: str, execution_time: float):
         """Track command performance"""
-        perf_data = {
-            "timestamp": datetime.now().isoformat(),
-            "command": command_name,
-            "execution_time_ms": round(execution_time * 1000, 2)
-        }
+        command_id = self._command_ids.get(command_name)
+        if command_id is None:
+            command_id = self._command_ids[command_name] = len(self._command_names)
+            self._command_names.append(command_name)
         
-        self.performance_metrics.append(perf_data)
+        self.command_timings.append(time.time(), command_id, execution_time * 1000)
     
     def is_dev(self, user_id: int) -> bool:
         """Check if user is a developer"""
@@ -182,16 +364,32 @@ class Analytics(commands.Cog):
         return user_id in DEV_IDS
     
     async def get_dev_channel(self):
-        """Get the dev channel for error reporting"""
+        """Get the dev channel for error reporting (found once, then cached)"""
+        if self._dev_channel_id:
+            channel = self.bot.get_channel(self._dev_channel_id)
+            if channel:
+                return channel
+            self._dev_channel_id = None
+        
         for guild in self.bot.guilds:
             for channel in guild.text_channels:
                 name = channel.name.lower()
                 if any(keyword in name for keyword in ['dev', 'bot', 'admin', 'website']):
+                    self._dev_channel_id = channel.id
                     return channel
         return None
     
     async def report_error_to_dev(self, error: Exception, context: str = ""):
-        """Auto-report errors to dev channel"""
+        """
+        Auto-report errors to dev channel
+        
+        New fingerprints are posted straight away while the token bucket
+        allows; repeats and overflow are counted and sent in the next digest.
+        """
+        group, report_now = self.error_digest.record(error, context)
+        if not report_now:
+            return
+        
         try:
             channel = await self.get_dev_channel()
             if not channel:
@@ -199,13 +397,13 @@ class Analytics(commands.Cog):
             
             embed = discord.Embed(
                 title="🚨 Bot Error Detected",
-                description=f"**{type(error).__name__}**",
+                description=f"**{group.error_type}** at `{group.origin}`",
                 color=discord.Color.red()
             )
             
             embed.add_field(
                 name="📝 Error Message",
-                value=f"```\n{str(error)[:500]}\n```",
+                value=f"```\n{group.message}\n```",
                 inline=False
             )
             
@@ -222,12 +420,15 @@ class Analytics(commands.Cog):
                 inline=True
             )
             
-            embed.set_footer(text="🤖 Automatic error reporting")
+            embed.set_footer(text=f"🤖 Automatic error reporting • Fingerprint {group.fingerprint}")
             
             await channel.send(embed=embed)
             
         except Exception as e:
             logger.error(f"Failed to report error to dev channel: {e}")
+            # Let the digest pick it up, and look the channel up again next time
+            self.error_digest.restore([(group, 1)])
+            self._dev_channel_id = None
     
     @app_commands.command(name="analytics", description="[DEV] View bot usage analytics")
     async def view_analytics(self, interaction: discord.Interaction):
@@ -253,11 +454,12 @@ class Analytics(commands.Cog):
             
             # Basic stats
             total_commands = sum(self.command_usage.values())
-            unique_users = len(self.user_activity)
+            unique_users = self.count_unique_users()
+            weekly_users = self.count_unique_users(7)
             
             embed.add_field(
                 name="📈 Usage Stats",
-                value=f"**{total_commands}** total commands\n**{unique_users}** unique users\n**{uptime.days}** days uptime",
+                value=f"**{total_commands}** total commands\n**~{unique_users}** unique users (**~{weekly_users}** this week)\n**{uptime.days}** days uptime",
                 inline=True
             )
             
@@ -271,12 +473,21 @@ class Analytics(commands.Cog):
                     inline=True
                 )
             
+            # Most active users (Count-Min estimates, may overcount slightly)
+            top_users = self.active_users.top(5)
+            if top_users:
+                users_text = "\n".join([f"<@{user_id}>: ~{count}" for user_id, count in top_users])
+                embed.add_field(
+                    name="👥 Most Active Users",
+                    value=users_text,
+                    inline=True
+                )
+            
             # Recent performance
-            if self.performance_metrics:
-                recent_metrics = list(self.performance_metrics)[-10:]
-                avg_latency = sum(m.get('latency_ms', 0) for m in recent_metrics) / len(recent_metrics)
-                avg_cpu = sum(m.get('cpu_percent', 0) for m in recent_metrics) / len(recent_metrics)
-                avg_memory = sum(m.get('memory_percent', 0) for m in recent_metrics) / len(recent_metrics)
+            if len(self.system_metrics):
+                avg_latency = self.system_metrics.mean('latency_ms', last=10)
+                avg_cpu = self.system_metrics.mean('cpu_percent', last=10)
+                avg_memory = self.system_metrics.mean('memory_percent', last=10)
                 
                 embed.add_field(
                     name="⚡ Performance",
@@ -285,14 +496,10 @@ class Analytics(commands.Cog):
                 )
             
             # Daily activity (last 7 days)
-            daily_activity = []
-            for i in range(7):
-                date = (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
-                commands_today = self.daily_stats.get(date, {}).get("commands", 0)
-                daily_activity.append(commands_today)
+            daily_activity = await self.daily_counts("commands", 7)
             
             if any(daily_activity):
-                activity_text = " ".join([f"{count}" for count in reversed(daily_activity)])
+                activity_text = " ".join([f"{count}" for count in daily_activity])
                 embed.add_field(
                     name="📅 Daily Commands (7 days)",
                     value=f"`{activity_text}`",
@@ -334,21 +541,19 @@ class Analytics(commands.Cog):
         await interaction.response.defer()
         
         try:
-            if not self.performance_metrics:
+            if not len(self.system_metrics):
                 await interaction.followup.send(
                     "📊 No performance data available yet. Check back in a few minutes!",
                     ephemeral=True
                 )
                 return
             
-            # Get recent metrics
-            recent_metrics = list(self.performance_metrics)[-20:]
-            
-            # Calculate averages
-            avg_latency = sum(m.get('latency_ms', 0) for m in recent_metrics) / len(recent_metrics)
-            avg_cpu = sum(m.get('cpu_percent', 0) for m in recent_metrics) / len(recent_metrics)
-            avg_memory = sum(m.get('memory_percent', 0) for m in recent_metrics) / len(recent_metrics)
-            avg_memory_mb = sum(m.get('memory_used_mb', 0) for m in recent_metrics) / len(recent_metrics)
+            # Calculate averages over the last 20 readings
+            readings = min(len(self.system_metrics), 20)
+            avg_latency = self.system_metrics.mean('latency_ms', last=readings)
+            avg_cpu = self.system_metrics.mean('cpu_percent', last=readings)
+            avg_memory = self.system_metrics.mean('memory_percent', last=readings)
+            avg_memory_mb = self.system_metrics.mean('memory_used_mb', last=readings)
             
             # Get current metrics
             current_cpu = psutil.cpu_percent()
@@ -413,7 +618,16 @@ class Analytics(commands.Cog):
                 inline=True
             )
             
-            embed.set_footer(text=f"Based on last {len(recent_metrics)} readings")
+            # Command timings over the last hour
+            recent_commands = self.command_timings.count_since(time.time() - 3600)
+            if recent_commands:
+                embed.add_field(
+                    name="⏱️ Command Timings (1h)",
+                    value=f"**{recent_commands}** commands\n**{self.command_timings.mean('execution_time_ms', last=recent_commands):.0f}ms** avg\n**{self.command_timings.percentile('execution_time_ms', 95, last=recent_commands):.0f}ms** p95",
+                    inline=True
+                )
+            
+            embed.set_footer(text=f"Based on last {readings} readings")
             
             await interaction.followup.send(embed=embed)
             
@@ -424,6 +638,83 @@ class Analytics(commands.Cog):
                 ephemeral=True
             )
     
+    @app_commands.command(name="command_latency", description="[DEV] View per-command latency percentiles")
+    @app_commands.describe(
+        window="Time window to report on",
+        metric="Which timing to report",
+        command="Only show this command (optional)"
+    )
+    @app_commands.choices(metric=[
+        app_commands.Choice(name="Total command time", value="command"),
+        app_commands.Choice(name="Time to first response", value="first_response"),
+        app_commands.Choice(name="Time to defer", value="defer"),
+        app_commands.Choice(name="Autocomplete", value="autocomplete"),
+        app_commands.Choice(name="Components and modals", value="component")
+    ], window=[
+        app_commands.Choice(name="Last 5 minutes", value=300),
+        app_commands.Choice(name="Last 15 minutes", value=900),
+        app_commands.Choice(name="Last hour", value=3600),
+        app_commands.Choice(name="Since boot", value=0)
+    ])
+    async def view_command_latency(self, interaction: discord.Interaction, window: int = 3600,
+                                   metric: str = "command", command: str = None):
+        """Show p50/p90/p99/max latency per command"""
+        
+        if not self.is_dev(interaction.user.id):
+            await interaction.response.send_message(
+                "❌ This command is only available to developers.",
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer()
+        
+        try:
+            window_seconds = window or None
+            window_label = f"last {window // 60} minutes" if window else "since boot"
+            tracker = get_latency_tracker(metric)
+            histograms = tracker.window(window_seconds)
+            if command:
+                histograms = {name: h for name, h in histograms.items() if name == command.lstrip('/')}
+            
+            if not histograms:
+                await interaction.followup.send(
+                    f"📊 No command timings recorded {window_label}.",
+                    ephemeral=True
+                )
+                return
+            
+            # Busiest commands first, fixed-width table so the columns line up
+            rows = sorted(histograms.items(), key=lambda item: item[1].count, reverse=True)[:15]
+            lines = [f"{'command':<22}{'n':>6}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}"]
+            for name, h in rows:
+                lines.append(
+                    f"{name[:21]:<22}{h.count:>6}{h.percentile(50):>8.0f}{h.percentile(90):>8.0f}"
+                    f"{h.percentile(99):>8.0f}{h.max:>8.0f}"
+                )
+            
+            overall = tracker.overall(window_seconds) if not command else rows[0][1]
+            embed = discord.Embed(
+                title=f"⏱️ Command Latency: {metric.replace('_', ' ').title()}",
+                description="```\n" + "\n".join(lines) + "\n```",
+                color=discord.Color.blue()
+            )
+            embed.add_field(
+                name="📊 Overall",
+                value=f"**{overall.count}** commands\n**{overall.percentile(50):.0f}ms** p50 · **{overall.percentile(99):.0f}ms** p99\n**{overall.max:.0f}ms** max",
+                inline=False
+            )
+            embed.set_footer(text=f"Milliseconds, {window_label} · showing {len(rows)} of {len(histograms)} commands")
+            
+            await interaction.followup.send(embed=embed)
+        
+        except Exception as e:
+            logger.error(f"Error in command_latency command: {e}")
+            await interaction.followup.send(
+                "❌ Error generating latency report.",
+                ephemeral=True
+            )
+    
     @app_commands.command(name="error_log", description="[DEV] View recent errors")
     async def view_error_log(self, interaction: discord.Interaction):
         """Show recent error log"""
@@ -493,41 +784,6 @@ class Analytics(commands.Cog):
             )
 
 
-# Command tracking decorator
-def track_command(func):
-    """Decorator to track command usage and performance"""
-    async def wrapper(self, interaction: discord.Interaction, *args, **kwargs):
-        start_time = time.time()
-        command_name = func.__name__
-        
-        try:
-            # Track command usage
-            analytics_cog = self.bot.get_cog('Analytics')
-            if analytics_cog:
-                analytics_cog.track_command_usage(command_name, interaction.user.id)
-            
-            # Execute command
-            result = await func(self, interaction, *args, **kwargs)
-            
-            # Track performance
-            execution_time = time.time() - start_time
-            if analytics_cog:
-                analytics_cog.track_performance(command_name, execution_time)
-            
-            return result
-            
-        except Exception as e:
-            # Track error
-            if analytics_cog:
-                analytics_cog.track_error(e, f"Command: {command_name}")
-                await analytics_cog.report_error_to_dev(e, f"Command: {command_name}")
-            
-            # Re-raise the error
-            raise e
-    
-    return wrapper
-
-
 async def setup(bot):
     """Setup function to add the cog to the bot"""
     await bot.add_cog(Analytics(bot))
@@ -0,0 +1,372 @@
+"""
+Analytics Store for Robo Nexus Bot
+SQLite-backed persistence for usage counters, time-series rollups, sketches and the error log
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sketches import load_sketch
+
+logger = logging.getLogger(__name__)
+
+# Rollup tiers, finest first. Each bucket format is a prefix of the one
+# before it, so a minute bucket truncates to its hour, day and month.
+TIERS = (
+    ("minute", "%Y-%m-%dT%H:%M"),
+    ("hour", "%Y-%m-%dT%H"),
+    ("day", "%Y-%m-%d"),
+    ("month", "%Y-%m"),
+)
+TIER_FORMATS = dict(TIERS)
+_TIER_WIDTHS = {tier: len(datetime(2000, 1, 1).strftime(fmt)) for tier, fmt in TIERS}
+
+
+# Sketch bucket that covers all time, alongside the per-day buckets
+ALL_TIME = "all"
+
+
+def minute_bucket(when: datetime = None) -> str:
+    """Finest-tier bucket for a timestamp (now by default)"""
+    return (when or datetime.now()).strftime(TIER_FORMATS["minute"])
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rollups (
+    tier TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tier, bucket, key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sketches (
+    name TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (name, bucket)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS errors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    error_type TEXT NOT NULL,
+    error_message TEXT,
+    context TEXT
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+
+class AnalyticsStore:
+    """
+    Incremental analytics persistence
+    
+    Callers hand over only what changed since the last flush (counter
+    deltas, per-minute series deltas and new errors), which are upserted in
+    a single transaction, so a save costs the same no matter how much
+    history has built up.
+    
+    Time series are kept in tiers (minute, hour, day, month). Each flush
+    adds its deltas to every tier at once, so coarse aggregates are always
+    current and readers never sum fine-grained rows. Compaction drops each
+    tier's buckets once they pass that tier's retention, which keeps the
+    file size flat over years of uptime.
+    """
+    
+    # Errors kept on disk (the in-memory log only holds the newest 100)
+    ERROR_RETENTION = 1000
+    # Default retention per tier, None keeps the tier forever
+    DEFAULT_RETENTION = {
+        "minute": timedelta(hours=48),
+        "hour": timedelta(days=30),
+        "day": timedelta(days=400),
+        "month": None,
+    }
+    # Run VACUUM at most this often, it rewrites the whole file
+    VACUUM_INTERVAL = 7 * 24 * 3600
+    # How long VACUUM waits for in-flight writes to finish before giving up
+    VACUUM_TIMEOUT = 60
+    
+    def __init__(self, path: str = "analytics.db", retention: Dict[str, Optional[timedelta]] = None):
+        self.path = path
+        self.retention = {**self.DEFAULT_RETENTION, **(retention or {})}
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        # Compaction runs in a worker thread, so serialise access to the connection
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self._migrate_daily_stats_table()
+    
+    def close(self):
+        """Checkpoint the WAL and close the connection"""
+        try:
+            with self.lock:
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self.conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error closing analytics store: {e}")
+    
+    def get_meta(self, key: str) -> str:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def set_meta(self, key: str, value: str):
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
+    
+    def load_counters(self) -> Dict[str, Dict[str, int]]:
+        """Get every counter grouped by scope (e.g. 'command', 'user')"""
+        counters: Dict[str, Dict[str, int]] = {}
+        for scope, key, value in self.conn.execute("SELECT scope, key, value FROM counters"):
+            counters.setdefault(scope, {})[key] = value
+        return counters
+    
+    def load_series(self, tier: str, since: str = None, keys: Sequence[str] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Get one rollup tier keyed by bucket
+        
+        Args:
+            tier: 'minute', 'hour', 'day' or 'month'
+            since: Only buckets from this one onwards (in the tier's format)
+            keys: Only these keys (e.g. ['commands'])
+        """
+        if tier not in TIER_FORMATS:
+            raise ValueError(f"Unknown rollup tier: {tier}")
+        
+        query = "SELECT bucket, key, value FROM rollups WHERE tier = ?"
+        params: List = [tier]
+        if since:
+            query += " AND bucket >= ?"
+            params.append(since)
+        if keys:
+            query += f" AND key IN ({','.join('?' * len(keys))})"
+            params.extend(keys)
+        
+        series: Dict[str, Dict[str, int]] = {}
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        for bucket, key, value in rows:
+            series.setdefault(bucket, {})[key] = value
+        return series
+    
+    def delete_counters(self, scope: str):
+        """Drop every counter in a scope"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM counters WHERE scope = ?", (scope,))
+    
+    def load_sketches(self, name: str, since: str = None) -> Dict[str, object]:
+        """
+        Get the sketches stored under a name keyed by bucket
+        
+        Args:
+            name: Sketch name (e.g. 'unique_users')
+            since: Only day buckets from this YYYY-MM-DD onwards; the all-time bucket is always included
+        """
+        query = "SELECT bucket, data FROM sketches WHERE name = ?"
+        params: List = [name]
+        if since:
+            query += " AND (bucket >= ? OR bucket = ?)"
+            params.extend([since, ALL_TIME])
+        
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+        
+        sketches = {}
+        for bucket, data in rows:
+            try:
+                sketches[bucket] = load_sketch(data)
+            except ValueError as e:
+                logger.error(f"Skipping unreadable sketch {name}/{bucket}: {e}")
+        return sketches
+    
+    def _merge_sketches(self, sketches: Dict[Tuple[str, str], object]):
+        """Merge each sketch into the stored one, so several writers never overwrite each other"""
+        for (name, bucket), sketch in sketches.items():
+            row = self.conn.execute(
+                "SELECT data FROM sketches WHERE name = ? AND bucket = ?", (name, bucket)
+            ).fetchone()
+            if row:
+                try:
+                    sketch = load_sketch(row[0]).merge(sketch)
+                except ValueError as e:
+                    logger.error(f"Replacing unreadable sketch {name}/{bucket}: {e}")
+            self.conn.execute(
+                "INSERT INTO sketches (name, bucket, data) VALUES (?, ?, ?) "
+                "ON CONFLICT(name, bucket) DO UPDATE SET data = excluded.data",
+                (name, bucket, sketch.to_bytes())
+            )
+    
+    def load_errors(self, limit: int = 100) -> List[Dict[str, str]]:
+        """Get the newest errors, oldest first"""
+        rows = self.conn.execute(
+            "SELECT timestamp, error_type, error_message, context FROM errors ORDER BY id DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+        return [
+            {"timestamp": ts, "error_type": error_type, "error_message": message or "", "context": context or ""}
+            for ts, error_type, message, context in reversed(rows)
+        ]
+    
+    def _add_rollups(self, series: Dict[Tuple[str, str], int], tiers: Iterable[str]):
+        """Add (bucket, key) deltas to each tier, truncating buckets to the tier's width"""
+        rows: Dict[Tuple[str, str, str], int] = {}
+        for tier in tiers:
+            width = _TIER_WIDTHS[tier]
+            for (bucket, key), delta in series.items():
+                row = (tier, bucket[:width], key)
+                rows[row] = rows.get(row, 0) + delta
+        
+        self.conn.executemany(
+            "INSERT INTO rollups (tier, bucket, key, value) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(tier, bucket, key) DO UPDATE SET value = value + excluded.value",
+            [(tier, bucket, key, delta) for (tier, bucket, key), delta in rows.items()]
+        )
+    
+    def apply(self, counters: Dict[Tuple[str, str], int], series: Dict[Tuple[str, str], int],
+              errors: Iterable[Dict[str, str]], sketches: Dict[Tuple[str, str], object] = None):
+        """
+        Write a batch of changes in one transaction
+        
+        Args:
+            counters: (scope, key) -> amount to add
+            series: (minute bucket, key) -> amount to add, rolled into every tier
+            errors: New error entries to append
+            sketches: (name, bucket) -> sketch to merge into the stored one
+        """
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO counters (scope, key, value) VALUES (?, ?, ?) "
+                "ON CONFLICT(scope, key) DO UPDATE SET value = value + excluded.value",
+                [(scope, key, delta) for (scope, key), delta in counters.items()]
+            )
+            self._add_rollups(series, TIER_FORMATS)
+            self.conn.executemany(
+                "INSERT INTO errors (timestamp, error_type, error_message, context) VALUES (?, ?, ?, ?)",
+                [(e["timestamp"], e["error_type"], e.get("error_message", ""), e.get("context", "")) for e in errors]
+            )
+            self._merge_sketches(sketches or {})
+    
+    def compact(self):
+        """Trim old errors, expired rollup buckets and day sketches, and VACUUM when it is due"""
+        now = datetime.now()
+        with self.lock:
+            with self.conn:
+                self.conn.execute(
+                    "DELETE FROM errors WHERE id <= (SELECT MAX(id) FROM errors) - ?",
+                    (self.ERROR_RETENTION,)
+                )
+                for tier, fmt in TIERS:
+                    keep_for = self.retention.get(tier)
+                    if keep_for is None:
+                        continue
+                    cutoff = (now - keep_for).strftime(fmt)
+                    self.conn.execute("DELETE FROM rollups WHERE tier = ? AND bucket < ?", (tier, cutoff))
+                
+                # Day sketches follow the day tier's retention
+                if self.retention.get("day") is not None:
+                    cutoff = (now - self.retention["day"]).strftime(TIER_FORMATS["day"])
+                    self.conn.execute("DELETE FROM sketches WHERE bucket != ? AND bucket < ?", (ALL_TIME, cutoff))
+            
+            vacuum_due = time.time() - float(self.get_meta("last_vacuum") or 0) >= self.VACUUM_INTERVAL
+        
+        if vacuum_due:
+            self._vacuum()
+        
+        with self.lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        logger.info("Analytics store compacted")
+    
+    def _vacuum(self):
+        """
+        VACUUM on a separate connection, outside self.lock
+        
+        It rewrites the whole file; holding the lock for that would stall every
+        read and write of the shared connection. Writes that collide with it fail
+        with "database is locked" and are retried by the caller's next save.
+        """
+        conn = sqlite3.connect(self.path, timeout=self.VACUUM_TIMEOUT)
+        try:
+            conn.execute("VACUUM")
+        except sqlite3.Error as e:
+            logger.error(f"Error vacuuming analytics store: {e}")
+            return
+        finally:
+            conn.close()
+        with self.lock, self.conn:
+            self.set_meta("last_vacuum", str(time.time()))
+    
+    def migrate_legacy_json(self, json_path: str = "analytics.json") -> bool:
+        """
+        Import a legacy analytics.json once, then rename it out of the way
+        
+        Returns:
+            bool: True if data was imported
+        """
+        if not os.path.exists(json_path) or self.get_meta("legacy_json_imported"):
+            return False
+        
+        try:
+            with open(json_path, 'r') as f:
+                data = json.load(f)
+            
+            counters = {("command", k): int(v) for k, v in data.get("command_usage", {}).items()}
+            counters.update({("user", k): int(v) for k, v in data.get("user_activity", {}).items()})
+            daily = {
+                (day, key): int(value)
+                for day, stats in data.get("daily_stats", {}).items()
+                for key, value in stats.items()
+            }
+            
+            # Legacy stats are per day, so only the day and month tiers can hold them
+            self.apply(counters, {}, data.get("error_log", []))
+            with self.lock, self.conn:
+                self._add_rollups(daily, ("day", "month"))
+                self.set_meta("legacy_json_imported", datetime.now().isoformat())
+            
+            os.replace(json_path, json_path + ".migrated")
+            logger.info(f"Imported legacy {json_path} into analytics store ({len(counters)} counters, {len(daily)} daily stats)")
+            return True
+        except Exception as e:
+            logger.error(f"Error importing legacy analytics from {json_path}: {e}")
+            return False
+    
+    def _migrate_daily_stats_table(self):
+        """Fold the old per-day daily_stats table into the day and month tiers, then drop it"""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_stats'"
+        ).fetchone()
+        if not exists:
+            return
+        
+        try:
+            daily = {
+                (day, key): value
+                for day, key, value in self.conn.execute("SELECT day, key, value FROM daily_stats")
+            }
+            with self.lock, self.conn:
+                self._add_rollups(daily, ("day", "month"))
+                self.conn.execute("DROP TABLE daily_stats")
+            logger.info(f"Moved {len(daily)} daily stats into analytics rollups")
+        except sqlite3.Error as e:
+            logger.error(f"Error migrating daily stats to rollups: {e}")
@@ -4,11 +4,21 @@ This wrapper runs all synchronous database calls in a thread pool.
 """
 import asyncio
 import logging
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
+import time
 from supabase_api import get_supabase_api
+from metrics_registry import get_metrics_registry
 
 logger = logging.getLogger(__name__)
 
+_metrics = get_metrics_registry()
+_request_seconds = _metrics.histogram(
+    "robonexus_supabase_request_seconds",
+    "Supabase calls including time spent waiting for a worker thread",
+    ("method",)
+)
+_in_flight = _metrics.gauge("robonexus_supabase_in_flight", "Supabase calls currently running or queued")
+
 class AsyncSupabaseWrapper:
     """Async wrapper that runs synchronous Supabase calls in a thread pool"""
     
@@ -16,21 +26,38 @@ class AsyncSupabaseWrapper:
         self._sync_api = get_supabase_api()
         logger.info("Async Supabase wrapper initialized")
     
+    async def _call(self, func, *args):
+        """Run a sync API method in the thread pool, recording its timing"""
+        _in_flight.inc()
+        start = time.perf_counter()
+        try:
+            return await asyncio.to_thread(func, *args)
+        finally:
+            _in_flight.dec()
+            _request_seconds.observe(time.perf_counter() - start, method=func.__name__)
+    
     # Settings methods
     async def get_setting(self, key: str) -> Optional[str]:
         try:
             return await asyncio.wait_for(
-                asyncio.to_thread(self._sync_api.get_setting, key),
+                self._call(self._sync_api.get_setting, key),
                 timeout=15.0  # 15 second timeout for thread pool
             )
         except asyncio.TimeoutError:
             logger.error(f"Timeout getting setting {key}")
             return None
     
+    async def read_setting(self, key: str) -> Optional[str]:
+        """None if the setting is not set; raises if it could not be read (including timeouts)"""
+        return await asyncio.wait_for(
+            self._call(self._sync_api.read_setting, key),
+            timeout=15.0
+        )
+    
     async def set_setting(self, key: str, value: str) -> bool:
         try:
             return await asyncio.wait_for(
-                asyncio.to_thread(self._sync_api.set_setting, key, value),
+                self._call(self._sync_api.set_setting, key, value),
                 timeout=15.0
             )
         except asyncio.TimeoutError:
@@ -39,101 +66,123 @@ class AsyncSupabaseWrapper:
     
     # Auction methods
     async def get_all_auctions(self, status: str = 'active') -> List[Dict[str, Any]]:
-        return await asyncio.to_thread(self._sync_api.get_all_auctions, status)
+        return await self._call(self._sync_api.get_all_auctions, status)
     
     async def get_auction(self, auction_id: int) -> Optional[Dict[str, Any]]:
-        return await asyncio.to_thread(self._sync_api.get_auction, auction_id)
+        return await self._call(self._sync_api.get_auction, auction_id)
     
     async def create_auction(self, auction_data: Dict[str, Any]) -> int:
-        return await asyncio.to_thread(self._sync_api.create_auction, auction_data)
+        return await self._call(self._sync_api.create_auction, auction_data)
     
     async def place_bid(self, auction_id: int, bidder_id: str, bidder_name: str, amount: float) -> bool:
-        return await asyncio.to_thread(self._sync_api.place_bid, auction_id, bidder_id, bidder_name, amount)
+        return await self._call(self._sync_api.place_bid, auction_id, bidder_id, bidder_name, amount)
     
     async def get_auction_bids(self, auction_id: int) -> List[Dict[str, Any]]:
-        return await asyncio.to_thread(self._sync_api.get_auction_bids, auction_id)
+        return await self._call(self._sync_api.get_auction_bids, auction_id)
     
     # User profile methods
     async def get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
-        return await asyncio.to_thread(self._sync_api.get_user_profile, user_id)
+        return await self._call(self._sync_api.get_user_profile, user_id)
     
     async def create_user_profile(self, profile_data: Dict[str, Any]) -> bool:
-        return await asyncio.to_thread(self._sync_api.create_user_profile, profile_data)
+        return await self._call(self._sync_api.create_user_profile, profile_data)
     
     async def update_user_profile(self, user_id: str, updates: Dict[str, Any]) -> bool:
-        return await asyncio.to_thread(self._sync_api.update_user_profile, user_id, updates)
+        return await self._call(self._sync_api.update_user_profile, user_id, updates)
     
     # Birthday methods
     async def register_birthday(self, user_id: str, birthday: str) -> bool:
-        return await asyncio.to_thread(self._sync_api.register_birthday, user_id, birthday)
+        return await self._call(self._sync_api.register_birthday, user_id, birthday)
+    
+    async def bulk_upsert_birthdays(self, rows: List[Dict[str, str]]) -> int:
+        return await self._call(self._sync_api.bulk_upsert_birthdays, rows)
+    
+    async def get_birthdays_for_users(self, user_ids: List[str]) -> List[Dict[str, Any]]:
+        return await self._call(self._sync_api.get_birthdays_for_users, user_ids)
+    
+    async def get_profile_birthdays_for_users(self, user_ids: List[str]) -> List[Dict[str, Any]]:
+        return await self._call(self._sync_api.get_profile_birthdays_for_users, user_ids)
     
     async def get_birthday(self, user_id: str) -> Optional[str]:
-        return await asyncio.to_thread(self._sync_api.get_birthday, user_id)
+        return await self._call(self._sync_api.get_birthday, user_id)
     
     async def get_birthdays_today(self, today_str: str) -> List[Dict[str, Any]]:
-        return await asyncio.to_thread(self._sync_api.get_birthdays_today, today_str)
+        return await self._call(self._sync_api.get_birthdays_today, today_str)
     
     async def get_all_birthdays(self) -> List[Dict[str, Any]]:
-        return await asyncio.to_thread(self._sync_api.get_all_birthdays)
+        return await self._call(self._sync_api.get_all_birthdays)
     
     async def remove_birthday(self, user_id: str) -> bool:
-        return await asyncio.to_thread(self._sync_api.remove_birthday, user_id)
+        return await self._call(self._sync_api.remove_birthday, user_id)
     
     
     
     
     async def count_user_profiles(self) -> int:
-        return await asyncio.to_thread(self._sync_api.count_user_profiles)
+        return await self._call(self._sync_api.count_user_profiles)
     
     async def get_all_user_profiles(self) -> List[Dict[str, Any]]:
-        return await asyncio.to_thread(self._sync_api.get_all_user_profiles)
+        return await self._call(self._sync_api.get_all_user_profiles)
+    
+    async def get_user_profiles_for_users(self, user_ids: List[str]) -> Optional[List[Dict[str, Any]]]:
+        return await self._call(self._sync_api.get_user_profiles_for_users, user_ids)
+    
+    async def bulk_upsert_user_profiles(self, rows: List[Dict[str, Any]]) -> int:
+        return await self._call(self._sync_api.bulk_upsert_user_profiles, rows)
+    
+    async def get_user_profiles_page(self, after_user_id: Optional[str] = None, limit: int = 500) -> Optional[List[Dict[str, Any]]]:
+        return await self._call(self._sync_api.get_user_profiles_page, after_user_id, limit)
+    
+    async def get_table_page(self, table: str, key: Tuple[str, ...], after: Optional[Tuple[Any, ...]] = None,
+                             limit: int = 500, filters: Optional[Dict[str, str]] = None) -> Optional[List[Dict[str, Any]]]:
+        return await self._call(self._sync_api.get_table_page, table, key, after, limit, filters)
     
     # Team Management methods
     async def create_team(self, team_data: Dict[str, Any]) -> bool:
-        return await asyncio.to_thread(self._sync_api.create_team, team_data)
+        return await self._call(self._sync_api.create_team, team_data)
     
     async def add_team_category(self, guild_id: str, team_name: str, category: str) -> bool:
-        return await asyncio.to_thread(self._sync_api.add_team_category, guild_id, team_name, category)
+        return await self._call(self._sync_api.add_team_category, guild_id, team_name, category)
     
     async def remove_team_category(self, guild_id: str, team_name: str, category: str) -> bool:
-        return await asyncio.to_thread(self._sync_api.remove_team_category, guild_id, team_name, category)
+        return await self._call(self._sync_api.remove_team_category, guild_id, team_name, category)
     
     async def get_team_categories(self, guild_id: str, team_name: str) -> List[str]:
-        return await asyncio.to_thread(self._sync_api.get_team_categories, guild_id, team_name)
+        return await self._call(self._sync_api.get_team_categories, guild_id, team_name)
     
     async def get_team_by_name(self, guild_id: str, team_name: str) -> Optional[Dict[str, Any]]:
-        return await asyncio.to_thread(self._sync_api.get_team_by_name, guild_id, team_name)
+        return await self._call(self._sync_api.get_team_by_name, guild_id, team_name)
     
     async def get_team_by_leader(self, guild_id: str, leader_id: str) -> Optional[Dict[str, Any]]:
-        return await asyncio.to_thread(self._sync_api.get_team_by_leader, guild_id, leader_id)
+        return await self._call(self._sync_api.get_team_by_leader, guild_id, leader_id)
     
     async def get_all_teams(self, guild_id: str) -> List[Dict[str, Any]]:
-        return await asyncio.to_thread(self._sync_api.get_all_teams, guild_id)
+        return await self._call(self._sync_api.get_all_teams, guild_id)
     
     async def update_team(self, guild_id: str, team_name: str, updates: Dict[str, Any]) -> bool:
-        return await asyncio.to_thread(self._sync_api.update_team, guild_id, team_name, updates)
+        return await self._call(self._sync_api.update_team, guild_id, team_name, updates)
     
     async def delete_team(self, guild_id: str, team_name: str) -> bool:
-        return await asyncio.to_thread(self._sync_api.delete_team, guild_id, team_name)
+        return await self._call(self._sync_api.delete_team, guild_id, team_name)
     
     async def add_team_member(self, member_data: Dict[str, Any]) -> bool:
-        return await asyncio.to_thread(self._sync_api.add_team_member, member_data)
+        return await self._call(self._sync_api.add_team_member, member_data)
     
     async def remove_team_member(self, guild_id: str, team_name: str, user_id: str) -> bool:
-        return await asyncio.to_thread(self._sync_api.remove_team_member, guild_id, team_name, user_id)
+        return await self._call(self._sync_api.remove_team_member, guild_id, team_name, user_id)
     
     async def get_team_members(self, guild_id: str, team_name: str) -> List[Dict[str, Any]]:
-        return await asyncio.to_thread(self._sync_api.get_team_members, guild_id, team_name)
+        return await self._call(self._sync_api.get_team_members, guild_id, team_name)
     
     async def get_user_team(self, guild_id: str, user_id: str) -> Optional[Dict[str, Any]]:
-        return await asyncio.to_thread(self._sync_api.get_user_team, guild_id, user_id)
+        return await self._call(self._sync_api.get_user_team, guild_id, user_id)
     
     # Competition Management methods
     async def create_competition(self, comp_data: Dict[str, Any]) -> bool:
-        return await asyncio.to_thread(self._sync_api.create_competition, comp_data)
+        return await self._call(self._sync_api.create_competition, comp_data)
     
     async def get_all_competitions(self, guild_id: str) -> List[Dict[str, Any]]:
-        return await asyncio.to_thread(self._sync_api.get_all_competitions, guild_id)
+        return await self._call(self._sync_api.get_all_competitions, guild_id)
 
 
     async def __aenter__(self):
@@ -0,0 +1,236 @@
+"""
+Micro-benchmarks for Robo Nexus Bot parsing hot paths
+Run with: python3 bench_parsers.py
+"""
+import random
+import re
+import time
+from datetime import date, datetime
+from typing import Dict, Optional
+
+import input_validators
+from date_parser import DateParser
+
+INPUT_COUNT = 100_000
+REPEATS = 5
+
+
+def _legacy_parse_birthday(date_string: str) -> Optional[date]:
+    """The original DateParser.parse_birthday (four uncompiled patterns, datetime.now() per call)"""
+    if not date_string or not isinstance(date_string, str):
+        return None
+    date_string = date_string.strip()
+    try:
+        for format_pattern in DateParser.FORMATS:
+            match = re.match(format_pattern, date_string)
+            if match:
+                groups = match.groups()
+                if len(groups) == 2:
+                    month, day = map(int, groups)
+                    year = datetime.now().year
+                else:
+                    month, day, year = map(int, groups)
+                if 1 <= month <= 12 and 1 <= day <= 31 and 1900 <= year <= datetime.now().year + 1:
+                    return date(year, month, day)
+                return None
+        return None
+    except ValueError:
+        return None
+
+
+def _legacy_format_birthday(birthday: str) -> str:
+    parsed = _legacy_parse_birthday(birthday)
+    return parsed.strftime("%B %d") if parsed else birthday
+
+
+def _legacy_validate_email(email: str) -> bool:
+    """The original WelcomeSystem.validate_email (pattern compiled from the cache on every call)"""
+    if not email:
+        return False
+    if email.lower().strip() in ['none', 'no', 'skip', 'n/a', 'na']:
+        return True
+    email = email.lower().strip()
+    if not email.endswith('@gmail.com'):
+        return False
+    return bool(re.match(r'^[a-zA-Z0-9._%+-]+@gmail\.com$', email))
+
+
+def _legacy_validate_phone(phone: str) -> Optional[str]:
+    """The original WelcomeSystem.validate_phone"""
+    if not phone:
+        return None
+    phone = phone.strip()
+    if phone.lower() in ['none', 'no', 'skip', 'n/a', 'na']:
+        return None
+    cleaned = re.sub(r'[\s\-\(\)\+]', '', phone)
+    if cleaned.startswith('+'):
+        cleaned = cleaned[1:]
+    if not cleaned.isdigit():
+        return None
+    if len(cleaned) == 10:
+        return f"+91{cleaned}"
+    elif len(cleaned) == 12 and cleaned.startswith('91'):
+        return f"+{cleaned}"
+    elif len(cleaned) >= 10:
+        return f"+{cleaned}"
+    return None
+
+
+def _legacy_validate_social_links(links_text: str) -> Dict[str, str]:
+    """The original WelcomeSystem.validate_social_links (up to 20 substring scans per entry)"""
+    links = {}
+    if not links_text or links_text.lower().strip() in ['none', 'no', 'skip', 'n/a', 'na']:
+        return links
+    for line in re.split(r'[,\n]', links_text):
+        line = line.strip()
+        if not line:
+            continue
+        line = re.sub(r'^(github|linkedin|youtube|spotify|website|portfolio):\s*', '', line, flags=re.IGNORECASE)
+        if 'github.com' in line.lower():
+            links['github'] = line if line.startswith('http') else f"https://{line}"
+        elif 'linkedin.com' in line.lower():
+            links['linkedin'] = line if line.startswith('http') else f"https://{line}"
+        elif 'youtube.com' in line.lower() or 'youtu.be' in line.lower():
+            links['youtube'] = line if line.startswith('http') else f"https://{line}"
+        elif 'spotify.com' in line.lower() or 'open.spotify.com' in line.lower():
+            links['spotify'] = line if line.startswith('http') else f"https://{line}"
+        elif any(keyword in line.lower() for keyword in ['portfolio', 'website', 'site']) or \
+             any(domain in line.lower() for domain in ['.dev', '.com', '.org', '.net', '.io', '.me', '.co', '.github.io', '.netlify.app', '.vercel.app', '.herokuapp.com', '.firebase.app', '.pages.dev']) or \
+             line.startswith('http'):
+            url = line if line.startswith('http') else f"https://{line}"
+            website_key = 'website'
+            counter = 1
+            while website_key in links:
+                counter += 1
+                website_key = f'website{counter}'
+            links[website_key] = url
+    return links
+
+
+def _legacy_extract_class_from_text(text: str) -> Optional[str]:
+    """The original WelcomeSystem.extract_class_from_text"""
+    class_roles = {str(n): str(n) for n in range(6, 13)}
+    if not text:
+        return None
+    text = text.lower().strip()
+    if text in class_roles:
+        return text
+    ordinal_match = re.search(r'(\d+)(?:st|nd|rd|th)', text)
+    if ordinal_match:
+        class_num = ordinal_match.group(1)
+        if class_num in class_roles:
+            return class_num
+    word_to_number = {
+        "sixth": "6", "six": "6", "seventh": "7", "seven": "7", "eighth": "8", "eight": "8",
+        "ninth": "9", "nine": "9", "tenth": "10", "ten": "10", "eleventh": "11", "eleven": "11",
+        "twelfth": "12", "twelve": "12"
+    }
+    for word, number in word_to_number.items():
+        if word in text:
+            return number
+    number_match = re.search(r'\b(\d+)\b', text)
+    if number_match:
+        class_num = number_match.group(1)
+        if class_num in class_roles:
+            return class_num
+    return None
+
+
+def make_date_inputs(count: int, seed: int = 46) -> list:
+    """Realistic mix: mostly stored MM-DD values (heavily repeated), some user-typed variants"""
+    rng = random.Random(seed)
+    stored = [f"{m:02d}-{d:02d}" for m in range(1, 13) for d in range(1, 29)]
+    inputs = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.7:
+            inputs.append(rng.choice(stored))
+        elif roll < 0.85:
+            inputs.append(f"{rng.randint(1, 12)}/{rng.randint(1, 28)}")
+        elif roll < 0.95:
+            inputs.append(f"{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}-{rng.randint(1995, 2015)}")
+        else:
+            inputs.append(rng.choice(["13-45", "march 5", "", "02/30", " 03-15 "]))
+    return inputs
+
+
+def make_validator_inputs(count: int, seed: int = 49) -> dict:
+    """Messy verification answers as typed in DMs and old sign-up sheets"""
+    rng = random.Random(seed)
+    names = ["aarav", "priya.s", "rohan_g", "ananya99", "k.iyer", "dev+robo"]
+    emails, phones, links, classes = [], [], [], []
+    for _ in range(count):
+        # Handles are mostly unique, as they are across real members
+        name = f"{rng.choice(names)}{rng.randint(0, 99_999)}"
+        emails.append(rng.choice([
+            f"{name}@gmail.com", f" {name.upper()}@Gmail.com ", f"{name}@yahoo.com",
+            "skip", "N/A", f"{name}@gmail.co", f"{name} @gmail.com", ""
+        ]))
+        digits = f"{rng.randint(6, 9)}{rng.randint(0, 999_999_999):09d}"
+        phones.append(rng.choice([
+            digits, f"+91 {digits[:5]} {digits[5:]}", f"({digits[:3]}) {digits[3:6]}-{digits[6:]}",
+            f"91{digits}", "none", digits[:7], f"{digits[:5]}O{digits[6:]}", ""
+        ]))
+        links.append(", ".join(rng.sample([
+            f"github.com/{name}", f"GitHub: https://github.com/{name}", f"linkedin.com/in/{name}",
+            f"https://youtu.be/{name}", f"open.spotify.com/user/{name}", f"{name}.dev",
+            f"https://{name}.netlify.app", "my portfolio site", "none"
+        ], rng.randint(0, 3))))
+        classes.append(rng.choice([
+            str(rng.randint(6, 12)), f"class {rng.randint(6, 12)}", f"{rng.randint(6, 12)}th",
+            "Grade 10", "ninth grade", "sixth", "XI", "class 13", "I'm in twelfth", ""
+        ]))
+    return {'email': emails, 'phone': phones, 'social_links': links, 'class': classes}
+
+
+def timeit(label: str, func, *args) -> float:
+    """Best of REPEATS runs, so one noisy sample does not decide the speedup"""
+    elapsed = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print(f"  {label:<38} {elapsed * 1000:9.1f} ms")
+    return elapsed
+
+
+def bench_date_parser():
+    print(f"DateParser ({INPUT_COUNT:,} inputs)")
+    inputs = make_date_inputs(INPUT_COUNT)
+    
+    # Silence the per-input warnings so logging does not dominate the numbers
+    import logging
+    logging.getLogger("date_parser").setLevel(logging.ERROR)
+    
+    legacy = timeit("legacy parse_birthday loop", lambda: [_legacy_parse_birthday(s) for s in inputs])
+    current = timeit("parse_birthday loop", lambda: [DateParser.parse_birthday(s) for s in inputs])
+    bulk = timeit("parse_many", DateParser.parse_many, inputs)
+    print(f"  speedup: parse_birthday x{legacy / current:.1f}, parse_many x{legacy / bulk:.1f}")
+    
+    legacy_fmt = timeit("legacy format_birthday loop", lambda: [_legacy_format_birthday(s) for s in inputs])
+    current_fmt = timeit("format_birthday loop (parse_mmdd)", lambda: [DateParser.format_birthday(s) for s in inputs])
+    print(f"  speedup: format_birthday x{legacy_fmt / current_fmt:.1f}")
+
+
+def bench_validators():
+    print(f"Input validators ({INPUT_COUNT:,} inputs each)")
+    inputs = make_validator_inputs(INPUT_COUNT)
+    cases = [
+        ('email', _legacy_validate_email, input_validators.validate_email),
+        ('phone', _legacy_validate_phone, input_validators.validate_phone),
+        ('social_links', _legacy_validate_social_links, input_validators.validate_social_links),
+        ('class', _legacy_extract_class_from_text, input_validators.extract_class_from_text),
+    ]
+    
+    for kind, legacy_func, current_func in cases:
+        values = inputs[kind]
+        assert [legacy_func(v) for v in values] == [current_func(v) for v in values], f"{kind} results differ"
+        legacy = timeit(f"legacy {kind} loop", lambda: [legacy_func(v) for v in values])
+        current = timeit(f"{kind} loop", lambda: [current_func(v) for v in values])
+        bulk = timeit(f"validate_many('{kind}')", input_validators.validate_many, kind, values)
+        print(f"  speedup: {kind} x{legacy / current:.1f}, validate_many x{legacy / bulk:.1f}")
+
+
+if __name__ == "__main__":
+    bench_date_parser()
+    bench_validators()
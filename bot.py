@@ -5,13 +5,20 @@ Discord bot for managing birthday celebrations in the Robo Nexus server
 import discord
 from discord.ext import commands, tasks
 import logging
-from datetime import datetime, time
+import calendar
+from datetime import datetime, time, date, timedelta
 import asyncio
-from typing import Optional
+from typing import Optional, Dict, Set
 
 from config import Config
 from database import birthday_db
 from date_parser import DateParser
+from role_queue import RoleMutation, get_role_queue
+from role_registry import get_role_registry
+from command_instrumentation import InstrumentedCommandTree, install_response_timing, instrument_interaction
+from bot_metrics import BotMetrics
+from loop_monitor import LoopMonitor
+from metrics_registry import timed_task
 
 logger = logging.getLogger(__name__)
 
@@ -32,21 +39,40 @@ class RoboNexusBirthdayBot(commands.Bot):
             command_prefix='!',  # Fallback prefix (we'll use slash commands)
             intents=intents,
             help_command=None,  # We'll create our own help system
-            case_insensitive=True
+            case_insensitive=True,
+            tree_cls=InstrumentedCommandTree  # Times every app command
         )
         
         # Initialize components
         self.db_manager = birthday_db
         self.scheduler_started = False
+        self._birthday_sync_task: Optional[asyncio.Task] = None
+        self.metrics = BotMetrics(self)
+        self.loop_monitor = LoopMonitor(self, stall_threshold=Config.LOOP_STALL_THRESHOLD_MS / 1000)
+        install_response_timing()
         
         logger.info("Robo Nexus Birthday Bot initialized")
     
+    def dispatch(self, event_name: str, /, *args, **kwargs):
+        """Dispatch an event, instrumenting interactions before any handler runs"""
+        # The command tree and views schedule their handlers as tasks before this
+        # event is dispatched, so the arrival time is noted before they start
+        if event_name == 'interaction':
+            instrument_interaction(args[0])
+        super().dispatch(event_name, *args, **kwargs)
+    
     async def setup_hook(self):
         """Called when the bot is starting up"""
         try:
             # Database is already initialized in postgres_db.py
             logger.info("Database connection ready")
             
+            # Expose metrics for the keep-alive server's /metrics endpoint
+            self.metrics.install()
+            
+            # Watch for callbacks that block the event loop
+            self.loop_monitor.start()
+            
             # ============================================================================
             # COG LOADING ORDER DOCUMENTATION
             # ============================================================================
@@ -277,6 +303,12 @@ class RoboNexusBirthdayBot(commands.Bot):
         print(f"🎂 Monitoring birthdays for Robo Nexus community")
         print(f"⏰ Daily birthday check scheduled for {Config.BIRTHDAY_CHECK_TIME}")
     
+    @staticmethod
+    def _log_task_failure(task: asyncio.Task):
+        """Done-callback for background tasks, so their exceptions are not lost"""
+        if not task.cancelled() and task.exception():
+            logger.error(f"Background task {task.get_name()} failed", exc_info=task.exception())
+    
     async def start_birthday_scheduler(self):
         """Start the daily birthday check scheduler"""
         try:
@@ -287,6 +319,12 @@ class RoboNexusBirthdayBot(commands.Bot):
             self.daily_birthday_check.change_interval(time=time(hour=hour, minute=minute))
             self.daily_birthday_check.start()
             
+            # Start the birthday role task, and reconcile today's holders right away
+            # in case the bot was offline at midnight
+            self.birthday_role_job.start()
+            self._birthday_sync_task = asyncio.create_task(self.sync_birthday_roles(), name="birthday-role-sync")
+            self._birthday_sync_task.add_done_callback(self._log_task_failure)
+            
             self.scheduler_started = True
             logger.info(f"Birthday scheduler started - daily check at {Config.BIRTHDAY_CHECK_TIME}")
             
@@ -294,6 +332,7 @@ class RoboNexusBirthdayBot(commands.Bot):
             logger.error(f"Error starting birthday scheduler: {e}")
     
     @tasks.loop(time=time(hour=9, minute=0))  # Default 9:00 AM, will be changed in start_birthday_scheduler
+    @timed_task("daily_birthday_check")
     async def daily_birthday_check(self):
         """Daily task to check for birthdays and send notifications"""
         try:
@@ -399,12 +438,107 @@ class RoboNexusBirthdayBot(commands.Bot):
         except Exception as e:
             logger.error(f"Error sending birthday messages to guild {guild.name}: {e}", exc_info=True)
     
+    @tasks.loop(time=time(hour=0, minute=0))
+    @timed_task("birthday_role_job")
+    async def birthday_role_job(self):
+        """Daily task to move the birthday role from yesterday's members to today's"""
+        await self.sync_birthday_roles()
+    
+    async def sync_birthday_roles(self):
+        """Apply the birthday role changes for today in every guild"""
+        try:
+            calendar_index = await self.db_manager.get_calendar_index()
+            today = date.today()
+            todays_ids = self.birthday_ids_for(calendar_index, today)
+            yesterdays_ids = self.birthday_ids_for(calendar_index, today - timedelta(days=1))
+            
+            for guild in self.guilds:
+                await self.sync_guild_birthday_roles(guild, todays_ids, yesterdays_ids)
+        
+        except Exception as e:
+            logger.error(f"Error during birthday role sync: {e}", exc_info=True)
+    
+    @staticmethod
+    def birthday_ids_for(calendar_index: Dict[str, Set[int]], day: date) -> Set[int]:
+        """User IDs celebrating on a given day (Feb 29 birthdays move to Feb 28 in non-leap years)"""
+        user_ids = set(calendar_index.get(f"{day.month:02d}-{day.day:02d}", ()))
+        if day.month == 2 and day.day == 28 and not calendar.isleap(day.year):
+            user_ids |= calendar_index.get("02-29", set())
+        return user_ids
+    
+    async def sync_guild_birthday_roles(self, guild: discord.Guild, todays_ids: Set[int], yesterdays_ids: Set[int]):
+        """
+        Give the birthday role to today's members and take it from everyone else
+        
+        Only the set difference is applied, so members who keep the role (or
+        never had it) cost no API calls.
+        """
+        registry = get_role_registry()
+        role = registry.get(guild, Config.BIRTHDAY_ROLE_NAME)
+        if role is None:
+            if not todays_ids:
+                return
+            try:
+                role = await registry.get_or_create(
+                    guild,
+                    Config.BIRTHDAY_ROLE_NAME,
+                    color=discord.Color.gold(),
+                    hoist=True,
+                    reason="Auto-created birthday role by Robo Nexus Bot"
+                )
+                logger.info(f"Created birthday role in {guild.name}")
+            except discord.Forbidden:
+                logger.error(f"Bot lacks permission to create the birthday role in {guild.name}")
+                return
+            if role is None:
+                return  # A concurrent create failed
+        
+        # Current holders from the member cache, plus yesterday's birthdays in case the cache is cold
+        holders = {member.id for member in role.members}
+        to_add = todays_ids - holders
+        to_remove = (holders | yesterdays_ids) - todays_ids
+        
+        if not to_add and not to_remove:
+            return
+        
+        mutations = [
+            RoleMutation(guild, user_id, role, add=True, reason="Happy birthday! 🎂")
+            for user_id in to_add
+        ] + [
+            RoleMutation(guild, user_id, role, add=False, reason="Birthday is over")
+            for user_id in to_remove
+        ]
+        
+        result = await get_role_queue().apply(mutations)
+        logger.info(
+            f"Birthday roles in {guild.name}: {result.applied} applied, {result.skipped} skipped, "
+            f"{result.failed} failed in {result.elapsed:.1f}s"
+        )
+    
+    @birthday_role_job.before_loop
+    async def before_birthday_role_job(self):
+        """Wait for bot to be ready before moving birthday roles"""
+        await self.wait_until_ready()
+    
     @daily_birthday_check.before_loop
     async def before_birthday_check(self):
         """Wait for bot to be ready before starting birthday checks"""
         await self.wait_until_ready()
         logger.info("Bot is ready, birthday scheduler will start")
     
+    async def on_guild_role_create(self, role: discord.Role):
+        """Keep the role name index current"""
+        get_role_registry().on_role_create(role)
+    
+    async def on_guild_role_delete(self, role: discord.Role):
+        get_role_registry().on_role_delete(role)
+    
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        get_role_registry().on_role_update(before, after)
+    
+    async def on_guild_remove(self, guild: discord.Guild):
+        get_role_registry().forget_guild(guild.id)
+    
     async def on_command_error(self, ctx, error):
         """Handle command errors with analytics tracking"""
         if isinstance(error, commands.CommandNotFound):
@@ -425,6 +559,10 @@ class RoboNexusBirthdayBot(commands.Bot):
         except:
             pass  # Channel might not be accessible
     
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        """Record timing and usage for a slash command that finished without errors"""
+        self.tree.record_command(interaction)
+    
     async def on_application_command_error(self, interaction: discord.Interaction, error):
         """Handle slash command errors with analytics tracking"""
         logger.error(f"Slash command error: {error}")
@@ -470,6 +608,11 @@ class RoboNexusBirthdayBot(commands.Bot):
         # Stop the birthday scheduler
         if hasattr(self, 'daily_birthday_check'):
             self.daily_birthday_check.cancel()
+        if hasattr(self, 'birthday_role_job'):
+            self.birthday_role_job.cancel()
+        if self._birthday_sync_task:
+            self._birthday_sync_task.cancel()
+        self.loop_monitor.stop()
         
         # Close the bot
         await super().close()
@@ -0,0 +1,103 @@
+"""
+Bot Metrics for Robo Nexus Bot
+Collectors that expose bot, event loop, thread pool and cache state to the metrics registry
+"""
+import asyncio
+import bisect
+import logging
+from typing import List
+
+from metrics_registry import DEFAULT_BUCKETS, Family, get_metrics_registry, histogram_samples
+from latency_histogram import LogHistogram, get_latency_tracker
+
+logger = logging.getLogger(__name__)
+
+LATENCY_KINDS = ("command", "first_response", "defer", "autocomplete", "component")
+
+
+def _log_histogram_samples(labels, histogram: LogHistogram):
+    """Fold a log-bucket histogram (milliseconds) into the fixed second buckets"""
+    per_bound = [0] * len(DEFAULT_BUCKETS)
+    for index, count in histogram.counts.items():
+        upper_seconds = LogHistogram.bucket_upper_bound(index) / 1000
+        position = bisect.bisect_left(DEFAULT_BUCKETS, upper_seconds)
+        if position < len(per_bound):
+            per_bound[position] += count
+    
+    cumulative, running = [], 0
+    for count in per_bound:
+        running += count
+        cumulative.append(running)
+    return histogram_samples(labels, DEFAULT_BUCKETS, cumulative, histogram.count, histogram.total / 1000)
+
+
+def collect_interaction_latency() -> List[Family]:
+    """Since-boot interaction histograms and command counts from the latency trackers"""
+    duration_samples, count_samples = [], []
+    for kind in LATENCY_KINDS:
+        for name, histogram in get_latency_tracker(kind).window(None).items():
+            duration_samples.extend(_log_histogram_samples({"kind": kind, "name": name}, histogram))
+            if kind == "command":
+                count_samples.append(("_total", {"command": name}, histogram.count))
+    
+    return [
+        ("robonexus_commands", "counter", "App commands handled since boot", count_samples),
+        ("robonexus_interaction_duration_seconds", "histogram",
+         "Interaction timings by kind (command total, first response, autocomplete, component)", duration_samples),
+    ]
+
+
+def collect_caches() -> List[Family]:
+    """Hit/miss counts for the in-process caches"""
+    from date_parser import _parse_mmdd_cached
+    from database import birthday_db
+    
+    info = _parse_mmdd_cached.cache_info()
+    samples = [
+        ("_total", {"cache": "parse_mmdd", "result": "hit"}, info.hits),
+        ("_total", {"cache": "parse_mmdd", "result": "miss"}, info.misses),
+        ("_total", {"cache": "calendar_index", "result": "hit"}, birthday_db.calendar_index_hits),
+        ("_total", {"cache": "calendar_index", "result": "miss"}, birthday_db.calendar_index_misses),
+    ]
+    return [("robonexus_cache_requests", "counter", "Cache lookups by result", samples)]
+
+
+class BotMetrics:
+    """Registers bot-level collectors (event loop lag is sampled by LoopMonitor)"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+        self.registry = get_metrics_registry()
+    
+    def install(self):
+        """Register collectors against the running loop"""
+        self.registry.set_loop(asyncio.get_running_loop())
+        self.registry.register_collector(self.collect_bot)
+        self.registry.register_collector(self.collect_thread_pool)
+        self.registry.register_collector(collect_interaction_latency)
+        self.registry.register_collector(collect_caches)
+        logger.info("Bot metrics installed")
+    
+    def collect_bot(self) -> List[Family]:
+        latency = self.bot.latency
+        samples = [] if latency != latency or latency == float('inf') else [("", {}, latency)]  # NaN before connect
+        return [
+            ("robonexus_gateway_latency_seconds", "gauge", "Discord gateway heartbeat latency", samples),
+            ("robonexus_guilds", "gauge", "Guilds the bot is connected to", [("", {}, len(self.bot.guilds))]),
+        ]
+    
+    def collect_thread_pool(self) -> List[Family]:
+        """Depth of the default executor used by asyncio.to_thread"""
+        executor = getattr(self.registry._loop, "_default_executor", None)
+        if executor is None:
+            return []
+        queue = getattr(executor, "_work_queue", None)
+        threads = getattr(executor, "_threads", ())
+        return [
+            ("robonexus_thread_pool_queue_depth", "gauge", "Calls waiting for a worker thread",
+             [("", {}, queue.qsize() if queue is not None else 0)]),
+            ("robonexus_thread_pool_threads", "gauge", "Worker threads started",
+             [("", {}, len(threads))]),
+            ("robonexus_thread_pool_max_threads", "gauge", "Worker thread limit",
+             [("", {}, getattr(executor, "_max_workers", 0))]),
+        ]
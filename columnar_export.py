@@ -0,0 +1,282 @@
+"""
+Columnar Export for Robo Nexus Bot
+Typed Parquet / Arrow IPC exports of profiles, birthdays, teams and competitions
+"""
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from date_parser import DateParser
+from profile_export import profile_record, SOCIAL_PLATFORMS
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # pyarrow is optional, columnar exports are unavailable without it
+    pa = None
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow builds without Parquet still have Arrow IPC
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+
+def columnar_formats() -> List[str]:
+    """Formats usable with the installed pyarrow (empty without it)"""
+    if pa is None:
+        return []
+    return [fmt for fmt in COLUMNAR_FORMATS if fmt != 'parquet' or pq is not None]
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_str(value: Any) -> Optional[str]:
+    return str(value) if value not in (None, '') else None
+
+
+def _to_bool(value: Any) -> Optional[bool]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', 't', '1', 'yes')
+    return bool(value)
+
+
+def _to_timestamp(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+# Column kind -> (arrow type factory, value converter)
+_KINDS: Dict[str, Tuple[Callable[[], Any], Callable[[Any], Any]]] = {
+    'int64': (lambda: pa.int64(), _to_int),
+    'int16': (lambda: pa.int16(), _to_int),
+    'int8': (lambda: pa.int8(), _to_int),
+    'string': (lambda: pa.string(), _to_str),
+    'bool': (lambda: pa.bool_(), _to_bool),
+    'timestamp': (lambda: pa.timestamp('us', tz='UTC'), _to_timestamp),
+}
+
+
+@dataclass
+class ExportTable:
+    """One exported table: where its rows come from and their typed columns"""
+    name: str
+    source: str
+    key: Tuple[str, ...]
+    columns: List[Tuple[str, str]]
+    guild_scoped: bool = False
+    # Maps a source row to column values (default: columns are read by name)
+    row: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None
+    
+    def schema(self):
+        return pa.schema([(name, _KINDS[kind][0]()) for name, kind in self.columns])
+    
+    def batch(self, rows: List[Dict[str, Any]]):
+        """Convert one page of rows into a typed record batch"""
+        if self.row:
+            rows = [self.row(row) for row in rows]
+        arrays = []
+        for name, kind in self.columns:
+            convert = _KINDS[kind][1]
+            arrays.append(pa.array([convert(row.get(name)) for row in rows], type=_KINDS[kind][0]()))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema())
+
+
+def _birthday_columns(row: Dict[str, Any]) -> Dict[str, Any]:
+    # Stored birthdays come in several shapes (MM-DD, MM/DD, YYYY-MM-DD), export them all as MM-DD
+    parsed = DateParser.parse_mmdd(row.get('birthday'))
+    if parsed is None:
+        return {**row, 'birthday': None, 'birthday_month': None, 'birthday_day': None}
+    month, day = parsed
+    return {**row, 'birthday': f"{month:02d}-{day:02d}", 'birthday_month': month, 'birthday_day': day}
+
+
+def _profile_columns(row: Dict[str, Any]) -> Dict[str, Any]:
+    # The birthday join is stashed on the row by the exporter before conversion
+    record = profile_record(row, row.get('_birthday'))
+    return _birthday_columns({
+        **record,
+        'display_name': record['name'],
+        'class_year': record['class'],
+        'verification_status': row.get('verification_status'),
+        'created_at': row.get('created_at'),
+        'updated_at': row.get('updated_at'),
+    })
+
+
+EXPORT_TABLES = [
+    ExportTable('profiles', 'user_profiles', ('user_id',), [
+        ('user_id', 'int64'), ('username', 'string'), ('display_name', 'string'),
+        ('class_year', 'int8'), ('email', 'string'), ('phone', 'string'),
+        ('birthday', 'string'), ('birthday_month', 'int8'), ('birthday_day', 'int8'),
+        *[(platform, 'string') for platform in SOCIAL_PLATFORMS],
+        ('verification_status', 'string'), ('created_at', 'timestamp'), ('updated_at', 'timestamp'),
+    ], row=_profile_columns),
+    ExportTable('birthdays', 'birthdays', ('user_id',), [
+        ('user_id', 'int64'), ('birthday', 'string'), ('birthday_month', 'int8'),
+        ('birthday_day', 'int8'), ('registered_at', 'timestamp'),
+    ], row=_birthday_columns),
+    ExportTable('teams', 'teams', ('name',), [
+        ('guild_id', 'int64'), ('name', 'string'), ('leader_id', 'int64'), ('description', 'string'),
+        ('is_permanent', 'bool'), ('max_members', 'int16'), ('requirements', 'string'),
+        ('recruiting', 'bool'), ('created_at', 'timestamp'),
+    ], guild_scoped=True),
+    ExportTable('team_members', 'team_members', ('team_name', 'user_id'), [
+        ('guild_id', 'int64'), ('team_name', 'string'), ('user_id', 'int64'),
+        ('user_name', 'string'), ('joined_at', 'timestamp'),
+    ], guild_scoped=True),
+    ExportTable('competitions', 'competitions', ('id',), [
+        ('id', 'int64'), ('guild_id', 'int64'), ('name', 'string'), ('description', 'string'),
+        ('category', 'string'), ('start_date', 'timestamp'), ('end_date', 'timestamp'),
+        ('created_at', 'timestamp'),
+    ], guild_scoped=True),
+]
+
+
+@dataclass
+class ColumnarFile:
+    """One finished table file on disk"""
+    table: str
+    path: str
+    filename: str
+    rows: int
+    size: int
+
+
+@dataclass
+class ColumnarExport:
+    files: List[ColumnarFile] = field(default_factory=list)
+    elapsed: float = 0.0
+    
+    @property
+    def rows(self) -> int:
+        return sum(f.rows for f in self.files)
+    
+    @property
+    def size(self) -> int:
+        return sum(f.size for f in self.files)
+    
+    def close(self):
+        """Delete the temporary files"""
+        for f in self.files:
+            try:
+                os.remove(f.path)
+            except OSError:
+                pass
+
+
+class ColumnarExporter:
+    """
+    Writes each table as one typed, zstd-compressed Parquet or Arrow IPC file
+    
+    Tables are read PAGE_SIZE rows at a time with keyset pagination, the
+    next page being fetched while the current one is converted. Every page
+    becomes one record batch appended to the open writer, so only a page
+    of rows is ever held in memory. Conversion and compression run in a
+    worker thread.
+    """
+    
+    PAGE_SIZE = 1000
+    COMPRESSION = 'zstd'
+    
+    def __init__(self, db, birthday_db, guild_id: int, fmt: str = 'parquet'):
+        if fmt not in columnar_formats():
+            raise ValueError(f"Columnar format '{fmt}' is not available (is pyarrow installed?)")
+        self.db = db
+        self.birthday_db = birthday_db
+        self.guild_id = str(guild_id)
+        self.fmt = fmt
+    
+    async def _fetch_page(self, table: ExportTable, after: Optional[Tuple[Any, ...]]) -> List[Dict[str, Any]]:
+        filters = {'guild_id': f"eq.{self.guild_id}"} if table.guild_scoped else None
+        page = await self.db.get_table_page(table.source, table.key, after, self.PAGE_SIZE, filters)
+        if page is None:
+            raise RuntimeError(f"Could not read {table.source} from the database")
+        return page
+    
+    async def _pages(self, table: ExportTable) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of a table, prefetching the next one while the caller works"""
+        page = await self._fetch_page(table, None)
+        while page:
+            after = tuple(page[-1].get(column) for column in table.key)
+            next_page = asyncio.create_task(self._fetch_page(table, after))
+            try:
+                yield page
+            except BaseException:
+                next_page.cancel()
+                raise
+            page = await next_page
+    
+    def _open_writer(self, path: str, schema):
+        if self.fmt == 'parquet':
+            return pq.ParquetWriter(path, schema, compression=self.COMPRESSION)
+        options = pa_ipc.IpcWriteOptions(compression=self.COMPRESSION)
+        return pa_ipc.new_file(path, schema, options=options)
+    
+    def _write_page(self, writer, table: ExportTable, rows: List[Dict[str, Any]]):
+        writer.write_batch(table.batch(rows))
+    
+    async def _export_table(self, table: ExportTable, stamp: str) -> ColumnarFile:
+        extension = 'parquet' if self.fmt == 'parquet' else 'arrow'
+        fd, path = tempfile.mkstemp(prefix=f"robo_nexus_{table.name}_", suffix=f".{extension}")
+        os.close(fd)
+        rows = 0
+        try:
+            writer = self._open_writer(path, table.schema())
+            try:
+                async for page in self._pages(table):
+                    if table.name == 'profiles':
+                        birthdays = await self.birthday_db.get_birthdays_for(
+                            (profile['user_id'] for profile in page if profile.get('user_id')),
+                            profiles=page
+                        )
+                        page = [
+                            {**profile, '_birthday': birthdays.get(_to_int(profile.get('user_id')))}
+                            for profile in page
+                        ]
+                    await asyncio.to_thread(self._write_page, writer, table, page)
+                    rows += len(page)
+            finally:
+                writer.close()
+        except BaseException:
+            os.remove(path)
+            raise
+        return ColumnarFile(table.name, path, f"robo_nexus_{table.name}_{stamp}.{extension}", rows, os.path.getsize(path))
+    
+    async def export(self) -> ColumnarExport:
+        """Export every table, one file each"""
+        start = time.monotonic()
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        result = ColumnarExport()
+        try:
+            for table in EXPORT_TABLES:
+                result.files.append(await self._export_table(table, stamp))
+        except BaseException:
+            result.close()
+            raise
+        result.elapsed = time.monotonic() - start
+        logger.info(
+            f"Exported {result.rows} rows across {len(result.files)} tables as {self.fmt} "
+            f"({result.size} bytes) in {result.elapsed:.2f}s"
+        )
+        return result
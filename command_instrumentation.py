@@ -0,0 +1,161 @@
+"""
+Command Instrumentation for Robo Nexus Bot
+Times every app command, autocomplete and component interaction without per-command decorators
+"""
+import functools
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+import discord
+from discord import app_commands
+
+from latency_histogram import get_latency_tracker
+
+logger = logging.getLogger(__name__)
+
+# discord.py generates 32-character hex custom IDs for components created without one
+_AUTO_CUSTOM_ID = re.compile(r'[0-9a-f]{32}')
+# Long digit runs in custom IDs are record IDs (auctions, users), collapse them to keep names bounded
+_ID_RUN = re.compile(r'\d{3,}')
+
+_COMMAND_TYPES = (discord.InteractionType.application_command, discord.InteractionType.autocomplete)
+
+
+def interaction_label(interaction: discord.Interaction) -> str:
+    """Stable, low-cardinality metric name for an interaction"""
+    data = interaction.data or {}
+    if interaction.type in _COMMAND_TYPES:
+        command = interaction.command
+        return command.qualified_name if command else data.get('name', 'unknown')
+    
+    prefix = 'modal' if interaction.type is discord.InteractionType.modal_submit else 'component'
+    custom_id = data.get('custom_id', '')
+    if not custom_id or _AUTO_CUSTOM_ID.fullmatch(custom_id):
+        return f"{prefix}:auto"
+    return f"{prefix}:{_ID_RUN.sub('#', custom_id)[:40]}"
+
+
+# Discord drops interactions not acknowledged within 3 seconds, nothing to time after that
+RESPONSE_DEADLINE = 3.0
+
+# InteractionResponse methods that acknowledge an interaction, and the kind of response each is
+_RESPONSE_METHODS = {
+    'defer': 'defer',
+    'send_message': 'message',
+    'edit_message': 'edit',
+    'send_modal': 'modal',
+    'autocomplete': 'autocomplete',
+}
+
+# Interactions waiting for their first response, keyed by id() of their InteractionResponse.
+# Each entry holds the interaction (and so its response), so the id cannot be reused while it is pending.
+_pending: "OrderedDict[int, Tuple[discord.Interaction, float]]" = OrderedDict()
+_response_timing_installed = False
+
+
+def _record_first_response(interaction: discord.Interaction, kind: str, elapsed_ms: float):
+    try:
+        label = interaction_label(interaction)
+        if interaction.type is discord.InteractionType.autocomplete:
+            # Autocomplete answers once and has no completion hook, so its response is its latency
+            get_latency_tracker("autocomplete").record(label, elapsed_ms)
+            return
+        
+        get_latency_tracker("first_response").record(label, elapsed_ms)
+        if kind == 'defer':
+            # Deferring only buys time, keep it apart so slow real answers are not hidden behind fast defers
+            get_latency_tracker("defer").record(label, elapsed_ms)
+        if interaction.type not in _COMMAND_TYPES:
+            # Component callbacks have no completion hook, their first response is the user-visible latency
+            get_latency_tracker("component").record(label, elapsed_ms)
+    except Exception as e:
+        logger.error(f"Error recording interaction response time: {e}")
+
+
+def _timed_response(method, kind: str):
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        result = await method(self, *args, **kwargs)
+        entry = _pending.pop(id(self), None)
+        if entry is not None:
+            interaction, started = entry
+            _record_first_response(interaction, kind, (time.perf_counter() - started) * 1000)
+        return result
+    return wrapper
+
+
+def install_response_timing():
+    """
+    Wrap the InteractionResponse methods once so first responses are timed as they are sent
+    
+    Safe to call more than once. A method missing from this discord.py version
+    is simply not timed.
+    """
+    global _response_timing_installed
+    if _response_timing_installed:
+        return
+    for name, kind in _RESPONSE_METHODS.items():
+        method = getattr(discord.InteractionResponse, name, None)
+        if method is not None:
+            setattr(discord.InteractionResponse, name, _timed_response(method, kind))
+    _response_timing_installed = True
+
+
+def instrument_interaction(interaction: discord.Interaction):
+    """
+    Note when an interaction arrived so its first response can be timed
+    
+    Called as the interaction is dispatched, before any handler has run. The
+    arrival time goes in interaction.extras for the command timing, and the
+    interaction waits in _pending until one of the wrapped response methods
+    acknowledges it.
+    """
+    try:
+        started = time.perf_counter()
+        interaction.extras['started'] = started
+        
+        # Drop interactions that were never acknowledged, oldest first
+        while _pending:
+            _, (_, oldest) = next(iter(_pending.items()))
+            if started - oldest <= RESPONSE_DEADLINE:
+                break
+            _pending.popitem(last=False)
+        
+        if _response_timing_installed:
+            _pending[id(interaction.response)] = (interaction, started)
+    except Exception as e:
+        logger.error(f"Could not instrument interaction {interaction.id}: {e}")
+
+
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """
+    CommandTree that times every app command it dispatches
+    
+    Successful commands are recorded from the bot's app_command_completion
+    event and failed ones from on_error, both public hooks.
+    """
+    
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        self.record_command(interaction)
+        await super().on_error(interaction, error)
+    
+    def record_command(self, interaction: discord.Interaction):
+        """Record a finished command, timed from when the interaction arrived"""
+        started = interaction.extras.get('started')
+        if started is None or interaction.type is not discord.InteractionType.application_command:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        
+        try:
+            label = interaction_label(interaction)
+            get_latency_tracker("command").record(label, elapsed_ms)
+            
+            analytics_cog = self.client.get_cog('Analytics')
+            if analytics_cog:
+                analytics_cog.track_command_usage(label, interaction.user.id)
+                analytics_cog.track_performance(label, elapsed_ms / 1000)
+        except Exception as e:
+            logger.error(f"Error recording command timing: {e}")
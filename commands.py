@@ -5,13 +5,198 @@ All Discord slash command implementations
 import discord
 from discord import app_commands
 from discord.ext import commands
+import asyncio
 import logging
+from datetime import date
 from typing import Optional
 
 from date_parser import DateParser
 
 logger = logging.getLogger(__name__)
 
+class UpcomingBirthdaysView(discord.ui.View):
+    """
+    Paginator for /upcoming_birthdays that works one page at a time
+    
+    Birthdays are sorted up front from the stored dates alone. Members are
+    only resolved (cache first, then the API) when a page is rendered, and
+    the next page is prefetched in the background while the current one is
+    being read.
+    """
+    
+    PER_PAGE = 10
+    PREFETCH_PAGES = 1
+    
+    def __init__(self, guild: discord.Guild, author_id: int, birthday_records: list, timeout: float = 180):
+        super().__init__(timeout=timeout)
+        self.guild = guild
+        self.author_id = author_id
+        self.page = 0
+        
+        # (days_until, month, day, user_id), soonest first
+        today = date.today()
+        entries = []
+        for record in birthday_records:
+            try:
+                if isinstance(record, dict):
+                    user_id, birthday_date = int(record['user_id']), record['birthday']
+                else:
+                    # Handle tuple format (legacy)
+                    user_id, birthday_date = record
+                parsed = DateParser.parse_mmdd(birthday_date)
+                if parsed:
+                    month, day = parsed
+                    entries.append((DateParser.days_until(month, day, today), month, day, int(user_id)))
+            except Exception as e:
+                logger.warning(f"Error processing birthday record {record}: {e}")
+        entries.sort()
+        self.entries = entries
+        
+        self._page_starts = [0]   # Entry index each page starts at, discovered as pages are built
+        self._last_page = None    # Known once the entries have been exhausted
+        self._pages = {}          # Page number -> rendered lines
+        self._tasks = {}          # Page number -> in-flight build task
+    
+    def is_single_page(self) -> bool:
+        return self._last_page == 0
+    
+    async def _resolve_members(self, user_ids: list) -> dict:
+        """Resolve members from the cache, fetching only the misses concurrently"""
+        members = {}
+        missing = []
+        for user_id in user_ids:
+            member = self.guild.get_member(user_id)
+            if member:
+                members[user_id] = member
+            else:
+                missing.append(user_id)
+        
+        if missing:
+            results = await asyncio.gather(
+                *(self.guild.fetch_member(user_id) for user_id in missing),
+                return_exceptions=True
+            )
+            for user_id, result in zip(missing, results):
+                if isinstance(result, discord.Member):
+                    members[user_id] = result
+                elif not isinstance(result, discord.NotFound):
+                    # User not in this guild is expected, anything else is worth logging
+                    logger.warning(f"Error fetching member {user_id}: {result}")
+        
+        return members
+    
+    async def _build_page(self, page_num: int) -> list:
+        """Resolve members for one page, skipping users who are not in this guild"""
+        if page_num > 0:
+            await self._get_page(page_num - 1)
+        if page_num >= len(self._page_starts):
+            return []
+        
+        index = self._page_starts[page_num]
+        lines = []
+        
+        while len(lines) < self.PER_PAGE and index < len(self.entries):
+            batch = self.entries[index:index + self.PER_PAGE - len(lines)]
+            members = await self._resolve_members([entry[3] for entry in batch])
+            
+            for days_until, month, day, user_id in batch:
+                index += 1
+                member = members.get(user_id)
+                if not member:
+                    continue
+                
+                days_text = ""
+                if days_until == 0:
+                    days_text = " 🎉 **TODAY!**"
+                elif days_until == 1:
+                    days_text = " (Tomorrow)"
+                elif days_until <= 7:
+                    days_text = f" (in {days_until} days)"
+                
+                lines.append(f"🎂 **{member.display_name}** - {DateParser.format_month_day(month, day)}{days_text}")
+        
+        if index >= len(self.entries):
+            self._last_page = page_num if lines or page_num == 0 else page_num - 1
+        elif len(self._page_starts) == page_num + 1:
+            self._page_starts.append(index)
+        
+        return lines
+    
+    async def _get_page(self, page_num: int) -> list:
+        """Get the lines for a page, sharing a single build task between callers"""
+        if page_num in self._pages:
+            return self._pages[page_num]
+        
+        task = self._tasks.get(page_num)
+        if task is None:
+            task = asyncio.create_task(self._build_page(page_num))
+            self._tasks[page_num] = task
+        
+        try:
+            lines = await task
+        finally:
+            self._tasks.pop(page_num, None)
+        
+        self._pages[page_num] = lines
+        return lines
+    
+    def _prefetch(self, page_num: int):
+        """Start building the next pages in the background"""
+        for ahead in range(page_num + 1, page_num + 1 + self.PREFETCH_PAGES):
+            if self._last_page is not None and ahead > self._last_page:
+                break
+            if ahead not in self._pages and ahead not in self._tasks:
+                self._tasks[ahead] = asyncio.create_task(self._build_page(ahead))
+    
+    async def render_page(self, page_num: int) -> Optional[discord.Embed]:
+        """Build the embed for a page, or None if the page has no members"""
+        lines = await self._get_page(page_num)
+        if not lines:
+            return None
+        
+        self.page = page_num
+        self._prefetch(page_num)
+        
+        self.previous_page.disabled = page_num == 0
+        self.next_page.disabled = self._last_page is not None and page_num >= self._last_page
+        
+        embed = discord.Embed(
+            title="🎉 Upcoming Birthdays in Robo Nexus",
+            description="\n".join(lines),
+            color=discord.Color.purple()
+        )
+        total_pages = f"/{self._last_page + 1}" if self._last_page is not None else ""
+        embed.set_footer(text=f"Page {page_num + 1}{total_pages} • {len(self.entries)} registered birthdays")
+        return embed
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("This isn't your command!", ephemeral=True)
+            return False
+        return True
+    
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.primary, disabled=True)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        embed = await self.render_page(max(0, self.page - 1))
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.primary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        # Members for the next page are usually prefetched already; defer in case they are not
+        await interaction.response.defer()
+        embed = await self.render_page(self.page + 1)
+        if embed is None:
+            # Remaining birthdays belonged to users who left the server
+            self._last_page = self.page
+            embed = await self.render_page(self.page)
+        await interaction.edit_original_response(embed=embed, view=self)
+    
+    async def on_timeout(self):
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+
 class BirthdayCommands(commands.Cog):
     """Cog containing all birthday-related slash commands"""
     
@@ -53,21 +238,8 @@ class BirthdayCommands(commands.Cog):
             # Convert date object to MM-DD string format for database
             birthday_string = birthday.strftime('%m-%d')
             
-            # Register the birthday in birthdays table
-            success = await self.db.add_birthday(interaction.user.id, birthday_string)
-            
-            # Also update user profile if it exists
-            try:
-                from async_supabase_wrapper import get_async_supabase
-                supabase = get_async_supabase()
-                profile = await supabase.get_user_profile(str(interaction.user.id))
-                if profile:
-                    # Update the birthday in user profile too (use string format)
-                    await supabase.update_user_profile(str(interaction.user.id), {"birthday": birthday_string})
-                    logger.info(f"Updated birthday in user profile for {interaction.user.display_name}")
-            except Exception as e:
-                logger.error(f"Error updating user profile birthday: {e}")
-                # Don't fail the command if profile update fails
+            # Register the birthday (birthdays table, mirrored onto the user profile)
+            success = await self.db.set_birthday(interaction.user.id, birthday_string)
             
             if success:
                 # Success message
@@ -280,130 +452,28 @@ class BirthdayCommands(commands.Cog):
                 await interaction.followup.send(embed=embed)
                 return
             
-            # Create birthday list with sorting
-            from datetime import datetime, date
-            birthday_data = []
+            # Sort by days until birthday (soonest first) without resolving any members yet
+            view = UpcomingBirthdaysView(interaction.guild, interaction.user.id, all_birthdays)
             
-            for birthday_record in all_birthdays:
-                try:
-                    # Extract user_id and birthday from the record
-                    if isinstance(birthday_record, dict):
-                        user_id = int(birthday_record['user_id'])
-                        birthday_date = birthday_record['birthday']
-                    else:
-                        # Handle tuple format (legacy)
-                        user_id, birthday_date = birthday_record
-                    
-                    # Try to fetch member from Discord API (more reliable than get_member)
-                    user = await interaction.guild.fetch_member(user_id)
-                    if user:
-                        # Parse birthday to get month and day
-                        parsed_date = DateParser.parse_birthday(birthday_date)
-                        if parsed_date:
-                            # Calculate days until next birthday
-                            today = date.today()
-                            next_birthday = date(today.year, parsed_date.month, parsed_date.day)
-                            
-                            # If birthday already passed this year, use next year
-                            if next_birthday < today:
-                                next_birthday = date(today.year + 1, parsed_date.month, parsed_date.day)
-                            
-                            days_until = (next_birthday - today).days
-                            
-                            formatted_date = DateParser.format_birthday(birthday_date)
-                            birthday_data.append({
-                                'user': user,
-                                'formatted_date': formatted_date,
-                                'days_until': days_until,
-                                'month': parsed_date.month,
-                                'day': parsed_date.day
-                            })
-                except discord.NotFound:
-                    # User not in this guild, skip
-                    continue
-                except Exception as e:
-                    # Log other errors but continue
-                    logger.warning(f"Error processing birthday record {birthday_record}: {e}")
-                    continue
+            # Only the first page's members are resolved before responding
+            embed = await view.render_page(0)
             
-            if not birthday_data:
+            if embed is None:
                 embed = discord.Embed(
                     title="📅 No Birthdays in This Server",
                     description="No registered birthdays found for members of this server.",
                     color=discord.Color.orange()
                 )
                 await interaction.followup.send(embed=embed)
+                view.stop()
                 return
             
-            # Sort by days until birthday (soonest first)
-            birthday_data.sort(key=lambda x: x['days_until'])
-            
-            # Pagination setup
-            page = 0
-            per_page = 10
-            total_pages = (len(birthday_data) + per_page - 1) // per_page
-            
-            def create_embed(page_num):
-                start_idx = page_num * per_page
-                end_idx = min(start_idx + per_page, len(birthday_data))
-                
-                birthday_list = []
-                for bd in birthday_data[start_idx:end_idx]:
-                    days_text = ""
-                    if bd['days_until'] == 0:
-                        days_text = " 🎉 **TODAY!**"
-                    elif bd['days_until'] == 1:
-                        days_text = " (Tomorrow)"
-                    elif bd['days_until'] <= 7:
-                        days_text = f" (in {bd['days_until']} days)"
-                    
-                    birthday_list.append(f"🎂 **{bd['user'].display_name}** - {bd['formatted_date']}{days_text}")
-                
-                embed = discord.Embed(
-                    title="🎉 Upcoming Birthdays in Robo Nexus",
-                    description="\n".join(birthday_list),
-                    color=discord.Color.purple()
-                )
-                embed.set_footer(text=f"Page {page_num + 1}/{total_pages} • {len(birthday_data)} total birthdays")
-                return embed
-            
-            # Create view with buttons if multiple pages
-            if total_pages > 1:
-                view = discord.ui.View(timeout=180)
-                
-                async def previous_callback(button_interaction):
-                    nonlocal page
-                    if button_interaction.user.id != interaction.user.id:
-                        await button_interaction.response.send_message("This isn't your command!", ephemeral=True)
-                        return
-                    page = max(0, page - 1)
-                    prev_button.disabled = (page == 0)
-                    next_button.disabled = (page == total_pages - 1)
-                    await button_interaction.response.edit_message(embed=create_embed(page), view=view)
-                
-                async def next_callback(button_interaction):
-                    nonlocal page
-                    if button_interaction.user.id != interaction.user.id:
-                        await button_interaction.response.send_message("This isn't your command!", ephemeral=True)
-                        return
-                    page = min(total_pages - 1, page + 1)
-                    prev_button.disabled = (page == 0)
-                    next_button.disabled = (page == total_pages - 1)
-                    await button_interaction.response.edit_message(embed=create_embed(page), view=view)
-                
-                prev_button = discord.ui.Button(label="◀ Previous", style=discord.ButtonStyle.primary, disabled=True)
-                next_button = discord.ui.Button(label="Next ▶", style=discord.ButtonStyle.primary)
-                
-                prev_button.callback = previous_callback
-                next_button.callback = next_callback
-                
-                view.add_item(prev_button)
-                view.add_item(next_button)
-                
-                await interaction.followup.send(embed=create_embed(page), view=view)
+            if view.is_single_page():
+                await interaction.followup.send(embed=embed)
+                view.stop()
             else:
-                await interaction.followup.send(embed=create_embed(page))
-            
+                await interaction.followup.send(embed=embed, view=view)
+        
         except Exception as e:
             logger.error(f"Error in upcoming_birthdays command: {e}")
             
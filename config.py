@@ -34,6 +34,20 @@ class Config:
     # Bot Configuration
     BOT_NAME = os.getenv('BOT_NAME', 'Robo Nexus')
     BIRTHDAY_CHECK_TIME = os.getenv('BIRTHDAY_CHECK_TIME', '09:00')
+    BIRTHDAY_ROLE_NAME = os.getenv('BIRTHDAY_ROLE_NAME', 'Birthday')  # Role given to members for their birthday
+    
+    # Analytics Configuration
+    ANALYTICS_DB_PATH = os.getenv('ANALYTICS_DB_PATH', 'analytics.db')  # SQLite file for usage analytics
+    # Rollup retention per tier (0 keeps the tier forever)
+    ANALYTICS_MINUTE_RETENTION_HOURS = int(os.getenv('ANALYTICS_MINUTE_RETENTION_HOURS', '48'))
+    ANALYTICS_HOUR_RETENTION_DAYS = int(os.getenv('ANALYTICS_HOUR_RETENTION_DAYS', '30'))
+    ANALYTICS_DAY_RETENTION_DAYS = int(os.getenv('ANALYTICS_DAY_RETENTION_DAYS', '400'))
+    ANALYTICS_MONTH_RETENTION_MONTHS = int(os.getenv('ANALYTICS_MONTH_RETENTION_MONTHS', '0'))
+    LOOP_STALL_THRESHOLD_MS = int(os.getenv('LOOP_STALL_THRESHOLD_MS', '500'))  # Report callbacks blocking the loop this long
+    
+    # Onboarding Configuration
+    VERIFICATION_DB_PATH = os.getenv('VERIFICATION_DB_PATH', 'verification.db')  # SQLite file for half-finished onboarding
+    VERIFICATION_TTL_HOURS = int(os.getenv('VERIFICATION_TTL_HOURS', '72'))  # Forget onboarding idle this long
     
     # GitHub Integration Configuration
     GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')  # GitHub Personal Access Token
@@ -2,24 +2,38 @@
 Supabase Database Interface for Robo Nexus Bot
 Uses Supabase REST API instead of direct PostgreSQL connections
 """
+import asyncio
 import logging
+import time
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import Iterable, List, Dict, Optional, Any, Set
 from async_supabase_wrapper import get_async_supabase
+from date_parser import DateParser
 
 logger = logging.getLogger(__name__)
 
 class BirthdayDatabase:
     """Supabase-based birthday database"""
     
+    # How long the MM-DD calendar index is trusted before it is rebuilt
+    CALENDAR_INDEX_TTL = 600
+    
+    # Above this many users one full birthdays read beats chunked in.() reads
+    BULK_FULL_SCAN_THRESHOLD = 500
+    
     def __init__(self):
         self.db = get_async_supabase()
+        self._calendar_index: Optional[Dict[str, Set[int]]] = None
+        self._calendar_index_built_at = 0.0
+        self.calendar_index_hits = 0
+        self.calendar_index_misses = 0
     
     async def add_birthday(self, user_id: int, birthday: str) -> bool:
         """Add a birthday to the database"""
         try:
             logger.info(f"🎂 [database.py] Adding birthday for user_id: {user_id}, birthday: {birthday}")
             result = await self.db.register_birthday(str(user_id), birthday)
+            self.invalidate_calendar_index()
             if result:
                 logger.info(f"✅ [database.py] Birthday added successfully for user_id: {user_id}")
             else:
@@ -29,6 +43,83 @@ class BirthdayDatabase:
             logger.error(f"💥 [database.py] Error adding birthday: {e}")
             return False
     
+    async def bulk_add_birthdays(self, birthdays: Dict[int, str]) -> int:
+        """Add or update many birthdays at once, returns the number written"""
+        try:
+            rows = [{'user_id': str(user_id), 'birthday': birthday} for user_id, birthday in birthdays.items()]
+            written = await self.db.bulk_upsert_birthdays(rows)
+            self.invalidate_calendar_index()
+            logger.info(f"🎂 [database.py] Bulk upserted {written}/{len(rows)} birthdays")
+            return written
+        except Exception as e:
+            logger.error(f"💥 [database.py] Error bulk adding birthdays: {e}")
+            return 0
+    
+    async def set_birthday(self, user_id: int, birthday: str) -> bool:
+        """
+        Save a birthday to the birthdays table and mirror it onto the user's profile
+        
+        The birthdays table is the source of truth; the profile copy is only
+        kept in sync so profile reads stay consistent.
+        
+        Args:
+            user_id: Discord user ID
+            birthday: Birthday string in MM-DD format
+        
+        Returns:
+            bool: True if the birthdays table write succeeded
+        """
+        success, _ = await asyncio.gather(
+            self.add_birthday(user_id, birthday),
+            self.db.update_user_profile(str(user_id), {'birthday': birthday})
+        )
+        return success
+    
+    async def get_birthdays_for(self, user_ids: Iterable[int],
+                                profiles: Optional[List[Dict[str, Any]]] = None) -> Dict[int, str]:
+        """
+        Get normalised MM-DD birthdays for many users in bulk
+        
+        Reads the birthdays table and falls back to user_profiles.birthday for
+        users who only have a profile value.
+        
+        Args:
+            user_ids: Discord user IDs to look up
+            profiles: Profile rows the caller already loaded, saves re-reading user_profiles
+        
+        Returns:
+            Dict mapping user ID to MM-DD birthday, users without one are omitted
+        """
+        wanted = {int(user_id) for user_id in user_ids}
+        if not wanted:
+            return {}
+        
+        try:
+            id_strings = [str(user_id) for user_id in wanted]
+            if len(wanted) > self.BULK_FULL_SCAN_THRESHOLD:
+                birthday_rows = self.db.get_all_birthdays()
+            else:
+                birthday_rows = self.db.get_birthdays_for_users(id_strings)
+            
+            if profiles is None:
+                birthday_rows, profiles = await asyncio.gather(
+                    birthday_rows, self.db.get_profile_birthdays_for_users(id_strings)
+                )
+            else:
+                birthday_rows = await birthday_rows
+        except Exception as e:
+            logger.error(f"Error getting birthdays in bulk: {e}")
+            return {}
+        
+        result: Dict[int, str] = {}
+        # Profiles first so the birthdays table overwrites them
+        for row in list(profiles) + list(birthday_rows):
+            user_id = row.get('user_id')
+            parsed = DateParser.parse_mmdd(row.get('birthday'))
+            if user_id and parsed and int(user_id) in wanted:
+                result[int(user_id)] = f"{parsed[0]:02d}-{parsed[1]:02d}"
+        return result
+    
     async def get_birthday(self, user_id: int) -> Optional[str]:
         """Get a user's birthday"""
         try:
@@ -56,7 +147,12 @@ class BirthdayDatabase:
     async def remove_birthday(self, user_id: int) -> bool:
         """Remove a birthday from the database"""
         try:
-            return await self.db.remove_birthday(str(user_id))
+            result, _ = await asyncio.gather(
+                self.db.remove_birthday(str(user_id)),
+                self.db.update_user_profile(str(user_id), {'birthday': None})
+            )
+            self.invalidate_calendar_index()
+            return result
         except Exception as e:
             logger.error(f"Error removing birthday: {e}")
             return False
@@ -69,6 +165,34 @@ class BirthdayDatabase:
             logger.error(f"Error getting today's birthdays: {e}")
             return []
     
+    async def get_calendar_index(self) -> Dict[str, Set[int]]:
+        """
+        Get an MM-DD -> user IDs index of every registered birthday
+        
+        Built from a single full read and reused until it expires or a
+        birthday is added or removed.
+        """
+        if self._calendar_index is not None and time.monotonic() - self._calendar_index_built_at < self.CALENDAR_INDEX_TTL:
+            self.calendar_index_hits += 1
+            return self._calendar_index
+        
+        self.calendar_index_misses += 1
+        index: Dict[str, Set[int]] = {}
+        for record in await self.get_all_birthdays():
+            parsed = DateParser.parse_mmdd(record['birthday'])
+            if parsed:
+                index.setdefault(f"{parsed[0]:02d}-{parsed[1]:02d}", set()).add(record['user_id'])
+        
+        # An empty result may be a failed read, so only cache a populated index
+        if index:
+            self._calendar_index = index
+            self._calendar_index_built_at = time.monotonic()
+        return index
+    
+    def invalidate_calendar_index(self):
+        """Force the calendar index to be rebuilt on next use"""
+        self._calendar_index = None
+    
     async def birthday_exists(self, user_id: int) -> bool:
         """Check if a birthday exists for a user"""
         birthday = await self.get_birthday(user_id)
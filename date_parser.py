@@ -3,16 +3,55 @@ Date parsing utilities for Robo Nexus Birthday Bot
 Handles flexible date format parsing and validation
 """
 import re
-from datetime import date, datetime
-from typing import Optional, List
+import time
+from datetime import date
+from functools import lru_cache
+from typing import Optional, List, Iterable, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Single precompiled pattern covering every supported format:
+#   MM-DD, MM/DD, MM-DD-YYYY, MM/DD/YYYY (the separator must not change mid-date)
+_BIRTHDAY_RE = re.compile(r'(\d{1,2})([-/])(\d{1,2})(?:\2(\d{4}))?')
+
+# Stored values may also be ISO dates (YYYY-MM-DD) written by older code paths
+_ISO_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+
+# Index 0 is unused so months can be looked up directly
+_DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_MONTH_NAMES = (
+    "", "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
+
+
+def _is_leap(year: int) -> bool:
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+@lru_cache(maxsize=4096)
+def _parse_mmdd_cached(value: str) -> Optional[Tuple[int, int]]:
+    """Year-independent (month, day) parse of a stored birthday string"""
+    value = value.strip()
+    match = _BIRTHDAY_RE.fullmatch(value)
+    if match:
+        month, day = int(match.group(1)), int(match.group(3))
+    else:
+        match = _ISO_RE.fullmatch(value)
+        if not match:
+            return None
+        month, day = int(match.group(2)), int(match.group(3))
+    
+    if not (1 <= month <= 12) or not (1 <= day <= _DAYS_IN_MONTH[month]):
+        return None
+    return month, day
+
+
 class DateParser:
     """Handles parsing of various date formats for birthday registration"""
     
-    # Supported date formats
+    # Supported date formats (kept for reference, parsing uses _BIRTHDAY_RE)
     FORMATS = [
         r'^(\d{1,2})-(\d{1,2})$',           # MM-DD or M-D
         r'^(\d{1,2})/(\d{1,2})$',           # MM/DD or M/D
@@ -20,6 +59,35 @@ class DateParser:
         r'^(\d{1,2})/(\d{1,2})/(\d{4})$',   # MM/DD/YYYY or M/D/YYYY
     ]
     
+    # Current year cache, refreshed when the next new year passes
+    _cached_year = 0
+    _cached_year_expires = 0.0
+    
+    @classmethod
+    def _current_year(cls) -> int:
+        """Get the current year without calling datetime.now() on every parse"""
+        now = time.time()
+        if now >= cls._cached_year_expires:
+            year = date.today().year
+            cls._cached_year = year
+            cls._cached_year_expires = time.mktime((year + 1, 1, 1, 0, 0, 0, 0, 0, -1))
+        return cls._cached_year
+    
+    @classmethod
+    def _build_date(cls, match, current_year: int) -> Optional[date]:
+        """Turn a _BIRTHDAY_RE match into a validated date, or None"""
+        month_text, _, day_text, year_text = match.groups()
+        month = int(month_text)
+        day = int(day_text)
+        year = int(year_text) if year_text else current_year  # Use current year
+        
+        if not (1 <= month <= 12) or not (1900 <= year <= current_year + 1):
+            return None
+        max_day = 28 if month == 2 and not _is_leap(year) else _DAYS_IN_MONTH[month]
+        if not (1 <= day <= max_day):
+            return None
+        return date(year, month, day)
+    
     @classmethod
     def parse_birthday(cls, date_string: str) -> Optional[date]:
         """
@@ -27,7 +95,7 @@ class DateParser:
         
         Args:
             date_string: String representation of birthday
-            
+        
         Returns:
             date object if parsing successful, None otherwise
         """
@@ -37,36 +105,94 @@ class DateParser:
         # Clean the input
         date_string = date_string.strip()
         
-        try:
-            # Try each format
-            for format_pattern in cls.FORMATS:
-                match = re.match(format_pattern, date_string)
-                if match:
-                    groups = match.groups()
-                    
-                    if len(groups) == 2:
-                        # MM-DD or MM/DD format
-                        month, day = map(int, groups)
-                        year = datetime.now().year  # Use current year
-                    else:
-                        # MM-DD-YYYY or MM/DD/YYYY format
-                        month, day, year = map(int, groups)
-                    
-                    # Validate the date
-                    if cls._is_valid_date(month, day, year):
-                        return date(year, month, day)
-                    else:
-                        logger.warning(f"Invalid date values: {month}/{day}/{year}")
-                        return None
-            
-            # If no format matched
+        match = _BIRTHDAY_RE.fullmatch(date_string)
+        if not match:
             logger.warning(f"No matching format for date string: {date_string}")
             return None
-            
-        except ValueError as e:
-            logger.warning(f"Error parsing date '{date_string}': {e}")
+        
+        parsed = cls._build_date(match, cls._current_year())
+        if parsed is None:
+            logger.warning(f"Invalid date values: {date_string}")
+        return parsed
+    
+    @classmethod
+    def parse_many(cls, date_strings: Iterable[str]) -> List[Optional[date]]:
+        """
+        Parse many birthday strings in one pass
+        
+        Same rules as parse_birthday, but the current year is resolved once,
+        repeated strings are only parsed once, and invalid entries are
+        returned as None without logging each one.
+        
+        Args:
+            date_strings: Iterable of birthday strings
+        
+        Returns:
+            List of date objects (or None) in input order
+        """
+        current_year = cls._current_year()
+        fullmatch = _BIRTHDAY_RE.fullmatch
+        build = cls._build_date
+        seen = {}
+        results = []
+        append = results.append
+        
+        for value in date_strings:
+            if not value or not isinstance(value, str):
+                append(None)
+                continue
+            parsed = seen.get(value, seen)
+            if parsed is seen:
+                match = fullmatch(value.strip())
+                parsed = seen[value] = build(match, current_year) if match else None
+            append(parsed)
+        
+        return results
+    
+    @classmethod
+    def parse_mmdd(cls, value: str) -> Optional[Tuple[int, int]]:
+        """
+        Parse a stored birthday into (month, day), memoised
+        
+        Stored birthdays are year-less, so the result does not depend on the
+        current date and can be cached safely. February 29 is accepted.
+        
+        Args:
+            value: Stored birthday (MM-DD, MM/DD, with optional year, or YYYY-MM-DD)
+        
+        Returns:
+            (month, day) tuple if valid, None otherwise
+        """
+        if not value or not isinstance(value, str):
             return None
+        return _parse_mmdd_cached(value)
     
+    @classmethod
+    def days_until(cls, month: int, day: int, today: Optional[date] = None) -> int:
+        """
+        Days from today until the next occurrence of a month/day birthday
+
+        February 29 birthdays fall on February 28 in non-leap years.
+
+        Args:
+            month: Birthday month
+            day: Birthday day
+            today: Reference date (defaults to date.today())
+
+        Returns:
+            Number of days, 0 if the birthday is today
+        """
+        today = today or date.today()
+        year = today.year
+
+        for candidate_year in (year, year + 1):
+            candidate_day = 28 if month == 2 and day == 29 and not _is_leap(candidate_year) else day
+            next_birthday = date(candidate_year, month, candidate_day)
+            if next_birthday >= today:
+                return (next_birthday - today).days
+
+        return 0
+
     @classmethod
     def _is_valid_date(cls, month: int, day: int, year: int) -> bool:
         """
@@ -76,7 +202,7 @@ class DateParser:
             month: Month (1-12)
             day: Day (1-31)
             year: Year
-            
+        
         Returns:
             bool: True if valid, False otherwise
         """
@@ -89,17 +215,22 @@ class DateParser:
                 return False
             
             # Check if year is reasonable (not too far in past/future)
-            current_year = datetime.now().year
+            current_year = cls._current_year()
             if not (1900 <= year <= current_year + 1):
                 return False
             
             # Try to create the date (this will catch invalid combinations)
             date(year, month, day)
             return True
-            
+        
         except ValueError:
             return False
     
+    @classmethod
+    def format_month_day(cls, month: int, day: int) -> str:
+        """Format a month/day pair for display (e.g., "March 15")"""
+        return f"{_MONTH_NAMES[month]} {day:02d}"
+    
     @classmethod
     def format_birthday(cls, birthday) -> str:
         """
@@ -107,20 +238,19 @@ class DateParser:
         
         Args:
             birthday: Date object or string in MM-DD format
-            
+        
         Returns:
             Formatted string (e.g., "March 15")
         """
         # If it's already a date object, format it directly
         if isinstance(birthday, date):
-            return birthday.strftime("%B %d")
+            return cls.format_month_day(birthday.month, birthday.day)
         
-        # If it's a string (from database), parse it first
+        # If it's a string (from database), use the memoised stored-value parser
         if isinstance(birthday, str):
-            # Parse MM-DD format string
-            parsed_date = cls.parse_birthday(birthday)
-            if parsed_date:
-                return parsed_date.strftime("%B %d")
+            parsed = cls.parse_mmdd(birthday)
+            if parsed:
+                return cls.format_month_day(*parsed)
             else:
                 # Fallback: return the string as-is if parsing fails
                 return birthday
@@ -138,7 +268,7 @@ class DateParser:
         """
         return [
             "MM-DD (e.g., 03-15 for March 15)",
-            "MM/DD (e.g., 03/15 for March 15)", 
+            "MM/DD (e.g., 03/15 for March 15)",
             "MM-DD-YYYY (e.g., 03-15-1995)",
             "MM/DD/YYYY (e.g., 03/15/1995)"
         ]
@@ -152,4 +282,4 @@ class DateParser:
             Help text string
         """
         formats = cls.get_supported_formats()
-        return "Supported date formats:\n" + "\n".join(f"• {fmt}" for fmt in formats)
\ No newline at end of file
+        return "Supported date formats:\n" + "\n".join(f"• {fmt}" for fmt in formats)
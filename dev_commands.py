@@ -5,12 +5,15 @@ Fully automated deployment management and monitoring from Discord
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
+import io
 import logging
 import subprocess
 import os
 import json
 from datetime import datetime, timedelta
 from typing import Optional
+from metrics_registry import timed_task
+from sampling_profiler import SamplingProfiler
 
 logger = logging.getLogger(__name__)
 
@@ -112,6 +115,7 @@ class DevCommands(commands.Cog):
         return None
     
     @tasks.loop(hours=6)  # Check every 6 hours
+    @timed_task("auto_monitor")
     async def auto_monitor(self):
         """Automatically monitor and send republish notifications"""
         try:
@@ -449,6 +453,67 @@ class DevCommands(commands.Cog):
         # Exit - Replit auto-restarts
         import sys
         sys.exit(0)
+    
+    @app_commands.command(name="profile", description="[DEV] Profile the live bot for N seconds")
+    @app_commands.describe(seconds="How long to sample (1-60)")
+    async def profile(self, interaction: discord.Interaction, seconds: int = 10):
+        """Sample thread and asyncio task stacks and attach them as a collapsed-stack file"""
+        
+        if not self.is_dev(interaction.user.id):
+            await interaction.response.send_message(
+                "❌ This command is only available to developers.",
+                ephemeral=True
+            )
+            return
+        
+        if seconds < 1 or seconds > 60:
+            await interaction.response.send_message(
+                "❌ Seconds must be between 1 and 60.",
+                ephemeral=True
+            )
+            return
+        
+        if SamplingProfiler.is_running():
+            await interaction.response.send_message(
+                "⏳ A profile is already running, try again when it finishes.",
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        try:
+            result = await SamplingProfiler().run(seconds)
+            
+            embed = discord.Embed(
+                title="🔬 Profile Complete",
+                description=f"Sampled the bot for **{seconds}s**",
+                color=discord.Color.blue()
+            )
+            embed.add_field(name="🧵 Thread Samples", value=str(result.thread_samples), inline=True)
+            embed.add_field(name="⚡ Task Samples", value=str(result.task_samples), inline=True)
+            embed.add_field(name="🔁 Event Loop Busy", value=f"{result.loop_busy_percent:.1f}%", inline=True)
+            
+            top_frames = result.top_loop_frames(5)
+            if top_frames:
+                busy = max(result.loop_busy_samples, 1)
+                lines = [f"`{frame[:60]}` {count * 100 / busy:.0f}%" for frame, count in top_frames]
+                embed.add_field(name="🔥 Hottest Loop Frames", value="\n".join(lines), inline=False)
+            
+            embed.set_footer(text="Open the attachment with speedscope.app or flamegraph.pl")
+            
+            filename = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.collapsed.txt"
+            file = discord.File(io.BytesIO(result.collapsed().encode('utf-8')), filename=filename)
+            
+            await interaction.followup.send(embed=embed, file=file, ephemeral=True)
+            logger.info(f"Profile of {seconds}s run by {interaction.user}")
+        
+        except Exception as e:
+            logger.error(f"Error running profile: {e}")
+            await interaction.followup.send(
+                f"❌ Profile failed: {str(e)[:200]}",
+                ephemeral=True
+            )
 
 
 async def setup(bot):
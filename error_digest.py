@@ -0,0 +1,165 @@
+"""
+Error Digest for Robo Nexus Bot
+Fingerprints errors by type and origin and batches repeats into periodic digests
+"""
+import hashlib
+import os
+import re
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+# IDs, counts and timings in contexts would give every occurrence its own fingerprint
+_NUMBERS = re.compile(r'\d+')
+
+
+def unwrap_error(error: BaseException) -> BaseException:
+    """
+    The exception that actually went wrong
+    
+    Command errors arrive wrapped (commands.CommandInvokeError,
+    app_commands.CommandInvokeError) with only library frames in their
+    traceback; the real exception is in .original or __cause__.
+    """
+    seen = set()
+    while id(error) not in seen:
+        seen.add(id(error))
+        inner = getattr(error, 'original', None) or error.__cause__
+        if not isinstance(inner, BaseException):
+            break
+        error = inner
+    return error
+
+
+def error_origin(error: Exception, context: str = "") -> str:
+    """
+    Where an error came from, stable across occurrences
+    
+    The innermost traceback frame in the bot's own code, as
+    'file.py:function' (no line number, so unrelated edits to the file do
+    not split a group). Errors without a traceback fall back to the
+    context with numbers masked.
+    """
+    frames = traceback.extract_tb(error.__traceback__) if error.__traceback__ else []
+    own = [f for f in frames if os.path.abspath(f.filename).startswith(_PROJECT_DIR)]
+    if own:
+        return f"{os.path.basename(own[-1].filename)}:{own[-1].name}"
+    if frames:
+        return f"{os.path.basename(frames[-1].filename)}:{frames[-1].name}"
+    return _NUMBERS.sub('#', context)[:100] or "unknown"
+
+
+def fingerprint_error(error: Exception, context: str = "") -> Tuple[str, str]:
+    """Get (fingerprint, origin) for an error, after unwrapping it"""
+    error = unwrap_error(error)
+    origin = error_origin(error, context)
+    digest = hashlib.sha1(f"{type(error).__name__}|{origin}".encode('utf-8')).hexdigest()[:10]
+    return digest, origin
+
+
+class TokenBucket:
+    """Allows bursts of `capacity` events, refilling at `rate` tokens per second"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+    
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+@dataclass
+class ErrorGroup:
+    """Every occurrence of one fingerprint"""
+    fingerprint: str
+    error_type: str
+    origin: str
+    message: str
+    context: str
+    first_seen: float
+    last_seen: float
+    count: int = 0
+    # Occurrences not yet included in an immediate report or a digest
+    pending: int = 0
+    last_reported: float = 0.0
+
+
+class ErrorDigest:
+    """
+    Groups errors by fingerprint for reporting
+    
+    The first occurrence of a fingerprint (and the first again after
+    REPEAT_INTERVAL) may be reported straight away if the token bucket
+    allows it; everything else waits for the next digest.
+    """
+    
+    # An already-reported fingerprint is only reported immediately again after this long
+    REPEAT_INTERVAL = 3600
+    # Oldest groups are forgotten past this many fingerprints
+    MAX_GROUPS = 200
+    
+    def __init__(self, rate: float = 1 / 60, burst: int = 5):
+        self.groups: Dict[str, ErrorGroup] = {}
+        self.bucket = TokenBucket(rate, burst)
+    
+    def record(self, error: Exception, context: str = "") -> Tuple[ErrorGroup, bool]:
+        """
+        Add an occurrence
+        
+        Returns:
+            Tuple of the error's group and whether it should be reported now
+        """
+        error = unwrap_error(error)
+        fingerprint, origin = fingerprint_error(error, context)
+        now = time.time()
+        
+        group = self.groups.get(fingerprint)
+        if group is None:
+            if len(self.groups) >= self.MAX_GROUPS:
+                oldest = min(self.groups.values(), key=lambda g: g.last_seen)
+                del self.groups[oldest.fingerprint]
+            group = self.groups[fingerprint] = ErrorGroup(
+                fingerprint=fingerprint,
+                error_type=type(error).__name__,
+                origin=origin,
+                message=str(error)[:500],
+                context=context[:100],
+                first_seen=now,
+                last_seen=now
+            )
+        
+        group.count += 1
+        group.pending += 1
+        group.last_seen = now
+        group.message = str(error)[:500]
+        group.context = context[:100]
+        
+        report_now = now - group.last_reported >= self.REPEAT_INTERVAL and self.bucket.try_acquire()
+        if report_now:
+            group.pending = 0
+            group.last_reported = now
+        return group, report_now
+    
+    def drain(self) -> List[Tuple[ErrorGroup, int]]:
+        """Take the unreported occurrences, most frequent first, as (group, count) pairs"""
+        now = time.time()
+        due = sorted(((g, g.pending) for g in self.groups.values() if g.pending), key=lambda e: e[1], reverse=True)
+        for group, _ in due:
+            group.pending = 0
+            group.last_reported = now
+        return due
+    
+    def restore(self, entries: List[Tuple[ErrorGroup, int]]):
+        """Put drained occurrences back after a digest failed to send"""
+        for group, count in entries:
+            group.pending += count
@@ -12,6 +12,7 @@ import os
 import asyncio
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List
+from metrics_registry import timed_task
 
 logger = logging.getLogger(__name__)
 
@@ -131,6 +132,7 @@ class GitHubIntegration(commands.Cog):
         return None
     
     @tasks.loop(minutes=5)  # Check for new commits every 5 minutes
+    @timed_task("check_commits")
     async def check_commits(self):
         """Check for new commits across all repositories and send notifications"""
         try:
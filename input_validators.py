@@ -0,0 +1,201 @@
+"""
+Input validators for Robo Nexus Bot
+Precompiled matchers for the verification fields (email, phone, social links, class)
+"""
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Answers that mean "I don't want to give this"
+SKIP_KEYWORDS = frozenset(('none', 'no', 'skip', 'n/a', 'na'))
+
+CLASS_NUMBERS = frozenset(str(n) for n in range(6, 13))
+
+_GMAIL_RE = re.compile(r'[a-z0-9._%+-]+@gmail\.com')
+
+# Characters dropped from phone numbers before the digit check (whitespace is removed separately)
+_PHONE_PUNCTUATION = str.maketrans('', '', '-()+')
+
+_LINK_SPLIT_RE = re.compile(r'[,\n]')
+_LINK_LABEL_RE = re.compile(r'^(github|linkedin|youtube|spotify|website|portfolio):\s*', re.IGNORECASE)
+# One pass classifies a (lowercased) entry. Each branch is a lookahead from the start of
+# the entry, so branch order is priority order: a line mentioning two platforms goes to
+# the first one, and anything else that looks like a site (portfolio/website keywords or
+# a common TLD/host) is a website. ".co" also covers ".com" and ".herokuapp.com", ".io"
+# covers ".github.io", ".dev" covers ".pages.dev".
+_LINK_KIND_RE = re.compile(
+    r'(?=.*github\.com)(?P<github>)'
+    r'|(?=.*linkedin\.com)(?P<linkedin>)'
+    r'|(?=.*youtu(?:be\.com|\.be))(?P<youtube>)'
+    r'|(?=.*spotify\.com)(?P<spotify>)'
+    r'|(?=.*(?:portfolio|site|\.dev|\.co|\.org|\.net|\.io|\.me|\.netlify\.app|\.vercel\.app|\.firebase\.app))(?P<website>)',
+    re.DOTALL
+)
+
+_ORDINAL_RE = re.compile(r'(\d+)(?:st|nd|rd|th)')
+_NUMBER_RE = re.compile(r'\b(\d+)\b')
+# Word forms in priority order; an input containing several resolves to the earliest class
+_CLASS_WORDS = (
+    ("sixth", "6"), ("six", "6"),
+    ("seventh", "7"), ("seven", "7"),
+    ("eighth", "8"), ("eight", "8"),
+    ("ninth", "9"), ("nine", "9"),
+    ("tenth", "10"), ("ten", "10"),
+    ("eleventh", "11"), ("eleven", "11"),
+    ("twelfth", "12"), ("twelve", "12"),
+)
+# Lookahead so overlapping words are all found in one scan
+_CLASS_WORD_RE = re.compile('(?=(' + '|'.join(word for word, _ in _CLASS_WORDS) + '))')
+_CLASS_WORD_PRIORITY = {word: (index, number) for index, (word, number) in enumerate(_CLASS_WORDS)}
+
+
+def normalize(value: Optional[str]) -> str:
+    """Shared normalisation: stripped and lowercased, '' for missing values"""
+    return value.strip().lower() if value else ''
+
+
+def is_skip(value: Optional[str]) -> bool:
+    return normalize(value) in SKIP_KEYWORDS
+
+
+def validate_email(email: str) -> bool:
+    """Gmail address, or a skip keyword"""
+    if not email:
+        return False
+    email = normalize(email)
+    if email in SKIP_KEYWORDS:
+        return True
+    return _GMAIL_RE.fullmatch(email) is not None
+
+
+def validate_phone(phone: str) -> Optional[str]:
+    """
+    Validate and format a phone number
+    
+    Returns:
+        E.164-style number (10-digit numbers get +91), or None if invalid or skipped
+    """
+    if not phone:
+        return None
+    phone = phone.strip()
+    if phone.lower() in SKIP_KEYWORDS:
+        return None
+    
+    cleaned = ''.join(phone.split()).translate(_PHONE_PUNCTUATION)
+    if not cleaned.isdigit():
+        return None
+    
+    # Indian phone numbers: 10 digits or with country code (91)
+    if len(cleaned) == 10:
+        return f"+91{cleaned}"
+    if len(cleaned) >= 10:
+        # 91XXXXXXXXXX, international or other format
+        return f"+{cleaned}"
+    return None
+
+
+def validate_social_links(links_text: str) -> Dict[str, str]:
+    """
+    Extract social media links, one per comma- or line-separated entry
+    
+    Returns:
+        Dict with platform names as keys and URLs as values; extra
+        websites are stored as website2, website3, ...
+    """
+    links = {}
+    if not links_text or normalize(links_text) in SKIP_KEYWORDS:
+        return links
+    
+    for line in _LINK_SPLIT_RE.split(links_text):
+        line = line.strip()
+        if not line:
+            continue
+        
+        # Remove labels like "GitHub:", "LinkedIn:", "Website:"
+        label = _LINK_LABEL_RE.match(line)
+        if label:
+            line = line[label.end():]
+        is_url = line.startswith('http')
+        url = line if is_url else f"https://{line}"
+        
+        match = _LINK_KIND_RE.match(line.lower())
+        kind = match.lastgroup if match else 'website' if is_url else None
+        if kind == 'website':
+            website_key = 'website'
+            counter = 1
+            while website_key in links:
+                counter += 1
+                website_key = f'website{counter}'
+            links[website_key] = url
+        elif kind:
+            links[kind] = url
+    
+    return links
+
+
+def extract_class_from_text(text: str) -> Optional[str]:
+    """
+    Extract a class number (6-12) from user input
+    Supports: "6", "class 6", "grade 6", "6th", "sixth", etc.
+    """
+    if not text:
+        return None
+    text = normalize(text)
+    
+    if text in CLASS_NUMBERS:
+        return text
+    
+    match = _ORDINAL_RE.search(text)
+    if match and match.group(1) in CLASS_NUMBERS:
+        return match.group(1)
+    
+    words = [_CLASS_WORD_PRIORITY[m.group(1)] for m in _CLASS_WORD_RE.finditer(text)]
+    if words:
+        return min(words)[1]
+    
+    match = _NUMBER_RE.search(text)
+    if match and match.group(1) in CLASS_NUMBERS:
+        return match.group(1)
+    
+    return None
+
+
+VALIDATORS: Dict[str, Callable[[str], Any]] = {
+    'email': validate_email,
+    'phone': validate_phone,
+    'social_links': validate_social_links,
+    'class': extract_class_from_text,
+}
+
+# Only class answers repeat enough to memoize; emails, phones and links are nearly
+# always unique, where the memo is pure dict overhead
+_MEMOIZED = frozenset(('class',))
+
+
+def validate_many(kind: str, values: Iterable[str]) -> List[Any]:
+    """
+    Run one validator over many inputs
+    
+    Class answers ("10", "class 9", ...) repeat across a whole upload, so each
+    distinct one is only parsed once.
+    
+    Args:
+        kind: 'email', 'phone', 'social_links' or 'class'
+        values: Raw inputs
+    
+    Returns:
+        Validator results in input order
+    """
+    validator = VALIDATORS[kind]
+    if kind not in _MEMOIZED:
+        return [validator(value) for value in values]
+    seen = {}
+    results = []
+    append = results.append
+    
+    for value in values:
+        result = seen.get(value, seen)
+        if result is seen:
+            result = seen[value] = validator(value)
+        append(result)
+    
+    return results
@@ -2,7 +2,7 @@
 Keep Alive Server for Replit
 Runs a simple Flask web server to keep the bot alive on Replit's free tier
 """
-from flask import Flask
+from flask import Flask, Response
 from threading import Thread
 import logging
 
@@ -62,6 +62,12 @@ def health():
     """Simple health check for monitoring services"""
     return {"status": "healthy", "bot": "robo-nexus-birthday-bot", "message": "Bot is running"}
 
+@app.route('/metrics')
+def metrics():
+    """OpenMetrics exposition for Prometheus-compatible scrapers"""
+    from metrics_registry import CONTENT_TYPE, get_metrics_registry
+    return Response(get_metrics_registry().render_threadsafe(), content_type=CONTENT_TYPE)
+
 @app.route('/ping')
 def ping():
     """Simple ping endpoint"""
@@ -0,0 +1,182 @@
+"""
+Latency Histograms for Robo Nexus Bot
+Mergeable log-bucket histograms with rolling windows for per-command timings
+"""
+import math
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+class LogHistogram:
+    """
+    Histogram with logarithmically sized buckets
+    
+    Each bucket is GAMMA times wider than the previous one, so any
+    percentile is reported within about 2.5% of the true value while
+    memory stays bounded (a few hundred buckets cover 1ms to 10 minutes).
+    Two histograms are merged by adding their bucket counts.
+    """
+    
+    GAMMA = 1.05
+    _LOG_GAMMA = math.log(GAMMA)
+    
+    __slots__ = ("counts", "count", "total", "max")
+    
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    @classmethod
+    def bucket_for(cls, value: float) -> int:
+        """Bucket index for a value, everything at or below 1 shares bucket 0"""
+        if value <= 1.0:
+            return 0
+        return math.ceil(math.log(value) / cls._LOG_GAMMA)
+    
+    @classmethod
+    def bucket_upper_bound(cls, index: int) -> float:
+        return cls.GAMMA ** index
+    
+    def record(self, value: float):
+        index = self.bucket_for(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+    
+    def merge(self, other: "LogHistogram") -> "LogHistogram":
+        """Add another histogram's samples into this one"""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+    
+    @classmethod
+    def merged(cls, histograms: Iterable["LogHistogram"]) -> "LogHistogram":
+        result = cls()
+        for histogram in histograms:
+            result.merge(histogram)
+        return result
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    def percentile(self, q: float) -> float:
+        """
+        Estimate the q-th percentile (0-100)
+        
+        Returns the middle of the bucket holding the target rank, capped at
+        the largest value seen.
+        """
+        if not self.count:
+            return 0.0
+        
+        target = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                if index == 0:
+                    return min(1.0, self.max)
+                midpoint = 2 * self.bucket_upper_bound(index) / (1 + self.GAMMA)
+                return min(midpoint, self.max)
+        return self.max
+
+
+class RollingHistogram:
+    """
+    Since-boot histogram plus per-slot histograms for recent windows
+    
+    Samples go into the slot for the current minute (by default) and into
+    the since-boot total. A window is answered by merging the slots it
+    covers; slots older than the longest window are dropped.
+    """
+    
+    def __init__(self, slot_seconds: int = 60, slots: int = 60):
+        self.slot_seconds = slot_seconds
+        self.slots = slots
+        self.total = LogHistogram()
+        self._slots: Dict[int, LogHistogram] = {}
+    
+    def _slot_index(self, now: Optional[float]) -> int:
+        return int((time.monotonic() if now is None else now) // self.slot_seconds)
+    
+    def record(self, value: float, now: Optional[float] = None):
+        index = self._slot_index(now)
+        histogram = self._slots.get(index)
+        if histogram is None:
+            histogram = self._slots[index] = LogHistogram()
+            # Drop slots that have fallen out of the longest window
+            oldest = index - self.slots + 1
+            for stale in [i for i in self._slots if i < oldest]:
+                del self._slots[stale]
+        
+        histogram.record(value)
+        self.total.record(value)
+    
+    def window(self, seconds: Optional[float] = None, now: Optional[float] = None) -> LogHistogram:
+        """
+        Histogram of samples from the last `seconds` (slot-aligned)
+        
+        Args:
+            seconds: Window length, None for everything since boot
+        """
+        if seconds is None:
+            return self.total
+        
+        current = self._slot_index(now)
+        oldest = current - max(1, math.ceil(seconds / self.slot_seconds)) + 1
+        return LogHistogram.merged(h for i, h in self._slots.items() if oldest <= i <= current)
+
+
+class LatencyTracker:
+    """Rolling latency histograms keyed by command name"""
+    
+    def __init__(self, slot_seconds: int = 60, slots: int = 60):
+        self.slot_seconds = slot_seconds
+        self.slots = slots
+        self._commands: Dict[str, RollingHistogram] = {}
+    
+    def record(self, command_name: str, elapsed_ms: float, now: Optional[float] = None):
+        histogram = self._commands.get(command_name)
+        if histogram is None:
+            histogram = self._commands[command_name] = RollingHistogram(self.slot_seconds, self.slots)
+        histogram.record(elapsed_ms, now)
+    
+    def commands(self) -> List[str]:
+        return sorted(self._commands)
+    
+    def window(self, seconds: Optional[float] = None) -> Dict[str, LogHistogram]:
+        """Per-command histograms for a window, commands without samples omitted"""
+        result = {}
+        for name, histogram in self._commands.items():
+            windowed = histogram.window(seconds)
+            if windowed.count:
+                result[name] = windowed
+        return result
+    
+    def overall(self, seconds: Optional[float] = None) -> LogHistogram:
+        """All commands merged into one histogram"""
+        return LogHistogram.merged(self.window(seconds).values())
+
+
+# Global instances, one tracker per kind of timing
+#   command        - total wall time of app commands
+#   first_response - time until an interaction was deferred or answered
+#   defer          - time until an interaction was deferred, for those whose first response was a defer
+#   autocomplete   - autocomplete callbacks
+#   component      - button/select/modal interactions (time to first response)
+_latency_trackers: Dict[str, LatencyTracker] = {}
+
+def get_latency_tracker(kind: str = "command") -> LatencyTracker:
+    """Get the global latency tracker for a kind of timing"""
+    tracker = _latency_trackers.get(kind)
+    if tracker is None:
+        tracker = _latency_trackers[kind] = LatencyTracker()
+    return tracker
@@ -0,0 +1,147 @@
+"""
+Event Loop Monitor for Robo Nexus Bot
+Samples event loop lag and captures the stack of callbacks that block the loop
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import List, Optional, Set
+
+from metrics_registry import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class EventLoopStall(Exception):
+    """Recorded in analytics when a callback blocks the event loop"""
+
+
+class LoopMonitor:
+    """
+    Loop-lag sampler plus a watchdog thread
+    
+    A heartbeat coroutine wakes every `interval` seconds and records how
+    late it was. A daemon thread watches the heartbeat; when it goes quiet
+    for longer than the stall threshold, the thread grabs the event loop
+    thread's current stack with sys._current_frames(), so the report shows
+    the exact call that is blocking. Once the loop recovers, the stall is
+    logged, tracked in analytics and sent to the dev channel.
+    """
+    
+    INTERVAL = 0.25
+    STACK_DEPTH = 10
+    
+    def __init__(self, bot, stall_threshold: float = 0.5):
+        self.bot = bot
+        self.stall_threshold = stall_threshold
+        
+        registry = get_metrics_registry()
+        self.lag_gauge = registry.gauge(
+            "robonexus_event_loop_lag_seconds", "How late the last event loop wake-up was"
+        )
+        self.lag_histogram = registry.histogram(
+            "robonexus_event_loop_lag_distribution_seconds", "Distribution of event loop wake-up lag"
+        )
+        self.stall_counter = registry.counter(
+            "robonexus_event_loop_stalls", "Callbacks that blocked the event loop past the stall threshold"
+        )
+        
+        self.max_lag = 0.0
+        self.stall_count = 0
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._captured_stack: Optional[List[str]] = None
+        self._stack_lock = threading.Lock()
+        self._stop = threading.Event()
+        # Stall reports still being sent; the loop only keeps weak references to tasks
+        self._reports: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the heartbeat on the running loop and the watchdog thread"""
+        loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = loop.create_task(self._heartbeat_loop(), name="loop-monitor-heartbeat")
+        threading.Thread(target=self._watchdog, name="loop-monitor-watchdog", daemon=True).start()
+        logger.info(f"Event loop monitor started (stall threshold {self.stall_threshold * 1000:.0f}ms)")
+    
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+    
+    async def _heartbeat_loop(self):
+        interval = self.INTERVAL
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag = max(0.0, time.perf_counter() - start - interval)
+            self._heartbeat = time.monotonic()
+            
+            self.lag_gauge.set(lag)
+            self.lag_histogram.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+            
+            if lag >= self.stall_threshold:
+                with self._stack_lock:
+                    stack, self._captured_stack = self._captured_stack, None
+                self._record_stall(lag, stack)
+    
+    def _watchdog(self):
+        """Runs in its own thread; snapshots the loop thread's stack during a stall"""
+        poll = self.INTERVAL / 2
+        while not self._stop.wait(poll):
+            silent_for = time.monotonic() - self._heartbeat
+            if silent_for < self.INTERVAL + self.stall_threshold:
+                continue
+            
+            with self._stack_lock:
+                if self._captured_stack is not None:
+                    continue  # Already have the stack for this stall
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                self._captured_stack = self._format_stack(frame)
+    
+    def _format_stack(self, frame) -> List[str]:
+        """
+        Innermost frames as 'file:line in function' lines
+        
+        The innermost frame of the bot's own code is moved to the end, so it
+        is what reports name as the stall location rather than a socket read
+        deep inside a library.
+        """
+        frames = traceback.extract_stack(frame)
+        own = [f for f in frames if os.path.abspath(f.filename).startswith(_PROJECT_DIR)]
+        lines = [f"{os.path.basename(f.filename)}:{f.lineno} in {f.name}" for f in frames[-self.STACK_DEPTH:]]
+        if own and own[-1] is not frames[-1]:
+            lines.append(f"(bot code) {os.path.basename(own[-1].filename)}:{own[-1].lineno} in {own[-1].name}")
+        return lines
+    
+    def _record_stall(self, lag: float, stack: Optional[List[str]]):
+        """Log, count and report a stall (runs on the event loop thread)"""
+        self.stall_count += 1
+        self.stall_counter.inc()
+        
+        where = stack[-1] if stack else "unknown (stack not captured)"
+        stack_text = "\n".join(stack) if stack else "stack not captured"
+        logger.warning(f"Event loop blocked for {lag * 1000:.0f}ms at {where}\n{stack_text}")
+        
+        analytics_cog = self.bot.get_cog('Analytics')
+        if not analytics_cog:
+            return
+        
+        error = EventLoopStall(f"Event loop blocked for {lag * 1000:.0f}ms\n{stack_text}")
+        analytics_cog.track_error(error, f"Loop stall at {where}")
+        # The error digest rate-limits repeated stall reports
+        report = asyncio.create_task(analytics_cog.report_error_to_dev(error, f"Loop stall at {where}"))
+        self._reports.add(report)
+        report.add_done_callback(self._reports.discard)
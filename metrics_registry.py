@@ -0,0 +1,290 @@
+"""
+Metrics Registry for Robo Nexus Bot
+In-process counters, gauges and histograms exported in OpenMetrics text format
+"""
+import asyncio
+import functools
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Default histogram buckets in seconds, from fast cache hits to slow HTTP calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# A metric family ready for rendering: (name, type, help, [(suffix, labels, value), ...])
+Family = Tuple[str, str, str, List[Tuple[str, Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_families(families: Iterable[Family]) -> str:
+    """Render metric families as OpenMetrics text"""
+    lines = []
+    for name, metric_type, help_text, samples in families:
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.append(f"# HELP {name} {_escape(help_text)}")
+        for suffix, labels, value in samples:
+            label_text = ""
+            if labels:
+                label_text = "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+            lines.append(f"{name}{suffix}{label_text} {_format_value(value)}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def histogram_samples(labels: Dict[str, str], bounds: Sequence[float], cumulative: Sequence[int],
+                      count: int, total: float) -> List[Tuple[str, Dict[str, str], float]]:
+    """Samples for one labelled histogram given cumulative bucket counts"""
+    samples = [("_bucket", {**labels, "le": _format_value(bound)}, cumulative[i]) for i, bound in enumerate(bounds)]
+    samples.append(("_bucket", {**labels, "le": "+Inf"}, count))
+    samples.append(("_count", labels, count))
+    samples.append(("_sum", labels, total))
+    return samples
+
+
+class _Metric:
+    metric_type = ""
+    
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+    
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    metric_type = "counter"
+    
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def family(self) -> Family:
+        with self._lock:
+            samples = [("_total", self._labels(key), value) for key, value in self._values.items()]
+        return (self.name, self.metric_type, self.help, samples)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    metric_type = "gauge"
+    
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+    
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+    
+    def family(self) -> Family:
+        with self._lock:
+            samples = [("", self._labels(key), value) for key, value in self._values.items()]
+        return (self.name, self.metric_type, self.help, samples)
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram of observed values"""
+    metric_type = "histogram"
+    
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+    
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += 1
+            state[-1] += value
+    
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of a with-block (works around awaits too)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+    
+    def family(self) -> Family:
+        samples = []
+        with self._lock:
+            for key, state in self._values.items():
+                cumulative, running = [], 0
+                for count in state[:len(self.buckets)]:
+                    running += count
+                    cumulative.append(running)
+                samples.extend(histogram_samples(self._labels(key), self.buckets, cumulative, state[-2], state[-1]))
+        return (self.name, self.metric_type, self.help, samples)
+
+
+class MetricsRegistry:
+    """
+    Holds every metric and renders them on request
+    
+    Metrics owned by a module are registered once and updated in place.
+    Values that already live elsewhere (latency trackers, cache stats,
+    bot state) are read at scrape time by collector callbacks instead of
+    being copied into the registry.
+    """
+    
+    # How long a scrape waits for the event loop before rendering from its own thread
+    RENDER_TIMEOUT = 2.0
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_or_create(self, cls, name: str, help_text: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labelnames, **kwargs)
+            return metric
+    
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+    
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+    
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+    
+    def register_collector(self, collector: Callable[[], Iterable[Family]]):
+        """Add a callback that returns metric families at scrape time"""
+        with self._lock:
+            self._collectors.append(collector)
+    
+    def set_loop(self, loop: asyncio.AbstractEventLoop):
+        """Event loop that owns the bot state, collectors run on it when possible"""
+        self._loop = loop
+    
+    def render(self) -> str:
+        """Render every metric and collector as OpenMetrics text"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        
+        families = [metric.family() for metric in metrics]
+        for collector in collectors:
+            try:
+                families.extend(collector())
+            except Exception as e:
+                logger.error(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+        return render_families(families)
+    
+    def render_threadsafe(self) -> str:
+        """
+        Render from another thread (the keep-alive web server)
+        
+        Collectors read bot state, so rendering is handed to the event loop.
+        If the loop is stalled the scrape still succeeds by rendering here.
+        """
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return self.render()
+        
+        async def _render():
+            return self.render()
+        
+        future = asyncio.run_coroutine_threadsafe(_render(), loop)
+        try:
+            return future.result(timeout=self.RENDER_TIMEOUT)
+        except Exception:
+            future.cancel()
+            logger.warning("Event loop did not answer the metrics scrape in time, rendering from the web thread")
+            return self.render()
+
+
+# Global instance
+_metrics_registry = None
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get the global metrics registry"""
+    global _metrics_registry
+    if _metrics_registry is None:
+        _metrics_registry = MetricsRegistry()
+    return _metrics_registry
+
+
+def timed_task(name: str):
+    """
+    Record the duration and failures of a background task iteration
+    
+    Place it under @tasks.loop:
+        @tasks.loop(minutes=10)
+        @timed_task("save_analytics")
+        async def save_analytics_task(self): ...
+    """
+    registry = get_metrics_registry()
+    durations = registry.histogram(
+        "robonexus_task_duration_seconds", "Duration of background task iterations", ("task",)
+    )
+    failures = registry.counter(
+        "robonexus_task_failures", "Background task iterations that raised", ("task",)
+    )
+    
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                failures.inc(task=name)
+                raise
+            finally:
+                durations.observe(time.perf_counter() - start, task=name)
+        return wrapper
+    return decorator
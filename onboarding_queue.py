@@ -0,0 +1,199 @@
+"""
+Onboarding Queue for Robo Nexus Bot
+Sends join welcomes through a bounded queue, batching them per channel during join spikes
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+from metrics_registry import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+class OnboardingQueue:
+    """
+    Bounded queue of member joins drained by a small worker pool
+    
+    on_member_join only records the join and enqueues it. Workers send
+    the self-roles welcome and the welcome-channel notification. When more
+    than SPIKE_JOINS members joined within RATE_WINDOW seconds (a raid or a
+    class-wide invite), a worker waits BATCH_WINDOW seconds and sends one
+    message per channel for everyone who joined meanwhile. Messages to a
+    channel are spaced CHANNEL_INTERVAL apart, and a 429 on a channel
+    pauses that channel only. When the queue is full, new joins are
+    dropped and counted rather than piling up.
+    """
+    
+    SPIKE_JOINS = 5
+    RATE_WINDOW = 10.0
+    BATCH_WINDOW = 2.0
+    MAX_BATCH = 20
+    # Discord allows 5 messages per 5 seconds per channel
+    CHANNEL_INTERVAL = 1.0
+    MAX_RETRIES = 3
+    
+    def __init__(self, welcome_system, maxsize: int = 500, workers: int = 2):
+        self.welcome_system = welcome_system
+        self.maxsize = maxsize
+        self.worker_count = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._recent_joins = deque()
+        # channel ID -> monotonic time the next message may be sent
+        self._channel_ready: Dict[int, float] = {}
+        
+        registry = get_metrics_registry()
+        self.depth_gauge = registry.gauge(
+            "robonexus_onboarding_queue_depth", "Member joins waiting for a welcome"
+        )
+        self.joins_counter = registry.counter(
+            "robonexus_onboarding_joins", "Member joins by queue outcome", ("result",)
+        )
+        self.wait_histogram = registry.histogram(
+            "robonexus_onboarding_wait_seconds", "Time from join to welcome being sent"
+        )
+        self.messages_counter = registry.counter(
+            "robonexus_onboarding_messages", "Onboarding messages sent", ("kind", "batched")
+        )
+        self.rate_limited_counter = registry.counter(
+            "robonexus_onboarding_rate_limited", "Onboarding sends that hit a Discord rate limit"
+        )
+    
+    def _ensure_workers(self):
+        """Start the worker pool lazily on the running event loop"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self.worker_count:
+            self._workers.append(asyncio.create_task(self._worker(), name=f"onboarding-{len(self._workers)}"))
+    
+    def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+    
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+    
+    def submit(self, member: discord.Member) -> bool:
+        """Queue a join for welcoming; returns False if the queue is full"""
+        self._ensure_workers()
+        now = time.monotonic()
+        self._recent_joins.append(now)
+        while self._recent_joins and now - self._recent_joins[0] > self.RATE_WINDOW:
+            self._recent_joins.popleft()
+        
+        try:
+            self._queue.put_nowait((member, now))
+        except asyncio.QueueFull:
+            self.joins_counter.inc(result="dropped")
+            logger.warning(f"Onboarding queue full, no welcome for {member.display_name} ({member.id})")
+            return False
+        
+        self.joins_counter.inc(result="queued")
+        self.depth_gauge.set(self._queue.qsize())
+        return True
+    
+    @property
+    def spiking(self) -> bool:
+        return len(self._recent_joins) > self.SPIKE_JOINS
+    
+    async def _worker(self):
+        while True:
+            first = await self._queue.get()
+            batch = [first]
+            try:
+                if self.spiking:
+                    await asyncio.sleep(self.BATCH_WINDOW)
+                while len(batch) < self.MAX_BATCH:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                self.depth_gauge.set(self._queue.qsize())
+                
+                await self._process(batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error processing onboarding batch of {len(batch)}: {e}", exc_info=True)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _process(self, batch: List[Tuple[discord.Member, float]]):
+        # Channel settings are read once per batch instead of once per join
+        self_roles_channel_id = await self.welcome_system.get_self_roles_channel_id()
+        welcome_channel_id = await self.welcome_system.get_welcome_channel_id()
+        if not self_roles_channel_id:
+            logger.warning("Self-roles channel not configured, cannot send welcome message")
+        
+        by_guild: Dict[int, List[Tuple[discord.Member, float]]] = {}
+        for member, enqueued in batch:
+            by_guild.setdefault(member.guild.id, []).append((member, enqueued))
+        
+        for entries in by_guild.values():
+            guild = entries[0][0].guild
+            members = [member for member, _ in entries]
+            batched = "true" if len(members) > 1 else "false"
+            
+            channel = guild.get_channel(self_roles_channel_id) if self_roles_channel_id else None
+            if self_roles_channel_id and not channel:
+                logger.error(f"Self-roles channel {self_roles_channel_id} not found")
+            if channel:
+                embed = self.welcome_system.build_welcome_embed(guild, members)
+                if await self._send(channel, embed):
+                    self.messages_counter.inc(kind="welcome", batched=batched)
+                    logger.info(f"Sent welcome message in #{channel.name} for {len(members)} member(s)")
+            
+            channel = guild.get_channel(welcome_channel_id) if welcome_channel_id else None
+            if channel:
+                embed = self.welcome_system.build_join_notification_embed(guild, members)
+                if await self._send(channel, embed):
+                    self.messages_counter.inc(kind="notification", batched=batched)
+            
+            now = time.monotonic()
+            for _, enqueued in entries:
+                self.wait_histogram.observe(now - enqueued)
+    
+    async def _send(self, channel: discord.abc.Messageable, embed: discord.Embed) -> bool:
+        """Send to a channel, respecting its pacing and any 429 on that route"""
+        for attempt in range(self.MAX_RETRIES + 1):
+            # Reserve the channel's next slot before sleeping so concurrent workers queue up behind it
+            now = time.monotonic()
+            slot = max(self._channel_ready.get(channel.id, 0.0), now)
+            self._channel_ready[channel.id] = slot + self.CHANNEL_INTERVAL
+            if slot > now:
+                await asyncio.sleep(slot - now)
+            
+            try:
+                await channel.send(embed=embed)
+                return True
+            
+            except discord.Forbidden:
+                logger.error(f"Missing permissions to send onboarding messages in #{channel}")
+                return False
+            
+            except discord.HTTPException as e:
+                if attempt >= self.MAX_RETRIES:
+                    logger.error(f"Giving up on onboarding message in #{channel}: {e}")
+                    return False
+                
+                if e.status == 429:
+                    self.rate_limited_counter.inc()
+                    retry_after = float(getattr(e, 'retry_after', None) or 1.0)
+                    self._channel_ready[channel.id] = time.monotonic() + retry_after
+                    logger.warning(f"Onboarding messages in #{channel} rate limited, pausing for {retry_after:.1f}s")
+                elif e.status >= 500:
+                    await asyncio.sleep(2 ** attempt)
+                else:
+                    logger.error(f"HTTP error sending onboarding message in #{channel}: {e}")
+                    return False
+        
+        return False
@@ -0,0 +1,167 @@
+"""
+Profile Export for Robo Nexus Bot
+Streams user profiles page by page into a gzip-compressed CSV or JSON Lines file
+"""
+import asyncio
+import csv
+import gzip
+import io
+import json
+import logging
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from date_parser import DateParser
+
+logger = logging.getLogger(__name__)
+
+# (CSV header, JSON Lines key) for every exported column, in order
+EXPORT_FIELDS = [
+    ('Name', 'name'),
+    ('Class', 'class'),
+    ('Email', 'email'),
+    ('Phone', 'phone'),
+    ('Birthday', 'birthday'),
+    ('Discord Username', 'username'),
+    ('Discord ID', 'user_id'),
+    ('Joined At', 'joined_at'),
+    ('Verified At', 'verified_at'),
+    ('GitHub', 'github'),
+    ('LinkedIn', 'linkedin'),
+    ('YouTube', 'youtube'),
+    ('Spotify', 'spotify'),
+    ('Website', 'website'),
+]
+
+SOCIAL_PLATFORMS = ('github', 'linkedin', 'youtube', 'spotify', 'website')
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+
+def profile_record(profile: Dict[str, Any], birthday: Optional[str]) -> Dict[str, Any]:
+    """Flatten a user_profiles row (plus its MM-DD birthday) into export columns"""
+    social_links = profile.get('social_links') or {}
+    if isinstance(social_links, str):
+        try:
+            social_links = json.loads(social_links)
+        except ValueError:
+            social_links = {}
+    
+    record = {
+        'name': profile.get('display_name') or '',
+        'class': profile.get('class_year') or '',
+        'email': profile.get('email') or '',
+        'phone': profile.get('phone') or '',
+        'birthday': birthday,
+        'username': profile.get('username') or '',
+        'user_id': profile.get('user_id') or '',
+        'joined_at': profile.get('created_at') or '',
+        'verified_at': profile.get('updated_at') or '',
+    }
+    for platform in SOCIAL_PLATFORMS:
+        record[platform] = social_links.get(platform, '') if isinstance(social_links, dict) else ''
+    return record
+
+
+@dataclass
+class ExportResult:
+    """A finished export, positioned at the start and ready to upload"""
+    file: Any
+    filename: str
+    rows: int
+    size: int
+    elapsed: float
+    
+    def close(self):
+        self.file.close()
+
+
+class ProfileExporter:
+    """
+    Streaming profile exporter
+    
+    Profiles are read PAGE_SIZE at a time with keyset pagination, and the
+    next page is fetched while the current one is written. Each page's
+    birthdays are joined with one bulk lookup. Rows go through gzip into a
+    SpooledTemporaryFile, which stays in memory for small exports and moves
+    to disk past SPOOL_SIZE. Memory stays flat however many profiles there are.
+    """
+    
+    PAGE_SIZE = 500
+    SPOOL_SIZE = 2 * 1024 * 1024
+    
+    def __init__(self, db, birthday_db, fmt: str = 'csv'):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        self.db = db
+        self.birthday_db = birthday_db
+        self.fmt = fmt
+    
+    async def _fetch_page(self, after_user_id: Optional[str]) -> List[Dict[str, Any]]:
+        page = await self.db.get_user_profiles_page(after_user_id, self.PAGE_SIZE)
+        if page is None:
+            raise RuntimeError("Could not read user profiles from the database")
+        return page
+    
+    async def export(self) -> ExportResult:
+        """Write every profile to a compressed temporary file"""
+        start = time.monotonic()
+        spool = tempfile.SpooledTemporaryFile(max_size=self.SPOOL_SIZE)
+        compressed = gzip.GzipFile(fileobj=spool, mode='wb')
+        text = io.TextIOWrapper(compressed, encoding='utf-8', newline='')
+        writer = csv.writer(text) if self.fmt == 'csv' else None
+        rows = 0
+        
+        try:
+            if writer:
+                writer.writerow([header for header, _ in EXPORT_FIELDS])
+            
+            page = await self._fetch_page(None)
+            while page:
+                # Start reading the next page while this one is joined and written
+                next_page = asyncio.create_task(self._fetch_page(page[-1].get('user_id')))
+                try:
+                    birthdays = await self.birthday_db.get_birthdays_for(
+                        (profile['user_id'] for profile in page if profile.get('user_id')),
+                        profiles=page
+                    )
+                    records = [
+                        profile_record(profile, birthdays.get(int(profile['user_id'])) if profile.get('user_id') else None)
+                        for profile in page
+                    ]
+                    await asyncio.to_thread(self._write_records, text, writer, records)
+                    rows += len(records)
+                except BaseException:
+                    next_page.cancel()
+                    raise
+                page = await next_page
+            
+            text.flush()
+            text.detach()
+            compressed.close()
+        except BaseException:
+            spool.close()
+            raise
+        
+        size = spool.tell()
+        spool.seek(0)
+        extension = 'csv' if self.fmt == 'csv' else 'jsonl'
+        filename = f"robo_nexus_profiles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}.gz"
+        elapsed = time.monotonic() - start
+        logger.info(f"Exported {rows} profiles as {self.fmt} ({size} bytes compressed) in {elapsed:.2f}s")
+        return ExportResult(spool, filename, rows, size, elapsed)
+    
+    def _write_records(self, text: io.TextIOWrapper, writer, records: List[Dict[str, Any]]):
+        """Encode and compress one page (runs in a worker thread)"""
+        if writer:
+            for record in records:
+                birthday = record['birthday']
+                record = {**record, 'birthday': DateParser.format_birthday(birthday) if birthday else "Not registered"}
+                writer.writerow([record[key] for _, key in EXPORT_FIELDS])
+        else:
+            for record in records:
+                text.write(json.dumps(record, ensure_ascii=False))
+                text.write('\n')
@@ -0,0 +1,266 @@
+"""
+Profile Import for Robo Nexus Bot
+Parses, validates and diffs bulk profile uploads (CSV or JSON) against stored profiles
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from input_validators import is_skip, validate_many
+
+# Accepted column names (lowercased, spaces as underscores) -> profile field.
+# Covers the /export_profiles CSV and JSON Lines layouts so exports re-import cleanly.
+COLUMN_ALIASES = {
+    'user_id': 'user_id', 'discord_id': 'user_id', 'id': 'user_id',
+    'name': 'display_name', 'display_name': 'display_name', 'full_name': 'display_name',
+    'class': 'class_year', 'class_year': 'class_year', 'grade': 'class_year',
+    'email': 'email', 'gmail': 'email',
+    'phone': 'phone', 'phone_number': 'phone',
+    'social_links': 'social_links',
+    'github': 'github', 'linkedin': 'linkedin', 'youtube': 'youtube',
+    'spotify': 'spotify', 'website': 'website',
+}
+SOCIAL_COLUMNS = ('github', 'linkedin', 'youtube', 'spotify', 'website')
+
+# Fields an import may set, compared against the stored profile
+DIFF_FIELDS = ('display_name', 'class_year', 'email', 'phone', 'social_links')
+
+
+@dataclass
+class ImportRow:
+    """One validated upload row; fields only holds the columns the upload had"""
+    line_no: int
+    user_id: int
+    fields: Dict[str, Any]
+
+
+@dataclass
+class ProfileChange:
+    """What an import would do to one profile"""
+    row: ImportRow
+    existing: Optional[Dict[str, Any]]
+    # field -> (old value, new value)
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    
+    @property
+    def is_new(self) -> bool:
+        return self.existing is None
+    
+    @property
+    def old_class(self) -> Optional[str]:
+        if not self.existing or not self.existing.get('class_year'):
+            return None
+        return str(self.existing['class_year'])
+
+
+@dataclass
+class ImportPlan:
+    new: List[ProfileChange] = field(default_factory=list)
+    changed: List[ProfileChange] = field(default_factory=list)
+    unchanged: int = 0
+    errors: List[str] = field(default_factory=list)
+    
+    @property
+    def writes(self) -> List[ProfileChange]:
+        return self.new + self.changed
+
+
+def _normalize_key(key: str) -> Optional[str]:
+    return COLUMN_ALIASES.get(str(key).strip().lower().replace(' ', '_').replace('-', '_'))
+
+
+def read_records(data: bytes, filename: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yield (line number, record) pairs from a CSV, JSON array or JSON Lines upload
+    
+    Keys are mapped to profile fields through COLUMN_ALIASES; unknown ones are dropped.
+    
+    Raises:
+        ValueError: If the file cannot be parsed at all
+    """
+    text = data.decode('utf-8-sig')
+    name = filename.lower()
+    
+    if name.endswith('.csv'):
+        reader = csv.reader(io.StringIO(text, newline=''))
+        header = next(reader, None)
+        if not header:
+            raise ValueError("the file is empty")
+        columns = [_normalize_key(cell) for cell in header]
+        if 'user_id' not in columns:
+            raise ValueError("header must contain a `user_id` (or `Discord ID`) column")
+        for line_no, row in enumerate(reader, start=2):
+            if any(cell.strip() for cell in row):
+                yield line_no, {col: cell for col, cell in zip(columns, row) if col}
+        return
+    
+    stripped = text.lstrip()
+    if stripped.startswith('['):
+        try:
+            records = json.loads(text)
+        except ValueError as e:
+            raise ValueError(f"invalid JSON: {e}")
+        items = enumerate(records, start=1)
+    else:
+        items = []
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            if line.strip():
+                try:
+                    items.append((line_no, json.loads(line)))
+                except ValueError as e:
+                    raise ValueError(f"line {line_no}: invalid JSON: {e}")
+    
+    for line_no, record in items:
+        if not isinstance(record, dict):
+            raise ValueError(f"record {line_no} is not an object")
+        yield line_no, {
+            key: value for key, value in
+            ((_normalize_key(k), v) for k, v in record.items()) if key
+        }
+
+
+def _present(value: Any) -> bool:
+    return value is not None and str(value).strip() != ''
+
+
+def _social_text(record: Dict[str, Any]) -> str:
+    """All social link values of a record as one newline-separated string"""
+    social = record.get('social_links')
+    if isinstance(social, str) and social.strip().startswith('{'):
+        try:
+            social = json.loads(social)
+        except ValueError:
+            pass
+    parts = list(social.values()) if isinstance(social, dict) else [social] if social else []
+    parts += [record[column] for column in SOCIAL_COLUMNS if record.get(column)]
+    return '\n'.join(str(part) for part in parts if part)
+
+
+def validate_records(records: List[Tuple[int, Dict[str, Any]]]) -> Tuple[List[ImportRow], List[str]]:
+    """
+    Validate records column by column with the shared input validators
+    
+    Returns:
+        (valid rows, error messages); each invalid record gets one error
+    """
+    def column(key: str) -> List[str]:
+        return [str(record.get(key) or '').strip() for _, record in records]
+    
+    classes = validate_many('class', column('class_year'))
+    emails = column('email')
+    email_ok = validate_many('email', emails)
+    raw_phones = column('phone')
+    phones = validate_many('phone', raw_phones)
+    social_links = validate_many('social_links', [_social_text(record) for _, record in records])
+    
+    rows = []
+    errors = []
+    for i, (line_no, record) in enumerate(records):
+        raw_id = str(record.get('user_id') or '').strip().strip('<@!>')
+        if not raw_id.isdigit() or not 17 <= len(raw_id) <= 20:
+            errors.append(f"Line {line_no}: invalid user ID `{raw_id[:25]}`")
+            continue
+        
+        name = str(record.get('display_name') or '').strip()
+        if not name or len(name) > 100:
+            errors.append(f"Line {line_no}: name is required (max 100 characters)")
+            continue
+        
+        if not classes[i]:
+            errors.append(f"Line {line_no}: class must be between 6 and 12")
+            continue
+        
+        fields = {'display_name': name, 'class_year': classes[i]}
+        
+        # Optional columns are only touched when the cell has a value; "none" clears them
+        if emails[i]:
+            if not email_ok[i]:
+                errors.append(f"Line {line_no}: `{emails[i][:40]}` is not a valid Gmail address")
+                continue
+            fields['email'] = None if is_skip(emails[i]) else emails[i].lower()
+        
+        if raw_phones[i]:
+            if phones[i] is None and not is_skip(raw_phones[i]):
+                errors.append(f"Line {line_no}: invalid phone number `{raw_phones[i][:20]}`")
+                continue
+            fields['phone'] = phones[i]
+        
+        if any(_present(record.get(key)) for key in ('social_links',) + SOCIAL_COLUMNS):
+            fields['social_links'] = social_links[i] or None
+        
+        rows.append(ImportRow(line_no, int(raw_id), fields))
+    
+    return rows, errors
+
+
+def _stored_value(profile: Dict[str, Any], key: str) -> Any:
+    value = profile.get(key)
+    if key == 'social_links' and isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            pass
+    if key == 'class_year' and value is not None:
+        value = str(value)
+    return value or None
+
+
+def plan_import(rows: Iterable[ImportRow], existing: Dict[int, Dict[str, Any]], errors: List[str]) -> ImportPlan:
+    """Diff validated rows against the stored profiles"""
+    plan = ImportPlan(errors=errors)
+    for row in rows:
+        profile = existing.get(row.user_id)
+        change = ProfileChange(row, profile)
+        if profile is None:
+            change.changes = {key: (None, row.fields[key]) for key in DIFF_FIELDS if row.fields.get(key)}
+            plan.new.append(change)
+            continue
+        for key in DIFF_FIELDS:
+            if key not in row.fields:
+                continue
+            old, new = _stored_value(profile, key), row.fields[key] or None
+            if old != new:
+                change.changes[key] = (old, new)
+        if change.changes:
+            plan.changed.append(change)
+        else:
+            plan.unchanged += 1
+    return plan
+
+
+def describe_change(change: ProfileChange) -> str:
+    """One-line summary, e.g. 'Aarav (1234…): class 9 → 10, email added'"""
+    parts = []
+    for key, (old, new) in change.changes.items():
+        label = {'display_name': 'name', 'class_year': 'class', 'social_links': 'links'}.get(key, key)
+        if key == 'social_links':
+            parts.append(f"{label} {'updated' if old and new else 'added' if new else 'removed'}")
+        elif old is None:
+            parts.append(f"{label} added" if key in ('email', 'phone') else f"{label} {new}")
+        elif new is None:
+            parts.append(f"{label} removed")
+        else:
+            parts.append(f"{label} {old} → {new}")
+    prefix = "🆕 " if change.is_new else ""
+    return f"{prefix}{change.row.fields['display_name']} ({change.row.user_id}): {', '.join(parts)}"
+
+
+def upsert_payload(change: ProfileChange, username: str) -> Dict[str, Any]:
+    """
+    Full profile row for a bulk upsert
+    
+    Bulk upserts need the same keys in every row, so fields the upload
+    left out are filled from the stored profile.
+    """
+    existing = change.existing or {}
+    payload = {'user_id': str(change.row.user_id), 'username': username or existing.get('username') or ''}
+    for key in DIFF_FIELDS:
+        value = change.row.fields[key] if key in change.row.fields else _stored_value(existing, key)
+        if key == 'social_links':
+            value = json.dumps(value) if value else None
+        payload[key] = value
+    payload['verification_status'] = 'verified'
+    payload['verification_stage'] = 'complete'
+    return payload
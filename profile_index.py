@@ -0,0 +1,328 @@
+"""
+Profile Index for Robo Nexus Bot
+In-memory inverted index for searching member profiles by name, class, email and social handles
+"""
+import asyncio
+import bisect
+import heapq
+import json
+import logging
+import re
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+SOCIAL_PLATFORMS = ('github', 'linkedin', 'youtube', 'spotify', 'website')
+
+# Match quality, summed over query terms
+EXACT_SCORE = 3
+PREFIX_SCORE = 2
+FUZZY_SCORE = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, accent-stripped alphanumeric tokens"""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return _TOKEN.findall(text.lower())
+
+
+def social_handle(url: str) -> str:
+    """The account part of a social link (github.com/octocat -> octocat)"""
+    if not url:
+        return ''
+    parsed = urlparse(url if '//' in url else f"//{url}")
+    parts = [part for part in parsed.path.split('/') if part and part not in ('in', 'c', 'user', 'channel', 'artist')]
+    return parts[-1].lstrip('@') if parts else parsed.netloc
+
+
+def _trigrams(token: str) -> Set[str]:
+    padded = f"^{token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _within_distance(a: str, b: str, limit: int) -> bool:
+    """Levenshtein distance <= limit, computed only along the diagonal band"""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        if low > 1:
+            current[low - 1] = limit + 1
+        for j in range(low, high + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != b[j - 1]))
+        if high < len(b):
+            current[high + 1:] = [limit + 1] * (len(b) - high)
+        if min(current[low - 1:high + 1]) > limit:
+            return False
+        previous = current
+    return previous[len(b)] <= limit
+
+
+@dataclass
+class ProfileSummary:
+    """What search results show; the full profile is still read from the database"""
+    user_id: int
+    display_name: str
+    username: str
+    class_year: str
+    email: str
+    handles: Dict[str, str]
+    
+    def tokens(self) -> Set[str]:
+        tokens = set()
+        for text in (self.display_name, self.username.split('#')[0], self.class_year, self.email, *self.handles.values()):
+            tokens.update(tokenize(text))
+        if self.email:
+            # The whole address as one token too, so pasted emails match exactly
+            tokens.add(self.email.lower())
+        return tokens
+
+
+def summarize(user_id: int, row: Dict[str, Any], existing: Optional[ProfileSummary] = None) -> ProfileSummary:
+    """Build a summary from a profile row, keeping existing values for fields the row leaves out"""
+    def pick(key: str, current: str) -> str:
+        return str(row[key] or '') if key in row else current
+    
+    social_links = row.get('social_links')
+    if isinstance(social_links, str):
+        try:
+            social_links = json.loads(social_links)
+        except ValueError:
+            social_links = None
+    if isinstance(social_links, dict):
+        handles = {p: social_handle(social_links[p]) for p in SOCIAL_PLATFORMS if social_links.get(p)}
+    else:
+        handles = existing.handles if existing and 'social_links' not in row else {}
+    
+    return ProfileSummary(
+        user_id=user_id,
+        display_name=pick('display_name', existing.display_name if existing else ''),
+        username=pick('username', existing.username if existing else ''),
+        class_year=pick('class_year', existing.class_year if existing else ''),
+        email=pick('email', existing.email if existing else ''),
+        handles=handles
+    )
+
+
+class ProfileIndex:
+    """
+    Token -> user ID inverted index over the searchable profile fields
+    
+    Each query term matches index tokens exactly, by prefix (a binary
+    search over the sorted vocabulary), or, when nothing matches by prefix,
+    within a small edit distance of tokens sharing a trigram with it. All
+    terms must match. The index is built from the paged profile stream and
+    patched on every profile write, so a search never touches the database.
+    """
+    
+    MAX_RESULTS = 25
+    # Rebuilt from the database this often, to pick up edits made outside the bot
+    REBUILD_INTERVAL = 6 * 3600
+    
+    def __init__(self):
+        self._profiles: Dict[int, ProfileSummary] = {}
+        self._tokens: Dict[int, Set[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._vocabulary: List[str] = []
+        self._trigram_index: Dict[str, Set[str]] = {}
+        self.built_at = 0.0
+        self._build_lock = asyncio.Lock()
+        self._rebuild_task: Optional[asyncio.Task] = None
+        # Writes (None for removals) made while build() is reading the table
+        self._written_during_build: Optional[Dict[int, Optional[Dict[str, Any]]]] = None
+    
+    def __len__(self) -> int:
+        return len(self._profiles)
+    
+    @property
+    def ready(self) -> bool:
+        return self.built_at > 0
+    
+    @property
+    def stale(self) -> bool:
+        return time.time() - self.built_at > self.REBUILD_INTERVAL
+    
+    def get(self, user_id: int) -> Optional[ProfileSummary]:
+        return self._profiles.get(user_id)
+    
+    # Index maintenance
+    
+    def _add_token(self, token: str, user_id: int):
+        users = self._postings.get(token)
+        if users is None:
+            users = self._postings[token] = set()
+            bisect.insort(self._vocabulary, token)
+            for gram in _trigrams(token):
+                self._trigram_index.setdefault(gram, set()).add(token)
+        users.add(user_id)
+    
+    def _remove_token(self, token: str, user_id: int):
+        users = self._postings.get(token)
+        if users is None:
+            return
+        users.discard(user_id)
+        if not users:
+            del self._postings[token]
+            del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+            for gram in _trigrams(token):
+                tokens = self._trigram_index.get(gram)
+                if tokens:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._trigram_index[gram]
+    
+    def upsert(self, user_id: int, row: Dict[str, Any]):
+        """Index a profile write (row may hold only the changed fields)"""
+        if self._written_during_build is not None:
+            written = self._written_during_build.get(user_id) or {}
+            written.update(row)
+            self._written_during_build[user_id] = written
+        summary = summarize(user_id, row, self._profiles.get(user_id))
+        old_tokens = self._tokens.get(user_id, set())
+        new_tokens = summary.tokens()
+        for token in old_tokens - new_tokens:
+            self._remove_token(token, user_id)
+        for token in new_tokens - old_tokens:
+            self._add_token(token, user_id)
+        self._profiles[user_id] = summary
+        self._tokens[user_id] = new_tokens
+    
+    def remove(self, user_id: int):
+        if self._written_during_build is not None:
+            self._written_during_build[user_id] = None
+        for token in self._tokens.pop(user_id, set()):
+            self._remove_token(token, user_id)
+        self._profiles.pop(user_id, None)
+    
+    async def build(self, db) -> bool:
+        """
+        Rebuild from the profiles table, page by page
+        
+        Returns:
+            False if the profiles could not be read (the current index is kept)
+        """
+        async with self._build_lock:
+            fresh = ProfileIndex()
+            self._written_during_build = {}
+            after = None
+            while True:
+                page = await db.get_user_profiles_page(after)
+                if page is None:
+                    logger.error("Profile index build failed: could not read user profiles")
+                    self._written_during_build = None
+                    return False
+                if not page:
+                    break
+                for row in page:
+                    try:
+                        fresh.upsert(int(row['user_id']), row)
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                after = page[-1].get('user_id')
+                await asyncio.sleep(0)  # Let other handlers run between pages
+            
+            # Writes that landed while pages were being read may be newer than what was read
+            for user_id, row in self._written_during_build.items():
+                if row is None:
+                    fresh.remove(user_id)
+                else:
+                    fresh.upsert(user_id, row)
+            self._written_during_build = None
+            
+            self._profiles = fresh._profiles
+            self._tokens = fresh._tokens
+            self._postings = fresh._postings
+            self._vocabulary = fresh._vocabulary
+            self._trigram_index = fresh._trigram_index
+            self.built_at = time.time()
+            logger.info(f"Built profile index: {len(self._profiles)} profiles, {len(self._vocabulary)} tokens")
+            return True
+    
+    def rebuild_in_background(self, db):
+        """Start a rebuild unless one is already running; searches keep using the current index"""
+        if self._rebuild_task and not self._rebuild_task.done():
+            return
+        self._rebuild_task = asyncio.create_task(self.build(db), name="profile-index-rebuild")
+        self._rebuild_task.add_done_callback(_log_rebuild_failure)
+    
+    # Search
+    
+    def _match_term(self, term: str) -> Dict[int, int]:
+        """User ID -> best score for one query term"""
+        scores: Dict[int, int] = {}
+        start = bisect.bisect_left(self._vocabulary, term)
+        for i in range(start, len(self._vocabulary)):
+            token = self._vocabulary[i]
+            if not token.startswith(term):
+                break
+            score = EXACT_SCORE if token == term else PREFIX_SCORE
+            for user_id in self._postings[token]:
+                if scores.get(user_id, 0) < score:
+                    scores[user_id] = score
+        if scores or len(term) < 3:
+            return scores
+        
+        # No prefix hits: try tokens within a small edit distance
+        limit = 1 if len(term) <= 5 else 2
+        candidates: Set[str] = set()
+        for gram in _trigrams(term):
+            candidates.update(self._trigram_index.get(gram, ()))
+        for token in candidates:
+            if _within_distance(term, token, limit):
+                for user_id in self._postings[token]:
+                    scores[user_id] = FUZZY_SCORE
+        return scores
+    
+    def search(self, query: str, limit: int = MAX_RESULTS) -> List[Tuple[ProfileSummary, int]]:
+        """
+        Find profiles matching every term of the query
+        
+        Returns:
+            (profile, score) pairs, best first
+        """
+        terms = []
+        for word in query.lower().split():
+            # Emails are indexed whole as well, so an exact address doesn't match every "gmail" token
+            terms.extend([word] if '@' in word else tokenize(word))
+        if not terms:
+            return []
+        
+        totals: Optional[Dict[int, int]] = None
+        # Rarest-looking (longest) terms first keeps the intersection small
+        for term in sorted(set(terms), key=len, reverse=True):
+            scores = self._match_term(term)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {user_id: total + scores[user_id] for user_id, total in totals.items() if user_id in scores}
+            if not totals:
+                return []
+        
+        ranked = heapq.nsmallest(limit, totals.items(), key=lambda item: (-item[1], self._profiles[item[0]].display_name.lower()))
+        return [(self._profiles[user_id], score) for user_id, score in ranked]
+
+
+def _log_rebuild_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        logger.error("Background profile index rebuild failed", exc_info=task.exception())
+
+
+# Global instance
+_profile_index = None
+
+def get_profile_index() -> ProfileIndex:
+    """Get the global profile index"""
+    global _profile_index
+    if _profile_index is None:
+        _profile_index = ProfileIndex()
+    return _profile_index
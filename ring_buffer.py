@@ -0,0 +1,106 @@
+"""
+Columnar Ring Buffers for Robo Nexus Bot
+Fixed-size float sample storage for performance metrics
+"""
+import math
+from array import array
+from bisect import bisect_left
+from typing import Dict, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, plain arrays are used without it
+    np = None
+
+
+class RingBuffer:
+    """
+    Fixed-capacity ring buffer storing each column in its own float array
+    
+    Every sample costs 8 bytes per column, and reads only touch the columns
+    and the tail they need. The first column is expected to be a
+    monotonically increasing timestamp so time windows can be found by
+    binary search.
+    """
+    
+    def __init__(self, capacity: int, columns: Sequence[str]):
+        self.capacity = capacity
+        self.columns: Tuple[str, ...] = tuple(columns)
+        self._data: Dict[str, array] = {name: array('d', bytes(8 * capacity)) for name in self.columns}
+        self._next = 0
+        self._count = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def append(self, *values: float):
+        """Add one sample, values in column order"""
+        i = self._next
+        for name, value in zip(self.columns, values):
+            self._data[name][i] = value
+        self._next = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+    
+    def column(self, name: str, last: Optional[int] = None):
+        """
+        Get the newest `last` values of a column, oldest first
+        
+        Returns:
+            numpy array if numpy is installed, otherwise an array('d')
+        """
+        count = self._count if last is None else max(0, min(last, self._count))
+        start = (self._next - count) % self.capacity
+        data = self._data[name]
+        if np is not None:
+            data = np.frombuffer(data, dtype=np.float64)
+        
+        if count == 0:
+            return data[:0]
+        if start + count <= self.capacity:
+            return data[start:start + count]
+        head = data[start:]
+        tail = data[:count - len(head)]
+        return np.concatenate((head, tail)) if np is not None else head + tail
+    
+    def latest(self, name: str) -> Optional[float]:
+        """Most recent value of a column"""
+        if not self._count:
+            return None
+        return self._data[name][(self._next - 1) % self.capacity]
+    
+    def count_since(self, timestamp: float, column: Optional[str] = None) -> int:
+        """Number of samples whose timestamp is at or after `timestamp`"""
+        timestamps = self.column(column or self.columns[0])
+        if np is not None:
+            return len(timestamps) - int(np.searchsorted(timestamps, timestamp, side='left'))
+        return len(timestamps) - bisect_left(timestamps, timestamp)
+    
+    def mean(self, name: str, last: Optional[int] = None) -> float:
+        """Average of the newest `last` values (0.0 when empty)"""
+        values = self.column(name, last)
+        if not len(values):
+            return 0.0
+        if np is not None:
+            return float(values.mean())
+        return math.fsum(values) / len(values)
+    
+    def percentile(self, name: str, q: float, last: Optional[int] = None) -> float:
+        """q-th percentile (0-100) of the newest `last` values, linear interpolation"""
+        values = self.column(name, last)
+        if not len(values):
+            return 0.0
+        if np is not None:
+            return float(np.percentile(values, q))
+        
+        ordered = sorted(values)
+        rank = (len(ordered) - 1) * q / 100
+        low = math.floor(rank)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+    
+    def max(self, name: str, last: Optional[int] = None) -> float:
+        values = self.column(name, last)
+        if not len(values):
+            return 0.0
+        return float(values.max()) if np is not None else max(values)
@@ -0,0 +1,167 @@
+"""
+Role Mutation Queue for Robo Nexus Bot
+Applies role additions/removals with bounded concurrency and rate-limit back-off
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RoleMutation:
+    """A single role change for one member"""
+    guild: discord.Guild
+    user_id: int
+    role: discord.Role
+    add: bool
+    reason: Optional[str] = None
+    future: Optional[asyncio.Future] = field(default=None, repr=False)
+
+
+@dataclass
+class RoleMutationResult:
+    """Summary of a batch of role mutations"""
+    applied: int = 0
+    skipped: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+
+class RoleMutationQueue:
+    """
+    Queue of role mutations drained by a small pool of workers
+    
+    discord.py already retries individual 429s, but firing hundreds of
+    role calls at once still trips the shared guild bucket. The queue caps
+    in-flight calls and, when a rate limit does surface, pauses every
+    worker until the retry window has passed.
+    """
+    
+    def __init__(self, concurrency: int = 5, max_retries: int = 3):
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._paused_until = 0.0
+    
+    def _ensure_workers(self):
+        """Start the worker pool lazily on the running event loop"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [worker for worker in self._workers if not worker.done()]
+        while len(self._workers) < self.concurrency:
+            self._workers.append(asyncio.create_task(self._worker(), name=f"role-queue-{len(self._workers)}"))
+    
+    @property
+    def pending(self) -> int:
+        """Number of mutations waiting for a worker"""
+        return self._queue.qsize() if self._queue else 0
+    
+    def submit(self, mutation: RoleMutation) -> asyncio.Future:
+        """Queue a mutation and return a future resolving to 'applied', 'skipped' or 'failed'"""
+        self._ensure_workers()
+        mutation.future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(mutation)
+        return mutation.future
+    
+    async def apply(self, mutations: Iterable[RoleMutation]) -> RoleMutationResult:
+        """Queue a batch of mutations and wait for all of them to finish"""
+        start = time.monotonic()
+        futures = [self.submit(mutation) for mutation in mutations]
+        result = RoleMutationResult()
+        
+        for outcome in await asyncio.gather(*futures, return_exceptions=True):
+            if outcome == "applied":
+                result.applied += 1
+            elif outcome == "skipped":
+                result.skipped += 1
+            else:
+                result.failed += 1
+        
+        result.elapsed = time.monotonic() - start
+        return result
+    
+    async def _worker(self):
+        while True:
+            mutation = await self._queue.get()
+            try:
+                outcome = await self._apply_one(mutation)
+            except Exception as e:
+                logger.error(f"Unexpected error applying role mutation {mutation}: {e}", exc_info=True)
+                outcome = "failed"
+            finally:
+                self._queue.task_done()
+            
+            if mutation.future and not mutation.future.done():
+                mutation.future.set_result(outcome)
+    
+    async def _wait_if_paused(self):
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    async def _resolve_member(self, guild: discord.Guild, user_id: int) -> Optional[discord.Member]:
+        member = guild.get_member(user_id)
+        if member:
+            return member
+        try:
+            return await guild.fetch_member(user_id)
+        except discord.NotFound:
+            return None
+    
+    async def _apply_one(self, mutation: RoleMutation) -> str:
+        member = await self._resolve_member(mutation.guild, mutation.user_id)
+        if member is None:
+            return "skipped"
+        
+        has_role = member.get_role(mutation.role.id) is not None
+        if has_role == mutation.add:
+            return "skipped"
+        
+        for attempt in range(self.max_retries + 1):
+            await self._wait_if_paused()
+            try:
+                if mutation.add:
+                    await member.add_roles(mutation.role, reason=mutation.reason)
+                else:
+                    await member.remove_roles(mutation.role, reason=mutation.reason)
+                return "applied"
+            
+            except discord.Forbidden:
+                logger.error(f"Missing permissions to change role {mutation.role.name} for {member}")
+                return "failed"
+            
+            except discord.HTTPException as e:
+                if attempt >= self.max_retries:
+                    logger.error(f"Giving up on role {mutation.role.name} for {member}: {e}")
+                    return "failed"
+                
+                if e.status == 429:
+                    retry_after = float(getattr(e, 'retry_after', None) or 1.0)
+                    # Pause every worker, not just this one: the bucket is shared
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                    logger.warning(f"Role queue rate limited, pausing for {retry_after:.1f}s")
+                elif e.status >= 500:
+                    await asyncio.sleep(2 ** attempt)
+                else:
+                    logger.error(f"HTTP error changing role {mutation.role.name} for {member}: {e}")
+                    return "failed"
+        
+        return "failed"
+
+
+# Global instance
+_role_queue = None
+
+def get_role_queue() -> RoleMutationQueue:
+    """Get the global role mutation queue"""
+    global _role_queue
+    if _role_queue is None:
+        _role_queue = RoleMutationQueue()
+    return _role_queue
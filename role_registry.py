@@ -0,0 +1,145 @@
+"""
+Role Registry for Robo Nexus Bot
+Per-guild role name index kept current by gateway events, with single-flight role creation
+"""
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+
+class RoleRegistry:
+    """
+    Role lookups by name in O(1)
+    
+    Each guild's name -> role ID index is built once from guild.roles and
+    then patched by the role create/update/delete events. When several
+    roles share a name the lowest one wins, the same one
+    discord.utils.get(guild.roles, name=...) would return.
+    
+    get_or_create() creates a missing role once: concurrent callers for
+    the same guild and name wait on the first caller's request instead of
+    each creating a duplicate. A created role only reaches guild.roles when
+    its GUILD_ROLE_CREATE event arrives, so until then the registry keeps
+    the Role it got back and serves lookups from it.
+    """
+    
+    def __init__(self):
+        self._index: Dict[int, Dict[str, int]] = {}
+        self._creating: Dict[Tuple[int, str], asyncio.Future] = {}
+        # Guild ID -> role ID -> roles created here that the guild cache doesn't have yet
+        self._created: Dict[int, Dict[int, discord.Role]] = {}
+    
+    def _guild_index(self, guild: discord.Guild) -> Dict[str, int]:
+        index = self._index.get(guild.id)
+        if index is None:
+            index = {}
+            for role in guild.roles:  # Sorted bottom to top
+                index.setdefault(role.name, role.id)
+            for role in self._created.get(guild.id, {}).values():
+                index.setdefault(role.name, role.id)
+            self._index[guild.id] = index
+        return index
+    
+    def _lookup(self, guild: discord.Guild, role_id: int) -> Optional[discord.Role]:
+        """The cached role, or the one we created if its create event is still pending"""
+        role = guild.get_role(role_id)
+        created = self._created.get(guild.id)
+        if role is not None:
+            if created:
+                created.pop(role_id, None)  # The cache has caught up
+            return role
+        return created.get(role_id) if created else None
+    
+    def get(self, guild: discord.Guild, name: str) -> Optional[discord.Role]:
+        """Get a role by exact name, or None"""
+        role_id = self._guild_index(guild).get(name)
+        role = self._lookup(guild, role_id) if role_id else None
+        if role_id and (role is None or role.name != name):
+            # Missed an event (e.g. while reconnecting), rebuild this guild once
+            self.invalidate(guild.id)
+            role_id = self._guild_index(guild).get(name)
+            role = self._lookup(guild, role_id) if role_id else None
+        return role
+    
+    async def get_or_create(self, guild: discord.Guild, name: str, **create_kwargs) -> Optional[discord.Role]:
+        """
+        Get a role by name, creating it if it doesn't exist
+        
+        Args:
+            guild: Guild to look in
+            name: Exact role name
+            **create_kwargs: Passed to guild.create_role (color, hoist, reason, ...)
+        
+        Raises:
+            discord.HTTPException: If this caller's create request failed
+        """
+        role = self.get(guild, name)
+        if role:
+            return role
+        
+        key = (guild.id, name)
+        pending = self._creating.get(key)
+        if pending:
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._creating[key] = future
+        try:
+            role = await guild.create_role(name=name, **create_kwargs)
+            if guild.get_role(role.id) is None:
+                self._created.setdefault(guild.id, {})[role.id] = role
+            self.on_role_create(role)
+            logger.info(f"Created role '{name}' in {guild.name}")
+            future.set_result(role)
+            return role
+        except BaseException:
+            # Callers waiting on this creation get None; this caller sees the error
+            future.set_result(None)
+            raise
+        finally:
+            del self._creating[key]
+    
+    def invalidate(self, guild_id: int):
+        """Drop a guild's index, it is rebuilt on the next lookup"""
+        self._index.pop(guild_id, None)
+    
+    def forget_guild(self, guild_id: int):
+        """Drop everything held for a guild the bot left"""
+        self.invalidate(guild_id)
+        self._created.pop(guild_id, None)
+    
+    def on_role_create(self, role: discord.Role):
+        created = self._created.get(role.guild.id)
+        if created and role.guild.get_role(role.id) is not None:
+            created.pop(role.id, None)
+        index = self._index.get(role.guild.id)
+        if index is None:
+            return
+        existing = self._lookup(role.guild, index.get(role.name, 0))
+        if existing is None or role.position < existing.position:
+            index[role.name] = role.id
+    
+    def on_role_delete(self, role: discord.Role):
+        self._created.get(role.guild.id, {}).pop(role.id, None)
+        index = self._index.get(role.guild.id)
+        if index is not None and index.get(role.name) == role.id:
+            self.invalidate(role.guild.id)  # Another role may share the name
+    
+    def on_role_update(self, before: discord.Role, after: discord.Role):
+        if before.name != after.name or before.position != after.position:
+            self.invalidate(after.guild.id)
+
+
+# Global instance
+_role_registry = None
+
+def get_role_registry() -> RoleRegistry:
+    """Get the global role registry"""
+    global _role_registry
+    if _role_registry is None:
+        _role_registry = RoleRegistry()
+    return _role_registry
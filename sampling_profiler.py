@@ -0,0 +1,174 @@
+"""
+Sampling Profiler for Robo Nexus Bot
+Samples thread and asyncio task stacks of the live process into collapsed-stack output
+"""
+import asyncio
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+# Leaf frames that mean the event loop was idle, waiting for I/O
+_IDLE_LEAVES = {"select", "poll", "epoll", "kqueue", "_run_once"}
+
+# Unnamed tasks get unique "Task-123" names, group them together
+_DEFAULT_TASK_NAME = re.compile(r'Task-\d+')
+
+
+def _frame_label(code) -> str:
+    # Collapsed-stack frames are ';'-separated, so keep labels free of ';'
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(';', ':')
+
+
+def _thread_stack(frame) -> List[str]:
+    """Frames of a thread stack, outermost first"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _task_stack(task: asyncio.Task) -> List[str]:
+    """
+    Await chain of a suspended task, outermost first
+    
+    Task.get_stack() only returns the top coroutine frame, so follow
+    cr_await/gi_yieldfrom down to the innermost awaited coroutine.
+    """
+    labels = []
+    coro = task.get_coro()
+    while coro is not None:
+        code = getattr(coro, "cr_code", None) or getattr(coro, "gi_code", None)
+        if code is None:
+            break
+        labels.append(_frame_label(code))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return labels
+
+
+@dataclass
+class ProfileResult:
+    """Collapsed stacks plus a few headline numbers"""
+    seconds: float
+    thread_samples: int = 0
+    task_samples: int = 0
+    loop_busy_samples: int = 0
+    loop_samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+    loop_leaves: Counter = field(default_factory=Counter)
+    
+    @property
+    def loop_busy_percent(self) -> float:
+        return 100 * self.loop_busy_samples / self.loop_samples if self.loop_samples else 0.0
+    
+    def collapsed(self) -> str:
+        """Brendan Gregg collapsed-stack format, ready for flamegraph.pl or speedscope"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+    
+    def top_loop_frames(self, limit: int = 5) -> List[Tuple[str, int]]:
+        """Where the event loop thread spent its busy samples (self time)"""
+        return self.loop_leaves.most_common(limit)
+
+
+class SamplingProfiler:
+    """
+    Low-overhead statistical profiler for the running bot
+    
+    A background thread snapshots every thread's stack with
+    sys._current_frames() at `interval`; a coroutine on the event loop
+    snapshots the await chain of every pending asyncio task at
+    `task_interval`. Nothing is traced, so the cost is one stack walk per
+    sample and the bot keeps running normally.
+    """
+    
+    _running = threading.Lock()
+    
+    def __init__(self, interval: float = 0.01, task_interval: float = 0.05):
+        self.interval = interval
+        self.task_interval = task_interval
+    
+    @classmethod
+    def is_running(cls) -> bool:
+        return cls._running.locked()
+    
+    async def run(self, seconds: float) -> ProfileResult:
+        """Profile the process for `seconds` and return the samples"""
+        if not self._running.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        
+        try:
+            result = ProfileResult(seconds=seconds)
+            loop_thread = threading.get_ident()
+            stop = threading.Event()
+            thread_counts: Counter = Counter()
+            loop_leaves: Counter = Counter()
+            stats = {"samples": 0, "loop": 0, "busy": 0}
+            
+            sampler = threading.Thread(
+                target=self._sample_threads,
+                args=(loop_thread, stop, thread_counts, loop_leaves, stats),
+                name="sampling-profiler",
+                daemon=True
+            )
+            sampler.start()
+            task_sampler = asyncio.create_task(self._sample_tasks(result))
+            
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                stop.set()
+                task_sampler.cancel()
+                await asyncio.to_thread(sampler.join)
+            
+            result.stacks.update(thread_counts)
+            result.loop_leaves = loop_leaves
+            result.thread_samples = stats["samples"]
+            result.loop_samples = stats["loop"]
+            result.loop_busy_samples = stats["busy"]
+            return result
+        finally:
+            self._running.release()
+    
+    def _sample_threads(self, loop_thread: int, stop: threading.Event, counts: Counter,
+                        loop_leaves: Counter, stats: dict):
+        own_id = threading.get_ident()
+        while not stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_id:
+                    continue
+                stack = _thread_stack(frame)
+                if not stack:
+                    continue
+                
+                if ident == loop_thread:
+                    root = "event-loop"
+                    stats["loop"] += 1
+                    leaf_name = frame.f_code.co_name
+                    if leaf_name not in _IDLE_LEAVES:
+                        stats["busy"] += 1
+                        loop_leaves[stack[-1]] += 1
+                else:
+                    root = f"thread:{names.get(ident, ident)}"
+                
+                counts[";".join([root] + stack)] += 1
+            stats["samples"] += 1
+    
+    async def _sample_tasks(self, result: ProfileResult):
+        current = asyncio.current_task()
+        while True:
+            await asyncio.sleep(self.task_interval)
+            for task in asyncio.all_tasks():
+                if task is current or task.done():
+                    continue
+                stack = _task_stack(task)
+                if stack:
+                    name = task.get_name()
+                    root = "task" if _DEFAULT_TASK_NAME.fullmatch(name) else f"task:{name}"
+                    result.stacks[";".join([root] + stack)] += 1
+            result.task_samples += 1
@@ -0,0 +1,187 @@
+"""
+Probabilistic Sketches for Robo Nexus Bot
+Fixed-memory, mergeable HyperLogLog and Count-Min sketches for user analytics
+"""
+import hashlib
+import heapq
+import math
+import struct
+from array import array
+from typing import Dict, List, Tuple, Union
+
+Item = Union[int, str]
+
+_MASK64 = (1 << 64) - 1
+
+# Serialized sketches start with a magic tag so a blob can be loaded without knowing its type
+_HLL_MAGIC = b"HLL1"
+_HH_MAGIC = b"CMH1"
+
+
+def _hash64(item: Item) -> int:
+    """Stable 64-bit hash (built-in hash() is salted per process, so it can't be persisted)"""
+    return int.from_bytes(hashlib.blake2b(str(item).encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class HyperLogLog:
+    """
+    Cardinality estimator using 2^precision one-byte registers
+    
+    precision=12 is 4 KB with about 1.6% standard error. Merging takes the
+    register-wise maximum, so merging the same sketch twice is harmless.
+    """
+    
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+    
+    def add(self, item: Item):
+        x = _hash64(item)
+        index = x >> (64 - self.precision)
+        rest = (x << self.precision) & _MASK64
+        rank = min(64 - self.precision, 64 - rest.bit_length()) + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+    
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # Linear counting is more accurate for small sets
+        return int(round(estimate))
+    
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Fold another sketch into this one in place"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+    
+    @classmethod
+    def union(cls, sketches: List['HyperLogLog'], precision: int = 12) -> 'HyperLogLog':
+        result = cls(precision)
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+    
+    def to_bytes(self) -> bytes:
+        return _HLL_MAGIC + bytes([self.precision]) + bytes(self.registers)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'HyperLogLog':
+        if data[:4] != _HLL_MAGIC:
+            raise ValueError("Not a serialized HyperLogLog")
+        sketch = cls(data[4])
+        sketch.registers = bytearray(data[5:5 + sketch.m])
+        return sketch
+
+
+class HeavyHitters:
+    """
+    Count-Min sketch with a bounded top-K candidate set
+    
+    The sketch estimates any item's count from width * depth counters and
+    never undercounts. The k items with the highest estimates are kept as
+    candidates, so the most active users can be listed without storing a
+    count per user. Merging adds the counters and re-ranks the union of
+    both candidate sets, so deltas from several processes combine exactly.
+    """
+    
+    def __init__(self, k: int = 20, width: int = 2048, depth: int = 4):
+        self.k = k
+        self.width = width
+        self.depth = depth
+        self.table = [array('Q', bytes(8 * width)) for _ in range(depth)]
+        self.total = 0
+        self.candidates: Dict[str, int] = {}
+    
+    def _cells(self, item: Item) -> List[int]:
+        # Kirsch-Mitzenmacher: derive every row's column from two halves of one hash
+        x = _hash64(item)
+        h1, h2 = x & 0xFFFFFFFF, (x >> 32) | 1
+        return [(h1 + row * h2) % self.width for row in range(self.depth)]
+    
+    def add(self, item: Item, count: int = 1):
+        cells = self._cells(item)
+        for row, column in enumerate(cells):
+            self.table[row][column] += count
+        self.total += count
+        self._offer(str(item), min(self.table[row][column] for row, column in enumerate(cells)))
+    
+    def estimate(self, item: Item) -> int:
+        return min(self.table[row][column] for row, column in enumerate(self._cells(item)))
+    
+    def _offer(self, key: str, estimate: int):
+        if key in self.candidates or len(self.candidates) < self.k:
+            self.candidates[key] = estimate
+            return
+        
+        smallest = min(self.candidates, key=self.candidates.get)
+        if estimate > self.candidates[smallest]:
+            del self.candidates[smallest]
+            self.candidates[key] = estimate
+    
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        """Most frequent items as (item, estimated count), highest first"""
+        return heapq.nlargest(n, self.candidates.items(), key=lambda entry: entry[1])
+    
+    def merge(self, other: 'HeavyHitters') -> 'HeavyHitters':
+        """Add another sketch's counts into this one in place"""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge Count-Min sketches with different dimensions")
+        for row in range(self.depth):
+            mine, theirs = self.table[row], other.table[row]
+            for column in range(self.width):
+                if theirs[column]:
+                    mine[column] += theirs[column]
+        self.total += other.total
+        
+        keys = set(self.candidates) | set(other.candidates)
+        ranked = heapq.nlargest(self.k, ((key, self.estimate(key)) for key in keys), key=lambda entry: entry[1])
+        self.candidates = dict(ranked)
+        return self
+    
+    def to_bytes(self) -> bytes:
+        header = _HH_MAGIC + struct.pack('<IIIQI', self.k, self.width, self.depth, self.total, len(self.candidates))
+        candidates = b"".join(
+            struct.pack('<H', len(encoded)) + encoded
+            for encoded in (key.encode('utf-8') for key in self.candidates)
+        )
+        return header + candidates + b"".join(row.tobytes() for row in self.table)
+    
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'HeavyHitters':
+        if data[:4] != _HH_MAGIC:
+            raise ValueError("Not a serialized HeavyHitters sketch")
+        k, width, depth, total, candidate_count = struct.unpack_from('<IIIQI', data, 4)
+        sketch = cls(k, width, depth)
+        sketch.total = total
+        
+        offset = 4 + struct.calcsize('<IIIQI')
+        keys = []
+        for _ in range(candidate_count):
+            (length,) = struct.unpack_from('<H', data, offset)
+            keys.append(data[offset + 2:offset + 2 + length].decode('utf-8'))
+            offset += 2 + length
+        
+        row_bytes = 8 * width
+        for row in range(depth):
+            sketch.table[row] = array('Q', data[offset:offset + row_bytes])
+            offset += row_bytes
+        sketch.candidates = {key: sketch.estimate(key) for key in keys}
+        return sketch
+
+
+def load_sketch(data: bytes) -> Union[HyperLogLog, HeavyHitters]:
+    """Deserialize a sketch of either type from its tagged bytes"""
+    if data[:4] == _HLL_MAGIC:
+        return HyperLogLog.from_bytes(data)
+    if data[:4] == _HH_MAGIC:
+        return HeavyHitters.from_bytes(data)
+    raise ValueError("Unknown sketch format")
@@ -11,6 +11,7 @@ import json
 import os
 from datetime import datetime, timedelta
 from typing import Optional
+from metrics_registry import timed_task
 from google.analytics.data_v1beta import BetaAnalyticsDataClient
 from google.analytics.data_v1beta.types import (
     DateRange,
@@ -284,6 +285,7 @@ class StatsChannel(commands.Cog):
 
     
     @tasks.loop(minutes=1)  # Update every 1 minute
+    @timed_task("update_stats_channels")
     async def update_stats_channels(self):
         """Update all stats channels with current data"""
         try:
@@ -1,7 +1,7 @@
 import requests
 import json
 import logging
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -28,16 +28,7 @@ class SupabaseAPI:
     # Settings methods
     def get_setting(self, key: str) -> Optional[str]:
         try:
-            response = requests.get(
-                f"{self.url}/rest/v1/bot_settings?key=eq.{key}",
-                headers=self.headers,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data:
-                    return data[0]['value']
+            return self.read_setting(key)
         except requests.exceptions.Timeout:
             logger.error(f"Timeout getting setting {key}")
         except Exception as e:
@@ -47,6 +38,17 @@ class SupabaseAPI:
         # Let the calling code handle missing settings
         return None
     
+    def read_setting(self, key: str) -> Optional[str]:
+        """Like get_setting, but raises on failure so None only ever means the setting is not set"""
+        response = requests.get(
+            f"{self.url}/rest/v1/bot_settings?key=eq.{key}",
+            headers=self.headers,
+            timeout=10
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data[0]['value'] if data else None
+    
     def set_setting(self, key: str, value: str) -> bool:
         try:
             # Try to update first
@@ -294,6 +296,118 @@ class SupabaseAPI:
             logger.error(f"💥 Error registering birthday for {user_id}: {e}")
             return False
     
+    def bulk_upsert_birthdays(self, rows: List[Dict[str, str]], chunk_size: int = 500) -> int:
+        """
+        Insert or update many birthdays with one request per chunk
+        
+        Args:
+            rows: Dicts with 'user_id' and 'birthday' (MM-DD) keys, unique by user_id
+            chunk_size: Rows sent per request
+        
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        headers = {**self.headers, "Prefer": "resolution=merge-duplicates,return=minimal"}
+        
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                response = requests.post(
+                    f"{self.url}/rest/v1/birthdays?on_conflict=user_id",
+                    headers=headers,
+                    json=chunk,
+                    timeout=30
+                )
+                
+                if response.status_code in [200, 201, 204]:
+                    written += len(chunk)
+                else:
+                    logger.error(f"❌ Failed to upsert birthday chunk: {response.status_code} - {response.text}")
+            except requests.exceptions.Timeout:
+                logger.error(f"⏰ Timeout upserting birthday chunk of {len(chunk)} rows")
+            except Exception as e:
+                logger.error(f"💥 Error upserting birthday chunk: {e}")
+        
+        return written
+    
+    def _select_for_users(self, table: str, columns: str, user_ids: List[str], chunk_size: int = 100,
+                          strict: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """
+        Read rows for many users with user_id=in.(...) filters, one request per chunk
+        
+        Failed chunks are logged and skipped, or with strict=True make the whole read return None
+        """
+        rows = []
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            try:
+                response = requests.get(
+                    f"{self.url}/rest/v1/{table}?select={columns}&user_id=in.({','.join(chunk)})",
+                    headers=self.headers,
+                    timeout=10
+                )
+                
+                if response.status_code == 200:
+                    rows.extend(response.json())
+                    continue
+                logger.error(f"Failed to read {table} for {len(chunk)} users: {response.status_code} - {response.text}")
+            except requests.exceptions.Timeout:
+                logger.error(f"Timeout reading {table} for {len(chunk)} users")
+            except Exception as e:
+                logger.error(f"Error reading {table} for {len(chunk)} users: {e}")
+            if strict:
+                return None
+        
+        return rows
+    
+    def get_user_profiles_for_users(self, user_ids: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """Get full user_profiles rows for many users, or None if any part of the read failed"""
+        return self._select_for_users("user_profiles", "*", user_ids, strict=True)
+    
+    def bulk_upsert_user_profiles(self, rows: List[Dict[str, Any]], chunk_size: int = 500) -> int:
+        """
+        Insert or update many user profiles with one request per chunk
+        
+        Args:
+            rows: Profile dicts with the same keys, unique by user_id
+            chunk_size: Rows sent per request
+        
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        headers = {**self.headers, "Prefer": "resolution=merge-duplicates,return=minimal"}
+        
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            try:
+                response = requests.post(
+                    f"{self.url}/rest/v1/user_profiles?on_conflict=user_id",
+                    headers=headers,
+                    json=chunk,
+                    timeout=30
+                )
+                
+                if response.status_code in [200, 201, 204]:
+                    written += len(chunk)
+                else:
+                    logger.error(f"❌ Failed to upsert user profile chunk: {response.status_code} - {response.text}")
+            except requests.exceptions.Timeout:
+                logger.error(f"⏰ Timeout upserting user profile chunk of {len(chunk)} rows")
+            except Exception as e:
+                logger.error(f"💥 Error upserting user profile chunk: {e}")
+        
+        return written
+    
+    def get_birthdays_for_users(self, user_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get birthdays table rows for many users"""
+        return self._select_for_users("birthdays", "user_id,birthday", user_ids)
+    
+    def get_profile_birthdays_for_users(self, user_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get the birthday column of user_profiles for many users"""
+        return self._select_for_users("user_profiles", "user_id,birthday", user_ids)
+    
     def get_birthday(self, user_id: str) -> Optional[str]:
         try:
             response = requests.get(
@@ -406,6 +520,76 @@ class SupabaseAPI:
         
         return []
     
+    def get_user_profiles_page(self, after_user_id: Optional[str] = None, limit: int = 500) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get one page of user profiles ordered by user_id (keyset pagination)
+        
+        Args:
+            after_user_id: Last user_id of the previous page, None for the first page
+            limit: Page size
+        
+        Returns:
+            The page (empty when there are no more profiles), or None if the request failed
+        """
+        return self.get_table_page('user_profiles', ('user_id',), (after_user_id,) if after_user_id else None, limit)
+    
+    @staticmethod
+    def _filter_value(value: Any) -> str:
+        """Quote a value for a PostgREST logic filter (names may contain commas or parentheses)"""
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+        return f'"{escaped}"'
+    
+    def get_table_page(self, table: str, key: Tuple[str, ...], after: Optional[Tuple[Any, ...]] = None,
+                       limit: int = 500, filters: Optional[Dict[str, str]] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get one page of any table ordered by a unique key (keyset pagination)
+        
+        Each page starts strictly after the previous page's last key, so deep
+        pages cost the same as the first one (unlike offset paging).
+        
+        Args:
+            table: Table name
+            key: Columns that uniquely identify a row, e.g. ('team_name', 'user_id')
+            after: The previous page's last key values, None for the first page
+            limit: Page size
+            filters: Extra PostgREST filters, e.g. {'guild_id': 'eq.123'}
+        
+        Returns:
+            The page (empty when there are no more rows), or None if the request failed
+        """
+        params = dict(filters or {})
+        params['order'] = ','.join(f"{column}.asc" for column in key)
+        params['limit'] = str(limit)
+        if after:
+            if len(key) == 1:
+                params[key[0]] = f"gt.{after[0]}"
+            else:
+                # (a, b) > (x, y)  =>  a > x OR (a = x AND b > y)
+                clauses = []
+                for i, column in enumerate(key):
+                    equal = [f"{key[j]}.eq.{self._filter_value(after[j])}" for j in range(i)]
+                    greater = f"{column}.gt.{self._filter_value(after[i])}"
+                    clauses.append(f"and({','.join(equal + [greater])})" if equal else greater)
+                params['or'] = f"({','.join(clauses)})"
+        
+        try:
+            response = requests.get(
+                f"{self.url}/rest/v1/{table}",
+                headers=self.headers,
+                params=params,
+                timeout=10
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            logger.error(f"Failed to get {table} page after {after}: {response.status_code} - {response.text}")
+        except requests.exceptions.Timeout:
+            logger.error(f"Timeout getting {table} page after {after}")
+        except Exception as e:
+            logger.error(f"Error getting {table} page after {after}: {e}")
+        
+        return None
+    
     # RACE CONDITION FIX FOR PLACE_BID
     def place_bid(self, auction_id: int, bidder_id: str, bidder_name: str, amount: float) -> bool:
         try:
@@ -0,0 +1,232 @@
+"""
+Verification Statistics for Robo Nexus Bot
+Keeps per-guild verification counts current from member events and profile writes
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Members with one of these roles finished self-role verification
+SELF_ROLE_NAMES = ('verified', 'member')
+RECENT_VERIFIED = 10
+
+
+@dataclass
+class ProfileStatus:
+    status: str
+    stage: str
+    username: str
+
+
+@dataclass
+class GuildVerificationCounts:
+    """Live counts for one guild, non-bot members only"""
+    humans: int = 0
+    verified: int = 0
+    self_role: int = 0
+    # Pending member ID -> verification stage, oldest first
+    pending: Dict[int, str] = field(default_factory=dict)
+    recent_verified: deque = field(default_factory=lambda: deque(maxlen=RECENT_VERIFIED))
+    reconciled_at: float = 0.0
+    
+    @property
+    def manual(self) -> int:
+        return self.verified - self.self_role
+    
+    @property
+    def unverified(self) -> int:
+        return self.humans - self.verified - len(self.pending)
+
+
+class VerificationStats:
+    """
+    Incremental verification statistics
+    
+    A full reconcile reads every profile once and scans each guild's
+    members. After that, joins, leaves, role changes and profile writes
+    adjust the counts by one member each, so reading them is O(1).
+    Events for a guild that has not been reconciled yet are ignored; the
+    first reconcile picks them up.
+    """
+    
+    def __init__(self):
+        self._profiles: Dict[int, ProfileStatus] = {}
+        self._counts: Dict[int, GuildVerificationCounts] = {}
+        self._guilds: Dict[int, discord.Guild] = {}
+        # Profile writes that land while a reconcile is reading the table
+        self._saved_during_reconcile: Optional[Dict[int, Dict[str, Any]]] = None
+        self._reconcile_lock = asyncio.Lock()
+    
+    def get(self, guild_id: int) -> Optional[GuildVerificationCounts]:
+        """Current counts for a guild, or None before its first reconcile"""
+        return self._counts.get(guild_id)
+    
+    @staticmethod
+    def _has_self_role(member: discord.Member) -> bool:
+        return any(role.name.lower() in SELF_ROLE_NAMES for role in member.roles)
+    
+    def _apply(self, counts: GuildVerificationCounts, member: discord.Member, sign: int):
+        """Add (sign=1) or remove (sign=-1) one member's contribution"""
+        if member.bot:
+            return
+        counts.humans += sign
+        profile = self._profiles.get(member.id)
+        if profile is None:
+            return
+        if profile.status == 'verified':
+            counts.verified += sign
+            if self._has_self_role(member):
+                counts.self_role += sign
+        elif profile.status == 'pending':
+            if sign > 0:
+                counts.pending[member.id] = profile.stage
+            else:
+                counts.pending.pop(member.id, None)
+    
+    @staticmethod
+    def _status_from(row: Dict[str, Any], existing: Optional[ProfileStatus] = None) -> ProfileStatus:
+        # Profiles written before statuses existed count as verified, as they always have
+        return ProfileStatus(
+            status=row.get('verification_status') or (existing.status if existing else 'verified'),
+            stage=row.get('verification_stage') or (existing.stage if existing else 'complete'),
+            username=row.get('username') or (existing.username if existing else '')
+        )
+    
+    # Event hooks
+    
+    def on_member_join(self, member: discord.Member):
+        counts = self._counts.get(member.guild.id)
+        if counts:
+            self._apply(counts, member, 1)
+    
+    def on_member_remove(self, member: discord.Member):
+        counts = self._counts.get(member.guild.id)
+        if counts:
+            self._apply(counts, member, -1)
+    
+    def on_member_update(self, before: discord.Member, after: discord.Member):
+        counts = self._counts.get(after.guild.id)
+        if counts and before.roles != after.roles:
+            self._apply(counts, before, -1)
+            self._apply(counts, after, 1)
+    
+    def on_guild_remove(self, guild: discord.Guild):
+        self._counts.pop(guild.id, None)
+        self._guilds.pop(guild.id, None)
+    
+    def on_profile_saved(self, user_id: int, fields: Dict[str, Any]):
+        """Record a successful profile create/update (fields may be partial)"""
+        if self._saved_during_reconcile is not None:
+            self._saved_during_reconcile.setdefault(user_id, {}).update(fields)
+        
+        members = [(counts, self._guilds[guild_id].get_member(user_id))
+                   for guild_id, counts in self._counts.items()]
+        members = [(counts, member) for counts, member in members if member]
+        
+        for counts, member in members:
+            self._apply(counts, member, -1)
+        previous = self._profiles.get(user_id)
+        self._profiles[user_id] = self._status_from(fields, previous)
+        for counts, member in members:
+            self._apply(counts, member, 1)
+            if self._profiles[user_id].status == 'verified' and (previous is None or previous.status != 'verified'):
+                if user_id in counts.recent_verified:
+                    counts.recent_verified.remove(user_id)
+                counts.recent_verified.appendleft(user_id)
+    
+    # Full reconcile
+    
+    async def reconcile(self, db, guilds: List[discord.Guild]) -> bool:
+        """
+        Rebuild everything from the profiles table and the member caches
+        
+        Counts are rebuilt for the given guilds and for every guild reconciled
+        before, since they all depend on the profiles read here.
+        
+        Returns:
+            False if the profiles could not be read (the old counts are kept)
+        """
+        async with self._reconcile_lock:
+            return await self._reconcile(db, guilds)
+    
+    async def _reconcile(self, db, guilds: List[discord.Guild]) -> bool:
+        self._saved_during_reconcile = {}
+        try:
+            rows = []
+            after = None
+            while True:
+                page = await db.get_user_profiles_page(after)
+                if page is None:
+                    logger.error("Verification stats reconcile failed: could not read user profiles")
+                    return False
+                if not page:
+                    break
+                rows.extend(page)
+                after = page[-1].get('user_id')
+            
+            profiles: Dict[int, ProfileStatus] = {}
+            for row in rows:
+                try:
+                    profiles[int(row['user_id'])] = self._status_from(row)
+                except (KeyError, TypeError, ValueError):
+                    continue
+            for user_id, fields in self._saved_during_reconcile.items():
+                profiles[user_id] = self._status_from(fields, profiles.get(user_id))
+            self._profiles = profiles
+        finally:
+            self._saved_during_reconcile = None
+        
+        # Newest verified profiles first, to seed the "recently verified" lists
+        rows.sort(key=lambda row: row.get('updated_at') or '', reverse=True)
+        
+        # Every guild's counts were built from the profiles just replaced, so rebuild
+        # the ones already held along with the ones asked for
+        targets = dict(self._guilds)
+        targets.update((guild.id, guild) for guild in guilds)
+        
+        now = time.time()
+        for guild in targets.values():
+            counts = GuildVerificationCounts(reconciled_at=now)
+            for member in guild.members:
+                self._apply(counts, member, 1)
+            for row in rows:
+                if len(counts.recent_verified) >= RECENT_VERIFIED:
+                    break
+                user_id = int(row['user_id']) if str(row.get('user_id', '')).isdigit() else None
+                if user_id and self._profiles[user_id].status == 'verified' and guild.get_member(user_id):
+                    counts.recent_verified.append(user_id)
+            self._counts[guild.id] = counts
+            self._guilds[guild.id] = guild
+        
+        logger.info(f"Reconciled verification stats: {len(self._profiles)} profiles across {len(targets)} guild(s)")
+        return True
+    
+    def verified_members(self, guild: discord.Guild) -> List[discord.Member]:
+        """Recently verified members still in the guild, newest first"""
+        counts = self._counts.get(guild.id)
+        if not counts:
+            return []
+        members = [guild.get_member(user_id) for user_id in counts.recent_verified]
+        return [m for m in members if m and getattr(self._profiles.get(m.id), 'status', None) == 'verified']
+    
+    def username(self, user_id: int) -> str:
+        profile = self._profiles.get(user_id)
+        return profile.username if profile else ''
+
+
+# Global instance
+_verification_stats = None
+
+def get_verification_stats() -> VerificationStats:
+    """Get the global verification stats aggregator"""
+    global _verification_stats
+    if _verification_stats is None:
+        _verification_stats = VerificationStats()
+    return _verification_stats
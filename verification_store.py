@@ -0,0 +1,174 @@
+"""
+Verification Store for Robo Nexus Bot
+Write-through SQLite store for half-finished onboarding, with TTL eviction
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_verifications (
+    user_id INTEGER PRIMARY KEY,
+    guild_id INTEGER,
+    stage TEXT NOT NULL,
+    profile TEXT NOT NULL DEFAULT '{}',
+    joined_at TEXT,
+    updated_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_pending_verifications_updated ON pending_verifications (updated_at);
+"""
+
+
+@dataclass
+class VerificationState:
+    """Where a member is in onboarding; IDs and plain values only, no discord objects"""
+    user_id: int
+    guild_id: Optional[int]
+    stage: str
+    profile: Dict[str, Any] = field(default_factory=dict)
+    joined_at: Optional[str] = None
+    updated_at: float = field(default_factory=time.time)
+
+
+class VerificationStore:
+    """
+    Pending verifications kept in memory and written through to SQLite
+    
+    Every change is written to disk before the call returns, so a restart
+    restores everyone mid-onboarding. Entries not touched for `ttl`
+    seconds are treated as abandoned: lookups ignore them and sweep()
+    deletes them. MAX_PENDING caps memory during join waves by evicting the
+    least recently active entries.
+    """
+    
+    MAX_PENDING = 5000
+    
+    def __init__(self, path: str = "verification.db", ttl: float = 72 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        
+        self._states: Dict[int, VerificationState] = {}
+        self.load()
+    
+    def load(self) -> int:
+        """Restore unexpired entries from disk, returns how many were restored"""
+        self.sweep()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT user_id, guild_id, stage, profile, joined_at, updated_at FROM pending_verifications "
+                "ORDER BY updated_at DESC LIMIT ?",
+                (self.MAX_PENDING,)
+            ).fetchall()
+        
+        for user_id, guild_id, stage, profile, joined_at, updated_at in rows:
+            try:
+                profile_data = json.loads(profile) if profile else {}
+            except ValueError:
+                profile_data = {}
+            self._states[user_id] = VerificationState(user_id, guild_id, stage, profile_data, joined_at, updated_at)
+        
+        if rows:
+            logger.info(f"Restored {len(rows)} pending verifications")
+        return len(rows)
+    
+    def close(self):
+        try:
+            with self.lock:
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self.conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error closing verification store: {e}")
+    
+    def _expired(self, state: VerificationState, now: float = None) -> bool:
+        return (now or time.time()) - state.updated_at > self.ttl
+    
+    def _write(self, state: VerificationState):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO pending_verifications (user_id, guild_id, stage, profile, joined_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(user_id) DO UPDATE SET "
+                "guild_id = excluded.guild_id, stage = excluded.stage, profile = excluded.profile, "
+                "joined_at = excluded.joined_at, updated_at = excluded.updated_at",
+                (state.user_id, state.guild_id, state.stage, json.dumps(state.profile),
+                 state.joined_at, state.updated_at)
+            )
+    
+    def __contains__(self, user_id: int) -> bool:
+        return self.get(user_id) is not None
+    
+    def __len__(self) -> int:
+        now = time.time()
+        return sum(1 for state in self._states.values() if not self._expired(state, now))
+    
+    def get(self, user_id: int) -> Optional[VerificationState]:
+        """Get a member's state, or None if they are not verifying (or abandoned it)"""
+        state = self._states.get(user_id)
+        if state is None or self._expired(state):
+            return None
+        return state
+    
+    def start(self, user_id: int, guild_id: Optional[int], stage: str, joined_at: str = None) -> VerificationState:
+        """Begin (or restart) onboarding for a member"""
+        if user_id not in self._states and len(self._states) >= self.MAX_PENDING:
+            oldest = min(self._states.values(), key=lambda s: s.updated_at)
+            self.remove(oldest.user_id)
+            logger.warning(f"Verification store full, evicted least active user {oldest.user_id}")
+        
+        state = VerificationState(user_id, guild_id, stage, {}, joined_at)
+        self._states[user_id] = state
+        self._write(state)
+        return state
+    
+    def update(self, user_id: int, stage: str = None, profile: Dict[str, Any] = None) -> Optional[VerificationState]:
+        """
+        Record progress for a member
+        
+        Args:
+            user_id: Member ID
+            stage: New stage, if it changed
+            profile: Profile fields collected in this step (name, class, birthday, ...)
+        """
+        state = self.get(user_id)
+        if state is None:
+            return None
+        
+        if stage is not None:
+            state.stage = stage
+        state.profile.update(profile or {})
+        state.updated_at = time.time()
+        self._write(state)
+        return state
+    
+    def remove(self, user_id: int) -> bool:
+        """Forget a member (completed, left, or verified manually)"""
+        existed = self._states.pop(user_id, None) is not None
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM pending_verifications WHERE user_id = ?", (user_id,))
+        return existed
+    
+    def sweep(self) -> int:
+        """Delete entries idle longer than the TTL, returns how many were removed"""
+        cutoff = time.time() - self.ttl
+        for user_id in [uid for uid, state in self._states.items() if state.updated_at < cutoff]:
+            del self._states[user_id]
+        
+        with self.lock, self.conn:
+            removed = self.conn.execute(
+                "DELETE FROM pending_verifications WHERE updated_at < ?", (cutoff,)
+            ).rowcount
+        if removed:
+            logger.info(f"Swept {removed} abandoned verifications")
+        return removed
@@ -6,22 +6,52 @@ NOW USING POSTGRESQL - NO MORE JSON FILES
 """
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 import logging
 import re
 import asyncio
-from typing import Optional, Dict
+import csv
+import io
+import time
+from typing import Optional, Dict, List, Tuple
 import json
+from config import Config
+import input_validators
+from metrics_registry import get_metrics_registry, timed_task
+from onboarding_queue import OnboardingQueue
+from profile_export import ProfileExporter
+from profile_import import ImportPlan, ProfileChange, describe_change, plan_import, read_records, upsert_payload, validate_records
+from profile_index import get_profile_index
+from role_queue import RoleMutation, get_role_queue
+from role_registry import get_role_registry
+from verification_stats import get_verification_stats
+from verification_store import VerificationStore
 
 logger = logging.getLogger(__name__)
 
 class WelcomeSystem(commands.Cog):
     """Welcome system for new member onboarding with profile collection"""
     
+    # Bulk profile import limits
+    IMPORT_CHUNK_SIZE = 500
+    IMPORT_MAX_BYTES = 2 * 1024 * 1024
+    IMPORT_MAX_ROWS_SHOWN = 15
+    
+    # Self-roles channel cache: re-read after the TTL (picks up changes made outside
+    # the bot, and caches "not set" the same way), failed reads retried after
+    # RETRY_MIN doubling up to RETRY_MAX seconds
+    SELF_ROLES_CHANNEL_TTL = 300
+    SELF_ROLES_RETRY_MIN = 5
+    SELF_ROLES_RETRY_MAX = 60
+    
     def __init__(self, bot):
         self.bot = bot
         self.db = get_async_supabase()
-        self.pending_users = {}  # Store users waiting for verification (temporary, in memory)
+        # Members mid-onboarding (IDs, stage and partial profile), persisted across restarts
+        self.verification_store = VerificationStore(
+            Config.VERIFICATION_DB_PATH,
+            ttl=Config.VERIFICATION_TTL_HOURS * 3600
+        )
         
         # Class roles mapping
         self.class_roles = {
@@ -37,8 +67,47 @@ class WelcomeSystem(commands.Cog):
         self.STAGE_LINKS = "links"
         self.STAGE_COMPLETE = "complete"
         
+        # Cached self-roles channel setting, so on_message can filter without a database read.
+        # The last value read stays in use while a refresh (one at a time) is in flight or failing.
+        self._self_roles_channel_id: Optional[int] = None
+        self._self_roles_channel_expires = 0.0  # monotonic
+        self._self_roles_refresh: Optional[asyncio.Task] = None
+        self._self_roles_retry_at = 0.0
+        self._self_roles_retry_delay = self.SELF_ROLES_RETRY_MIN
+        self._self_roles_retry_handle: Optional[asyncio.TimerHandle] = None
+        self._self_roles_unset_logged = False
+        self.messages_counter = get_metrics_registry().counter(
+            "robonexus_verification_messages", "Messages seen by the verification pre-filter", ("result",)
+        )
+        
+        self.onboarding_queue = OnboardingQueue(self)
+        self.sweep_verifications.start()
+        
         logger.info("Welcome system initialized with PostgreSQL")
     
+    async def cog_load(self):
+        """Warm the self-roles channel cache used by the message pre-filter"""
+        await self.get_self_roles_channel_id()
+    
+    def cog_unload(self):
+        """Stop the sweeper and close the verification store"""
+        self.sweep_verifications.cancel()
+        if self._self_roles_retry_handle:
+            self._self_roles_retry_handle.cancel()
+        if self._self_roles_refresh:
+            self._self_roles_refresh.cancel()
+        self.onboarding_queue.stop()
+        self.verification_store.close()
+    
+    @tasks.loop(minutes=15)
+    @timed_task("sweep_verifications")
+    async def sweep_verifications(self):
+        """Drop verifications abandoned for longer than the TTL"""
+        try:
+            self.verification_store.sweep()
+        except Exception as e:
+            logger.error(f"Error sweeping verifications: {e}")
+    
     async def get_welcome_channel_id(self) -> Optional[int]:
         """Get welcome channel ID from PostgreSQL"""
         try:
@@ -66,21 +135,77 @@ class WelcomeSystem(commands.Cog):
             self.db = get_async_supabase()
             await self.db.set_setting('welcome_channel_id', str(channel_id))
     
+    @property
+    def _self_roles_channel_fresh(self) -> bool:
+        return time.monotonic() < self._self_roles_channel_expires
+    
     async def get_self_roles_channel_id(self) -> Optional[int]:
-        """Get self-roles channel ID from PostgreSQL"""
+        """Get self-roles channel ID from PostgreSQL, cached for SELF_ROLES_CHANNEL_TTL"""
+        if not self._self_roles_channel_fresh:
+            refresh = self._refresh_self_roles_channel()
+            if refresh:
+                # Shielded: a cancelled caller must not cancel the read other callers share
+                await asyncio.shield(refresh)
+        return self._self_roles_channel_id
+    
+    def _refresh_self_roles_channel(self) -> Optional[asyncio.Task]:
+        """
+        Start a re-read of the setting, or return the one already running
+        
+        Returns:
+            None while backing off after a failed read (the scheduled retry will read it)
+        """
+        if self._self_roles_refresh and not self._self_roles_refresh.done():
+            return self._self_roles_refresh
+        if time.monotonic() < self._self_roles_retry_at:
+            return None
+        self._self_roles_refresh = asyncio.create_task(self._read_self_roles_channel())
+        return self._self_roles_refresh
+    
+    def _retry_self_roles_channel(self):
+        self._self_roles_retry_handle = None
+        self._self_roles_retry_at = 0.0
+        self._refresh_self_roles_channel()
+    
+    async def _read_self_roles_channel(self):
         try:
-            channel_id = await self.db.get_setting('self_roles_channel_id')
-            return int(channel_id) if channel_id else None
+            channel_id = await self.db.read_setting('self_roles_channel_id')
         except Exception as e:
             logger.error(f"Error getting self-roles channel ID: {e}")
             # Reconnect and retry
             # from async_supabase_wrapper import get_async_supabase
             self.db = get_async_supabase()
             try:
-                channel_id = await self.db.get_setting('self_roles_channel_id')
-                return int(channel_id) if channel_id else None
-            except:
-                return None
+                channel_id = await self.db.read_setting('self_roles_channel_id')
+            except Exception:
+                # Keep the last value and retry on a backoff
+                delay = self._self_roles_retry_delay
+                self._self_roles_retry_at = time.monotonic() + delay
+                self._self_roles_retry_delay = min(delay * 2, self.SELF_ROLES_RETRY_MAX)
+                if self._self_roles_retry_handle:
+                    self._self_roles_retry_handle.cancel()
+                self._self_roles_retry_handle = asyncio.get_running_loop().call_later(delay, self._retry_self_roles_channel)
+                logger.warning(f"Could not read the self-roles channel setting, retrying in {delay}s")
+                return
+        
+        if channel_id and str(channel_id).isdigit():
+            self._cache_self_roles_channel(int(channel_id))
+            return
+        
+        # Not configured is an answer too: cache it for the TTL like a channel ID
+        if self._self_roles_channel_id is not None or not self._self_roles_unset_logged:
+            logger.debug("Self-roles channel is not set, only DMs count as verification answers")
+            self._self_roles_unset_logged = True
+        self._cache_self_roles_channel(None)
+    
+    def _cache_self_roles_channel(self, channel_id: Optional[int]):
+        self._self_roles_channel_id = channel_id
+        self._self_roles_channel_expires = time.monotonic() + self.SELF_ROLES_CHANNEL_TTL
+        self._self_roles_retry_at = 0.0
+        self._self_roles_retry_delay = self.SELF_ROLES_RETRY_MIN
+        if self._self_roles_retry_handle:
+            self._self_roles_retry_handle.cancel()
+            self._self_roles_retry_handle = None
     
     async def set_self_roles_channel_id(self, channel_id: int):
         """Set self-roles channel ID in PostgreSQL"""
@@ -92,6 +217,7 @@ class WelcomeSystem(commands.Cog):
             # from async_supabase_wrapper import get_async_supabase
             self.db = get_async_supabase()
             await self.db.set_setting('self_roles_channel_id', str(channel_id))
+        self._cache_self_roles_channel(channel_id)
     
     async def get_user_profile(self, user_id: int) -> Optional[Dict]:
         """Get user profile from PostgreSQL"""
@@ -109,7 +235,10 @@ class WelcomeSystem(commands.Cog):
             profile_data['social_links'] = json.dumps(profile_data['social_links'])
         
         profile_data['user_id'] = str(user_id)
-        return await self.db.create_user_profile(profile_data)
+        saved = await self.db.create_user_profile(profile_data)
+        if saved:
+            self._profile_written(user_id, profile_data)
+        return saved
     
     async def update_user_profile(self, user_id: int, updates: Dict) -> bool:
         """Update user profile in PostgreSQL"""
@@ -117,26 +246,19 @@ class WelcomeSystem(commands.Cog):
         if 'social_links' in updates and isinstance(updates['social_links'], dict):
             updates['social_links'] = json.dumps(updates['social_links'])
         
-        return await self.db.update_user_profile(str(user_id), updates)
+        updated = await self.db.update_user_profile(str(user_id), updates)
+        if updated:
+            self._profile_written(user_id, updates)
+        return updated
+    
+    def _profile_written(self, user_id: int, fields: Dict):
+        """Keep the in-memory views of the profiles table current after a write"""
+        get_verification_stats().on_profile_saved(user_id, fields)
+        get_profile_index().upsert(user_id, fields)
     
     def validate_email(self, email: str) -> bool:
-        """Validate Gmail address"""
-        if not email:
-            return False
-        
-        # Allow skip keywords
-        if email.lower().strip() in ['none', 'no', 'skip', 'n/a', 'na']:
-            return True
-        
-        email = email.lower().strip()
-        
-        # Check if it's a Gmail address
-        if not email.endswith('@gmail.com'):
-            return False
-        
-        # Basic email format validation
-        pattern = r'^[a-zA-Z0-9._%+-]+@gmail\.com$'
-        return bool(re.match(pattern, email))
+        """Validate Gmail address (skip keywords are accepted)"""
+        return input_validators.validate_email(email)
     
     def validate_phone(self, phone: str) -> Optional[str]:
         """
@@ -144,249 +266,98 @@ class WelcomeSystem(commands.Cog):
         Returns formatted number or None if invalid
         Accepts skip keywords
         """
-        if not phone:
-            return None
-        
-        phone = phone.strip()
-        
-        # Allow skip keywords
-        if phone.lower() in ['none', 'no', 'skip', 'n/a', 'na']:
-            return None
-        
-        # Remove common formatting characters
-        cleaned = re.sub(r'[\s\-\(\)\+]', '', phone)
-        
-        # Check if it's all digits (after removing +)
-        if cleaned.startswith('+'):
-            cleaned = cleaned[1:]
-        
-        if not cleaned.isdigit():
-            return None
-        
-        # Indian phone numbers: 10 digits or with country code (91)
-        if len(cleaned) == 10:
-            return f"+91{cleaned}"
-        elif len(cleaned) == 12 and cleaned.startswith('91'):
-            return f"+{cleaned}"
-        elif len(cleaned) >= 10:
-            # International or other format
-            return f"+{cleaned}"
-        
-        return None
+        return input_validators.validate_phone(phone)
     
     def validate_social_links(self, links_text: str) -> Dict[str, str]:
         """
         Extract and validate social media links
         Returns dict with platform names as keys and URLs as values
         """
-        links = {}
-        
-        if not links_text or links_text.lower().strip() in ['none', 'no', 'skip', 'n/a', 'na']:
-            return links
-        
-        # Split by lines or commas
-        lines = re.split(r'[,\n]', links_text)
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Remove common prefixes like "GitHub:", "LinkedIn:", "Website:", etc.
-            line = re.sub(r'^(github|linkedin|youtube|spotify|website|portfolio):\s*', '', line, flags=re.IGNORECASE)
-            
-            # GitHub
-            if 'github.com' in line.lower():
-                links['github'] = line if line.startswith('http') else f"https://{line}"
-            
-            # LinkedIn
-            elif 'linkedin.com' in line.lower():
-                links['linkedin'] = line if line.startswith('http') else f"https://{line}"
-            
-            # YouTube
-            elif 'youtube.com' in line.lower() or 'youtu.be' in line.lower():
-                links['youtube'] = line if line.startswith('http') else f"https://{line}"
-            
-            # Spotify
-            elif 'spotify.com' in line.lower() or 'open.spotify.com' in line.lower():
-                links['spotify'] = line if line.startswith('http') else f"https://{line}"
-            
-            # Portfolio/Website detection (improved with more domains)
-            elif any(keyword in line.lower() for keyword in ['portfolio', 'website', 'site']) or \
-                 any(domain in line.lower() for domain in ['.dev', '.com', '.org', '.net', '.io', '.me', '.co', '.github.io', '.netlify.app', '.vercel.app', '.herokuapp.com', '.firebase.app', '.pages.dev']) or \
-                 line.startswith('http'):
-                
-                # This is likely a website/portfolio
-                url = line if line.startswith('http') else f"https://{line}"
-                
-                # Use 'website' as the key for portfolio/personal websites
-                website_key = 'website'
-                counter = 1
-                while website_key in links:
-                    counter += 1
-                    website_key = f'website{counter}'
-                
-                links[website_key] = url
-        
-        return links
+        return input_validators.validate_social_links(links_text)
     
     def extract_class_from_text(self, text: str) -> Optional[str]:
         """
         Extract class number from user input
         Supports: "6", "class 6", "grade 6", "6th", "sixth", etc.
         """
-        if not text:
-            return None
-        
-        text = text.lower().strip()
-        
-        # Direct number match
-        if text in self.class_roles:
-            return text
-        
-        # Number with ordinal (6th, 7th, etc.)
-        ordinal_match = re.search(r'(\d+)(?:st|nd|rd|th)', text)
-        if ordinal_match:
-            class_num = ordinal_match.group(1)
-            if class_num in self.class_roles:
-                return class_num
-        
-        # Word forms (sixth, seventh, etc.)
-        word_to_number = {
-            "sixth": "6", "six": "6",
-            "seventh": "7", "seven": "7", 
-            "eighth": "8", "eight": "8",
-            "ninth": "9", "nine": "9",
-            "tenth": "10", "ten": "10",
-            "eleventh": "11", "eleven": "11",
-            "twelfth": "12", "twelve": "12"
-        }
-        
-        for word, number in word_to_number.items():
-            if word in text:
-                return number
-        
-        # Extract any number from text (class 6, grade 7, etc.)
-        number_match = re.search(r'\b(\d+)\b', text)
-        if number_match:
-            class_num = number_match.group(1)
-            if class_num in self.class_roles:
-                return class_num
-        
-        return None
+        return input_validators.extract_class_from_text(text)
     
     async def get_or_create_role(self, guild: discord.Guild, role_name: str) -> Optional[discord.Role]:
-        """Get existing role or create new one"""
+        """Get existing role or create new one (created once even if members verify at the same moment)"""
         try:
-            # Try to find existing role
-            role = discord.utils.get(guild.roles, name=role_name)
-            
-            if not role:
-                # Create new role
-                role = await guild.create_role(
-                    name=role_name,
-                    color=discord.Color.blue(),
-                    mentionable=True,
-                    reason="Auto-created class role by Robo Nexus Bot"
-                )
-                logger.info(f"Created new role: {role_name}")
-            
-            return role
+            return await get_role_registry().get_or_create(
+                guild,
+                role_name,
+                color=discord.Color.blue(),
+                mentionable=True,
+                reason="Auto-created class role by Robo Nexus Bot"
+            )
             
         except Exception as e:
             logger.error(f"Error getting/creating role {role_name}: {e}")
             return None
     
-    async def send_welcome_dm(self, member: discord.Member):
-        """Send welcome DM to new member - Stage 1: Name and Class"""
-        try:
-            embed = discord.Embed(
-                title="🎉 Welcome to Robo Nexus!",
-                description=f"Hi {member.mention}! Welcome to our robotics community!",
-                color=discord.Color.green()
-            )
-            
-            embed.add_field(
-                name="📝 Step 1: Basic Info",
-                value="To get started, please provide:\n\n**1. Your Name**\n**2. Your Class/Grade** (6, 7, 8, 9, 10, 11, or 12)",
-                inline=False
-            )
-            
-            embed.add_field(
-                name="💡 Example Response",
-                value="```\nJohn Smith, Class 10\n```\nor:\n```\nJohn Smith 10th grade\n```",
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🔄 What's Next?",
-                value="After this, I'll ask for:\n• Your birthday\n• Your Gmail address\n• Social media links (including portfolio website)",
-                inline=False
-            )
-            
-            embed.set_footer(text="🔒 Currently you only have access to #self-roles channel")
-            embed.set_thumbnail(url=member.guild.icon.url if member.guild.icon else None)
-            
-            # FIX: Add timeout to member.send() to prevent hanging
-            try:
-                await asyncio.wait_for(member.send(embed=embed), timeout=10.0)
-                logger.info(f"Sent welcome DM to {member.display_name}")
-            except asyncio.TimeoutError:
-                logger.warning(f"Timeout sending DM to {member.display_name}")
-                await self.send_welcome_in_channel(member)
-            
-        except discord.Forbidden:
-            logger.warning(f"Could not send DM to {member.display_name} - DMs disabled")
-            # Try to send in self-roles channel instead
-            await self.send_welcome_in_channel(member)
+    def build_welcome_embed(self, guild: discord.Guild, members: List[discord.Member]) -> discord.Embed:
+        """Welcome message for the self-roles channel, for one member or a batch of joins"""
+        mentions = ", ".join(member.mention for member in members)
+        embed = discord.Embed(
+            title="🎉 Welcome to Robo Nexus!",
+            description=f"Hi {mentions}! Welcome to our robotics community!",
+            color=discord.Color.green()
+        )
+        
+        embed.add_field(
+            name="📝 Step 1: Basic Info",
+            value="To get started, please reply in this channel with:\n\n**1. Your Name**\n**2. Your Class/Grade** (6, 7, 8, 9, 10, 11, or 12)",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="💡 Example Response",
+            value="```\nJohn Smith, Class 10\n```\nor simply:\n```\nJohn Smith 10th grade\n```",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🔄 What's Next?",
+            value="After this, I'll ask for:\n• Your Gmail address\n• Social media links (optional)",
+            inline=False
+        )
+        
+        embed.set_footer(text="🔒 Reply in this channel to complete verification!")
+        embed.set_thumbnail(url=guild.icon.url if guild.icon else None)
+        return embed
     
-    async def send_welcome_in_channel(self, member: discord.Member):
-        """Send welcome message in self-roles channel"""
-        try:
-            self_roles_channel_id = await self.get_self_roles_channel_id()
-            
-            # FIX: Remove hardcoded fallback - let it fail gracefully
-            if not self_roles_channel_id:
-                logger.warning("Self-roles channel not configured, cannot send welcome message")
-                return
-            
-            channel = member.guild.get_channel(self_roles_channel_id)
-            if not channel:
-                logger.error(f"Self-roles channel {self_roles_channel_id} not found")
-                return
-            
+    def build_join_notification_embed(self, guild: discord.Guild, members: List[discord.Member]) -> discord.Embed:
+        """Join notice for the welcome channel, for one member or a batch of joins"""
+        if len(members) == 1:
+            member = members[0]
             embed = discord.Embed(
-                title="🎉 Welcome to Robo Nexus!",
-                description=f"Hi {member.mention}! Welcome to our robotics community!",
-                color=discord.Color.green()
-            )
-            
-            embed.add_field(
-                name="📝 Step 1: Basic Info",
-                value="To get started, please reply in this channel with:\n\n**1. Your Name**\n**2. Your Class/Grade** (6, 7, 8, 9, 10, 11, or 12)",
-                inline=False
-            )
-            
-            embed.add_field(
-                name="💡 Example Response",
-                value="```\nJohn Smith, Class 10\n```\nor simply:\n```\nJohn Smith 10th grade\n```",
-                inline=False
+                title="👋 New Member Joined",
+                description=f"{member.mention} joined the server!",
+                color=discord.Color.blue()
             )
-            
-            embed.add_field(
-                name="🔄 What's Next?",
-                value="After this, I'll ask for:\n• Your Gmail address\n• Social media links (optional)",
-                inline=False
+            embed.set_thumbnail(url=member.display_avatar.url)
+            embed.set_footer(text=f"User ID: {member.id}")
+        else:
+            embed = discord.Embed(
+                title=f"👋 {len(members)} New Members Joined",
+                description=", ".join(member.mention for member in members),
+                color=discord.Color.blue()
             )
-            
-            embed.set_footer(text="🔒 Reply in this channel to complete verification!")
-            embed.set_thumbnail(url=member.guild.icon.url if member.guild.icon else None)
-            
-            await channel.send(embed=embed)
-            logger.info(f"Sent welcome message in #self-roles for {member.display_name}")
-            
-        except Exception as e:
-            logger.error(f"Error sending welcome in channel: {e}")
+            embed.set_footer(text="Joins batched during a join spike")
+        
+        embed.add_field(
+            name="📊 Member Count", 
+            value=f"{guild.member_count} members",
+            inline=True
+        )
+        embed.add_field(
+            name="🔄 Status",
+            value="Starting verification process...",
+            inline=True
+        )
+        return embed
     
     async def send_email_request(self, message: discord.Message, name: str, class_num: str):
         """Send request for Gmail address - Stage 2"""
@@ -506,66 +477,63 @@ class WelcomeSystem(commands.Cog):
         try:
             logger.info(f"New member joined: {member.display_name} ({member.id})")
             
-            # Send welcome message in self-roles channel
-            await self.send_welcome_in_channel(member)
-            
             # Store user as pending
-            self.pending_users[member.id] = {
-                "member": member,
-                "stage": self.STAGE_NAME_CLASS,
-                "joined_at": member.joined_at.isoformat() if member.joined_at else None,
-                "profile": {}
-            }
+            self.verification_store.start(
+                member.id,
+                member.guild.id,
+                self.STAGE_NAME_CLASS,
+                member.joined_at.isoformat() if member.joined_at else None
+            )
             
-            # Send notification to welcome channel if configured
-            welcome_channel_id = await self.get_welcome_channel_id()
-            if welcome_channel_id:
-                channel = member.guild.get_channel(welcome_channel_id)
-                if channel:
-                    embed = discord.Embed(
-                        title="👋 New Member Joined",
-                        description=f"{member.mention} joined the server!",
-                        color=discord.Color.blue()
-                    )
-                    embed.add_field(
-                        name="📊 Member Count", 
-                        value=f"{member.guild.member_count} members",
-                        inline=True
-                    )
-                    embed.add_field(
-                        name="🔄 Status",
-                        value="Starting verification process...",
-                        inline=True
-                    )
-                    embed.set_thumbnail(url=member.display_avatar.url)
-                    embed.set_footer(text=f"User ID: {member.id}")
-                    
-                    await channel.send(embed=embed)
+            # Welcome messages go through the onboarding queue so join bursts don't hit rate limits
+            self.onboarding_queue.submit(member)
             
         except Exception as e:
             logger.error(f"Error handling member join: {e}")
     
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        """Forget half-finished onboarding when a member leaves"""
+        if self.verification_store.remove(member.id):
+            logger.info(f"Dropped pending verification for {member.display_name} ({member.id}), member left")
+    
+    def _message_filter(self, message: discord.Message) -> str:
+        """
+        Classify a message without any I/O
+        
+        Returns:
+            'dispatched' if it belongs to the verification flow, otherwise the reason it was dropped
+        """
+        # Ignore bot messages
+        if message.author.bot:
+            return "bot"
+        
+        # Pending verifications are held in memory by the store
+        if message.author.id not in self.verification_store:
+            return "not_pending"
+        
+        # Only DMs and the self-roles channel are verification answers
+        if isinstance(message.channel, discord.DMChannel):
+            return "dispatched"
+        if self._self_roles_channel_id and message.channel.id == self._self_roles_channel_id:
+            return "dispatched"
+        return "wrong_channel"
+    
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         """Handle messages for multi-stage verification"""
         try:
-            # Ignore bot messages
-            if message.author.bot:
-                return
-            
-            # Check if user is pending verification
-            if message.author.id not in self.pending_users:
-                return
-            
-            # Check if message is in self-roles channel or DM
-            self_roles_channel_id = await self.get_self_roles_channel_id()
-            is_self_roles_channel = (
-                self_roles_channel_id and 
-                message.channel.id == self_roles_channel_id
-            )
-            is_dm = isinstance(message.channel, discord.DMChannel)
-            
-            if not (is_self_roles_channel or is_dm):
+            if not self._self_roles_channel_fresh:
+                # Re-read in the background; the filter uses the last value meanwhile
+                self._refresh_self_roles_channel()
+            
+            result = self._message_filter(message)
+            if result == "wrong_channel" and self._self_roles_channel_id is None:
+                # The setting has never been read: wait for the (backed-off) read rather than drop the answer
+                await self.get_self_roles_channel_id()
+                result = self._message_filter(message)
+            self.messages_counter.inc(result=result)
+            if result != "dispatched":
                 return
             
             # Process based on current stage
@@ -578,8 +546,7 @@ class WelcomeSystem(commands.Cog):
         """Process user's response based on their current verification stage"""
         try:
             user_id = message.author.id
-            user_data = self.pending_users[user_id]
-            current_stage = user_data["stage"]
+            current_stage = self.verification_store.get(user_id).stage
             user_input = message.content.strip()
             
             if current_stage == self.STAGE_NAME_CLASS:
@@ -659,9 +626,7 @@ class WelcomeSystem(commands.Cog):
                 return
             
             # Store name and class, move to birthday stage
-            self.pending_users[member.id]["profile"]["name"] = name
-            self.pending_users[member.id]["profile"]["class"] = class_number
-            self.pending_users[member.id]["stage"] = self.STAGE_BIRTHDAY
+            self.verification_store.update(member.id, self.STAGE_BIRTHDAY, {"name": name, "class": class_number})
             
             # Request birthday
             await self.send_birthday_request(message, name, class_number)
@@ -738,9 +703,10 @@ class WelcomeSystem(commands.Cog):
                 await message.reply(embed=embed, delete_after=60)
                 return
             
-            # Store birthday and register it in the birthday system
-            self.pending_users[member.id]["profile"]["birthday"] = birthday_date
-            self.pending_users[member.id]["stage"] = self.STAGE_EMAIL
+            # Store birthday (as MM-DD, the store only keeps plain values) and register it in the birthday system
+            state = self.verification_store.update(
+                member.id, self.STAGE_EMAIL, {"birthday": birthday_date.strftime('%m-%d')}
+            )
             
             # Register birthday in BOTH the birthday system AND user profile
             try:
@@ -751,9 +717,7 @@ class WelcomeSystem(commands.Cog):
                 from database import add_birthday
                 birthday_success = await add_birthday(member.id, birthday_string)
                 
-                # Also save to user_profiles table (update the pending profile)
-                # This will be saved when the profile is completed
-                self.pending_users[member.id]["profile"]["birthday"] = birthday_string
+                # The user_profiles row gets the birthday from the pending profile when it is completed
                 formatted_date = DateParser.format_birthday(birthday_date)
                 
                 if birthday_success: 
@@ -771,8 +735,8 @@ class WelcomeSystem(commands.Cog):
                 logger.error(f"Error registering birthday during verification: {e}")
             
             # Get user's name and class for the email request
-            name = self.pending_users[member.id]["profile"]["name"]
-            class_number = self.pending_users[member.id]["profile"]["class"]
+            name = state.profile["name"]
+            class_number = state.profile["class"]
             
             # Request email
             await self.send_email_request(message, name, class_number)
@@ -789,8 +753,7 @@ class WelcomeSystem(commands.Cog):
             # Check if user wants to skip
             if email.lower() in ['none', 'no', 'skip', 'n/a', 'na']:
                 # Skip email, move to phone stage
-                self.pending_users[member.id]["profile"]["email"] = None
-                self.pending_users[member.id]["stage"] = self.STAGE_PHONE
+                self.verification_store.update(member.id, self.STAGE_PHONE, {"email": None})
                 
                 # Request phone number
                 await self.send_phone_request(message)
@@ -812,8 +775,7 @@ class WelcomeSystem(commands.Cog):
                 return
             
             # Store email, move to phone stage
-            self.pending_users[member.id]["profile"]["email"] = email
-            self.pending_users[member.id]["stage"] = self.STAGE_PHONE
+            self.verification_store.update(member.id, self.STAGE_PHONE, {"email": email})
             
             # Request phone number
             await self.send_phone_request(message)
@@ -830,8 +792,7 @@ class WelcomeSystem(commands.Cog):
             # Check if user wants to skip
             if phone_input.lower() in ['none', 'no', 'skip', 'n/a', 'na']:
                 # Skip phone, move to links stage
-                self.pending_users[member.id]["profile"]["phone"] = None
-                self.pending_users[member.id]["stage"] = self.STAGE_LINKS
+                self.verification_store.update(member.id, self.STAGE_LINKS, {"phone": None})
                 
                 # Request social links
                 await self.send_links_request(message)
@@ -856,8 +817,7 @@ class WelcomeSystem(commands.Cog):
                 return
             
             # Store phone, move to links stage
-            self.pending_users[member.id]["profile"]["phone"] = formatted_phone
-            self.pending_users[member.id]["stage"] = self.STAGE_LINKS
+            self.verification_store.update(member.id, self.STAGE_LINKS, {"phone": formatted_phone})
             
             # Request social links
             await self.send_links_request(message)
@@ -874,8 +834,7 @@ class WelcomeSystem(commands.Cog):
             social_links = self.validate_social_links(user_input)
             
             # Store links and complete verification
-            self.pending_users[member.id]["profile"]["social_links"] = social_links
-            self.pending_users[member.id]["stage"] = self.STAGE_COMPLETE
+            self.verification_store.update(member.id, self.STAGE_COMPLETE, {"social_links": social_links})
             
             # Complete the verification process
             await self.complete_verification(message)
@@ -886,9 +845,14 @@ class WelcomeSystem(commands.Cog):
     async def complete_verification(self, message: discord.Message):
         """Complete the verification process and assign role"""
         try:
+            state = self.verification_store.get(message.author.id)
+            profile = state.profile
+            
+            # Replies in DMs come from a User; roles need the Member from the guild they joined
             member = message.author
-            user_data = self.pending_users[member.id]
-            profile = user_data["profile"]
+            if not isinstance(member, discord.Member) and state.guild_id:
+                guild = self.bot.get_guild(state.guild_id)
+                member = (guild.get_member(member.id) if guild else None) or member
             
             name = profile["name"]
             class_number = profile["class"]
@@ -934,7 +898,7 @@ class WelcomeSystem(commands.Cog):
                     logger.info(f"✅ User profile saved successfully for {member.display_name}")
                 
                 # Remove from pending users
-                del self.pending_users[member.id]
+                self.verification_store.remove(member.id)
                 
                 # Send completion message
                 embed = discord.Embed(
@@ -1142,7 +1106,7 @@ class WelcomeSystem(commands.Cog):
         profile_count = await self.db.count_user_profiles()
         embed.add_field(
             name="📊 Statistics",
-            value=f"• **{len(self.pending_users)}** users in verification\n• **{profile_count}** completed profiles",
+            value=f"• **{len(self.verification_store)}** users in verification\n• **{profile_count}** completed profiles",
             inline=False
         )
         
@@ -1154,7 +1118,7 @@ class WelcomeSystem(commands.Cog):
         """Collect birthday data from users in self-roles channel"""
         
         # Check if this is being used in the self-roles channel
-        self_roles_channel_id = self.get_self_roles_channel_id()
+        self_roles_channel_id = await self.get_self_roles_channel_id()
         if not self_roles_channel_id or interaction.channel.id != self_roles_channel_id:
             await interaction.response.send_message(
                 "❌ This command can only be used in the self-roles channel.",
@@ -1190,21 +1154,15 @@ class WelcomeSystem(commands.Cog):
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
             
-            # Register the birthday
-            from database import add_birthday
+            # Register the birthday (birthdays table, mirrored onto the user profile)
+            from database import birthday_db
             # Convert date object to MM-DD string format
             birthday_string = birthday.strftime('%m-%d')
-            birthday_success = await add_birthday(interaction.user.id, birthday_string)
+            birthday_success = await birthday_db.set_birthday(interaction.user.id, birthday_string)
             
             if birthday_success:
                 formatted_date = DateParser.format_birthday(birthday)
                 
-                # Also update user profile if it exists
-                user_id_str = str(interaction.user.id)
-                profile = await self.get_user_profile(interaction.user.id)
-                if profile:
-                    await self.update_user_profile(interaction.user.id, {"birthday": birthday.isoformat()})
-                
                 success_embed = discord.Embed(
                     title="🎉 Birthday Registered!",
                     description=f"Your birthday has been set to **{formatted_date}**",
@@ -1244,8 +1202,9 @@ class WelcomeSystem(commands.Cog):
         
         # Class roles
         existing_roles = []
+        registry = get_role_registry()
         for class_num in self.class_roles.keys():
-            role = discord.utils.get(interaction.guild.roles, name=class_num)
+            role = registry.get(interaction.guild, class_num)
             if role:
                 existing_roles.append(f"✅ {class_num}")
             else:
@@ -1261,7 +1220,7 @@ class WelcomeSystem(commands.Cog):
         profile_count = await self.db.count_user_profiles()
         embed.add_field(
             name="📊 Statistics",
-            value=f"**{len(self.pending_users)}** pending verifications\n**{profile_count}** completed profiles",
+            value=f"**{len(self.verification_store)}** pending verifications\n**{profile_count}** completed profiles",
             inline=True
         )
         
@@ -1345,23 +1304,17 @@ class WelcomeSystem(commands.Cog):
             inline=False
         )
         
-        # Check for birthday in profile
-        birthday = profile.get('birthday')
+        # Birthdays table first, profile value as fallback
+        from database import birthday_db
+        birthdays = await birthday_db.get_birthdays_for([user.id], profiles=[profile])
+        birthday = birthdays.get(user.id)
         if birthday:
-            try:
-                from date_parser import DateParser
-                formatted_birthday = DateParser.format_birthday(birthday)
-                embed.add_field(
-                    name="🎂 Birthday",
-                    value=formatted_birthday,
-                    inline=True
-                )
-            except:
-                embed.add_field(
-                    name="🎂 Birthday",
-                    value=birthday,
-                    inline=True
-                )
+            from date_parser import DateParser
+            embed.add_field(
+                name="🎂 Birthday",
+                value=DateParser.format_birthday(birthday),
+                inline=True
+            )
         else:
             embed.add_field(
                 name="🎂 Birthday",
@@ -1396,6 +1349,64 @@ class WelcomeSystem(commands.Cog):
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
+    @app_commands.command(name="find_profile", description="[ADMIN] Search profiles by name, class, email or social handle")
+    @app_commands.describe(query="Words to search for; prefixes and small typos are fine (e.g. 'aar 10')")
+    @app_commands.default_permissions(administrator=True)
+    async def find_profile(self, interaction: discord.Interaction, query: str):
+        """Search member profiles through the in-memory profile index"""
+        
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("❌ Administrator permissions required.", ephemeral=True)
+            return
+        
+        index = get_profile_index()
+        if not index.ready:
+            await interaction.response.defer(ephemeral=True)
+            if not await index.build(self.db):
+                await interaction.followup.send("❌ Could not load profiles. Please try again later.", ephemeral=True)
+                return
+        elif index.stale:
+            # Serve from the current index while a fresh copy is read in the background
+            index.rebuild_in_background(self.db)
+        
+        start = time.perf_counter()
+        results = index.search(query, limit=10)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        if not results:
+            embed = discord.Embed(
+                title="🔍 No Profiles Found",
+                description=f"Nothing matched `{query[:100]}`.",
+                color=discord.Color.orange()
+            )
+        else:
+            embed = discord.Embed(
+                title=f"🔍 Profiles matching \"{query[:100]}\"",
+                color=discord.Color.blue()
+            )
+            for profile, _ in results:
+                member = interaction.guild.get_member(profile.user_id) if interaction.guild else None
+                details = [
+                    f"**Class:** {profile.class_year or 'N/A'}",
+                    f"**Discord:** {member.mention if member else profile.username or profile.user_id}",
+                ]
+                if profile.email:
+                    details.append(f"**Email:** {profile.email}")
+                if profile.handles:
+                    details.append(" • ".join(f"{platform.title()}: {handle}" for platform, handle in profile.handles.items()))
+                embed.add_field(
+                    name=profile.display_name or profile.username or str(profile.user_id),
+                    value="\n".join(details)[:1024],
+                    inline=False
+                )
+        
+        embed.set_footer(text=f"Searched {len(index)} profiles in {elapsed_ms:.2f} ms • /view_profile for details")
+        
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+    
     @app_commands.command(name="check_intents", description="[ADMIN] Check if member intents are enabled")
     @app_commands.default_permissions(administrator=True)
     async def check_intents(self, interaction: discord.Interaction):
@@ -1516,7 +1527,7 @@ class WelcomeSystem(commands.Cog):
             
             # Update class role
             # Remove old class role
-            old_role = discord.utils.get(user.guild.roles, name=old_class)
+            old_role = get_role_registry().get(user.guild, old_class)
             if old_role and old_role in user.roles:
                 await user.remove_roles(old_role, reason="Class updated")
             
@@ -1614,10 +1625,15 @@ class WelcomeSystem(commands.Cog):
         await interaction.followup.send(embed=embed)
         logger.info(f"Profile updated for {user.display_name} by {interaction.user.display_name}: {len(changes)} changes")
     
-    @app_commands.command(name="export_profiles", description="[ADMIN] Export all user profiles to CSV")
+    @app_commands.command(name="export_profiles", description="[ADMIN] Export all user profiles (gzip-compressed)")
+    @app_commands.describe(format="File format (default: CSV)")
+    @app_commands.choices(format=[
+        app_commands.Choice(name="CSV (spreadsheets)", value="csv"),
+        app_commands.Choice(name="JSON Lines (scripts)", value="jsonl")
+    ])
     @app_commands.default_permissions(administrator=True)
-    async def export_profiles(self, interaction: discord.Interaction):
-        """Export all user profiles to a CSV file"""
+    async def export_profiles(self, interaction: discord.Interaction, format: str = "csv"):
+        """Export all user profiles to a compressed CSV or JSON Lines file"""
         
         if not interaction.user.guild_permissions.administrator:
             await interaction.response.send_message("❌ Administrator permissions required.", ephemeral=True)
@@ -1625,112 +1641,238 @@ class WelcomeSystem(commands.Cog):
         
         await interaction.response.defer()
         
+        result = None
         try:
-            import csv
-            import io
+            from database import birthday_db
             
-            all_profiles = await self.db.get_all_user_profiles()
+            # Pages are streamed through gzip into a spooled temp file, never held in memory at once
+            result = await ProfileExporter(self.db, birthday_db, format).export()
             
-            if not all_profiles:
+            if not result.rows:
                 await interaction.followup.send("❌ No profiles to export.", ephemeral=True)
                 return
             
-            # Create CSV in memory
-            output = io.StringIO()
-            writer = csv.writer(output)
-            
-            # Write header
-            writer.writerow([
-                'Name', 'Class', 'Email', 'Phone', 'Birthday',
-                'Discord Username', 'Discord ID', 'Joined At', 'Verified At',
-                'GitHub', 'LinkedIn', 'YouTube', 'Spotify', 'Website'
-            ])
+            limit = interaction.guild.filesize_limit if interaction.guild else 10 * 1024 * 1024
+            if result.size > limit:
+                await interaction.followup.send(
+                    f"❌ Export is {result.size / 1024 / 1024:.1f} MB compressed, over this server's "
+                    f"{limit / 1024 / 1024:.0f} MB upload limit.",
+                    ephemeral=True
+                )
+                return
             
-            # Write data
-            for profile in all_profiles:
-                user_id = profile.get('user_id')
-                
-                # Get birthday from profile or birthday system
-                birthday_str = "Not registered"
-                try:
-                    # First try to get from profile
-                    profile_birthday = profile.get('birthday')
-                    if profile_birthday:
-                        # Parse the birthday string
-                        from date_parser import DateParser
-                        parsed_birthday = DateParser.parse_birthday(profile_birthday)
-                        if parsed_birthday:
-                            birthday_str = parsed_birthday.strftime("%B %d")
-                    else:
-                        # Try to get from birthday system
-                        from database import get_birthday
-                        birthday = await get_birthday(int(user_id))
-                        if birthday:
-                            parsed_birthday = DateParser.parse_birthday(birthday)
-                            if parsed_birthday:
-                                birthday_str = parsed_birthday.strftime("%B %d")
-                except Exception as e:
-                    logger.warning(f"Error getting birthday for user {user_id}: {e}")
-                    pass
-                
-                # Get social links
-                social_links_data = profile.get('social_links', {})
-                if isinstance(social_links_data, str):
-                    social_links_data = json.loads(social_links_data)
-                elif not social_links_data:
-                    social_links_data = {}
-                
-                github = social_links_data.get('github', '')
-                linkedin = social_links_data.get('linkedin', '')
-                youtube = social_links_data.get('youtube', '')
-                spotify = social_links_data.get('spotify', '')
-                website = social_links_data.get('website', '')
-                
-                writer.writerow([
-                    profile.get('display_name', ''),
-                    profile.get('class_year', ''),
-                    profile.get('email', ''),
-                    profile.get('phone', ''),
-                    birthday_str,
-                    profile.get('username', ''),
-                    profile.get('user_id', ''),
-                    profile.get('created_at', ''),
-                    profile.get('updated_at', ''),
-                    github,
-                    linkedin,
-                    youtube,
-                    spotify,
-                    website
-                ])
-            
-            # Convert to bytes
-            output.seek(0)
-            file_content = output.getvalue().encode('utf-8')
-            
-            # Create Discord file
-            from datetime import datetime
-            filename = f"robo_nexus_profiles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            file = discord.File(io.BytesIO(file_content), filename=filename)
+            file = discord.File(result.file, filename=result.filename)
             
             # Send file
             embed = discord.Embed(
                 title="📊 Profiles Exported",
-                description=f"Exported {len(all_profiles)} user profiles",
+                description=f"Exported {result.rows} user profiles",
                 color=discord.Color.green()
             )
             embed.add_field(
                 name="📁 File",
-                value=f"`{filename}`",
+                value=f"`{result.filename}` ({result.size / 1024:.1f} KB)",
                 inline=False
             )
-            embed.set_footer(text="Open with Excel, Google Sheets, or any spreadsheet app")
+            if format == "csv":
+                embed.set_footer(text="Unzip, then open with Excel, Google Sheets, or any spreadsheet app")
+            else:
+                embed.set_footer(text="One JSON object per line; birthdays are MM-DD or null")
             
             await interaction.followup.send(embed=embed, file=file)
-            logger.info(f"Profiles exported by {interaction.user.display_name}: {len(all_profiles)} profiles")
+            logger.info(f"Profiles exported by {interaction.user.display_name}: {result.rows} profiles as {format}")
             
         except Exception as e:
             logger.error(f"Error exporting profiles: {e}")
             await interaction.followup.send(f"❌ Error exporting profiles: {str(e)[:100]}", ephemeral=True)
+        finally:
+            if result:
+                result.close()
+    
+    async def _plan_profile_import(self, data: bytes, filename: str) -> Optional[ImportPlan]:
+        """
+        Validate an upload and diff it against the stored profiles
+        
+        Returns:
+            None if the stored profiles could not be read; diffing against a
+            partial read would plan stored profiles as new and blank their fields
+        """
+        records = []
+        errors = []
+        try:
+            records.extend(read_records(data, filename))
+        except (ValueError, csv.Error, UnicodeDecodeError) as e:
+            errors.append(f"Stopped reading file: {str(e)[:100]}")
+        
+        # Validated column by column, repeated values (classes, skip keywords) only once
+        valid, invalid = validate_records(records)
+        errors.extend(invalid)
+        rows = {}
+        for row in valid:
+            if row.user_id in rows:
+                errors.append(f"Line {row.line_no}: duplicate of line {rows[row.user_id].line_no}, skipped")
+            else:
+                rows[row.user_id] = row
+        
+        existing = {}
+        if rows:
+            profiles = await self.db.get_user_profiles_for_users([str(user_id) for user_id in rows])
+            if profiles is None:
+                return None
+            for profile in profiles:
+                existing[int(profile['user_id'])] = profile
+        return plan_import(rows.values(), existing, errors)
+    
+    def _class_role_changes(self, guild: discord.Guild, changes: List[ProfileChange]) -> List[Tuple[int, str, bool]]:
+        """(user ID, class role name, add) for members whose class is new or different"""
+        planned = []
+        for change in changes:
+            if 'class_year' not in change.changes or not guild.get_member(change.row.user_id):
+                continue
+            new_class = change.row.fields['class_year']
+            planned.append((change.row.user_id, new_class, True))
+            if change.old_class in self.class_roles and change.old_class != new_class:
+                planned.append((change.row.user_id, change.old_class, False))
+        return planned
+    
+    async def _class_role_mutations(self, guild: discord.Guild, planned: List[Tuple[int, str, bool]]) -> List[RoleMutation]:
+        """Resolve planned class role changes, creating each missing class role once"""
+        roles = {}
+        mutations = []
+        for user_id, role_name, add in planned:
+            if (role_name, add) not in roles:
+                roles[(role_name, add)] = await self.get_or_create_role(guild, role_name) if add else get_role_registry().get(guild, role_name)
+            role = roles[(role_name, add)]
+            if role:
+                mutations.append(RoleMutation(guild, user_id, role, add=add, reason="Bulk profile import"))
+        return mutations
+    
+    @app_commands.command(name="import_profiles", description="[ADMIN] Bulk import profiles from a CSV or JSON file")
+    @app_commands.describe(
+        file="CSV (user_id,name,class,email,phone,github,...) or JSON/JSON Lines with the same keys",
+        dry_run="Only report what would change (default: True)"
+    )
+    @app_commands.default_permissions(administrator=True)
+    async def import_profiles(self, interaction: discord.Interaction, file: discord.Attachment, dry_run: bool = True):
+        """Validate, diff and upsert profiles in bulk, then apply class roles through the role queue"""
+        
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("❌ Administrator permissions required.", ephemeral=True)
+            return
+        
+        if not file.filename.lower().endswith(('.csv', '.json', '.jsonl')):
+            await interaction.response.send_message("❌ Please upload a `.csv`, `.json` or `.jsonl` file.", ephemeral=True)
+            return
+        
+        if file.size > self.IMPORT_MAX_BYTES:
+            await interaction.response.send_message(
+                f"❌ File is too large (max {self.IMPORT_MAX_BYTES // 1024 // 1024} MB).",
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        
+        try:
+            plan = await self._plan_profile_import(await file.read(), file.filename)
+            if plan is None:
+                await interaction.followup.send(
+                    "❌ Could not read the stored profiles to compare against. Nothing was imported, please try again.",
+                    ephemeral=True
+                )
+                return
+            guild = interaction.guild
+            written = 0
+            role_result = None
+            
+            if dry_run:
+                role_changes = len(self._class_role_changes(guild, plan.writes))
+            else:
+                # Chunked upserts; in-memory views only learn about chunks that were saved
+                saved = []
+                for start in range(0, len(plan.writes), self.IMPORT_CHUNK_SIZE):
+                    chunk = plan.writes[start:start + self.IMPORT_CHUNK_SIZE]
+                    payloads = []
+                    for change in chunk:
+                        member = guild.get_member(change.row.user_id)
+                        payloads.append(upsert_payload(change, str(member) if member else ''))
+                    if await self.db.bulk_upsert_user_profiles(payloads) == len(payloads):
+                        for change, payload in zip(chunk, payloads):
+                            self._profile_written(change.row.user_id, payload)
+                            self.verification_store.remove(change.row.user_id)
+                        saved.extend(chunk)
+                written = len(saved)
+                
+                mutations = await self._class_role_mutations(guild, self._class_role_changes(guild, saved))
+                role_changes = len(mutations)
+                if mutations:
+                    role_result = await get_role_queue().apply(mutations)
+            
+            if dry_run:
+                title, color = "🧪 Profile Import Dry Run", discord.Color.blue()
+            elif written == len(plan.writes) and not plan.errors:
+                title, color = "✅ Profile Import Complete", discord.Color.green()
+            elif written:
+                title, color = "⚠️ Profile Import Finished With Errors", discord.Color.orange()
+            elif plan.writes:
+                title, color = "❌ Profile Import Failed", discord.Color.red()
+            else:
+                title, color = "ℹ️ Nothing To Import", discord.Color.light_grey()
+            
+            if dry_run:
+                description = f"Would write **{len(plan.writes)}** profile(s) from `{file.filename}`"
+            else:
+                description = f"Wrote **{written}** profile(s) from `{file.filename}`"
+            embed = discord.Embed(title=title, description=description, color=color)
+            embed.add_field(name="🆕 New", value=str(len(plan.new)), inline=True)
+            embed.add_field(name="✏️ Changed", value=str(len(plan.changed)), inline=True)
+            embed.add_field(name="➖ Unchanged", value=str(plan.unchanged), inline=True)
+            
+            if role_result:
+                roles_text = f"{role_result.applied} applied, {role_result.skipped} skipped, {role_result.failed} failed"
+            else:
+                roles_text = f"{role_changes} class role change(s){' would be queued' if dry_run else ''}"
+            embed.add_field(name="🎓 Class Roles", value=roles_text, inline=True)
+            embed.add_field(name="❌ Errors", value=str(len(plan.errors)), inline=True)
+            
+            if not dry_run and written < len(plan.writes):
+                embed.add_field(
+                    name="💾 Save Failures",
+                    value=f"{len(plan.writes) - written} profile(s) could not be saved. Check the logs and re-run the import.",
+                    inline=False
+                )
+            
+            report = [describe_change(change) for change in plan.writes]
+            if report:
+                shown = "\n".join(report[:self.IMPORT_MAX_ROWS_SHOWN])
+                if len(report) > self.IMPORT_MAX_ROWS_SHOWN:
+                    shown += f"\n... and {len(report) - self.IMPORT_MAX_ROWS_SHOWN} more (see attached report)"
+                embed.add_field(name="📋 Changes", value=shown[:1024], inline=False)
+            
+            if plan.errors:
+                shown = "\n".join(plan.errors[:self.IMPORT_MAX_ROWS_SHOWN])
+                if len(plan.errors) > self.IMPORT_MAX_ROWS_SHOWN:
+                    shown += f"\n... and {len(plan.errors) - self.IMPORT_MAX_ROWS_SHOWN} more"
+                embed.add_field(name="⚠️ Row Errors", value=shown[:1024], inline=False)
+            
+            if dry_run and plan.writes:
+                embed.set_footer(text="Nothing was saved. Re-run with dry_run: False to apply these changes.")
+            
+            files = []
+            if len(report) > self.IMPORT_MAX_ROWS_SHOWN or len(plan.errors) > self.IMPORT_MAX_ROWS_SHOWN:
+                text = "\n".join(report + [""] + plan.errors)
+                files.append(discord.File(io.BytesIO(text.encode('utf-8')), filename="profile_import_report.txt"))
+            
+            await interaction.followup.send(embed=embed, files=files, ephemeral=True)
+            logger.info(
+                f"{interaction.user} {'dry-ran' if dry_run else 'ran'} profile import from {file.filename}: "
+                f"{len(plan.new)} new, {len(plan.changed)} changed, {plan.unchanged} unchanged, "
+                f"{len(plan.errors)} errors, {written} written"
+            )
+        
+        except Exception as e:
+            logger.error(f"Error importing profiles: {e}")
+            await interaction.followup.send(f"❌ Error importing profiles: {str(e)[:100]}", ephemeral=True)
     
     @app_commands.command(name="manual_verify", description="[ADMIN] Manually verify a user")
     @app_commands.describe(
@@ -1806,8 +1948,7 @@ class WelcomeSystem(commands.Cog):
             await self.save_user_profile(user.id, profile_data)
             
             # Remove from pending if exists
-            if user.id in self.pending_users:
-                del self.pending_users[user.id]
+            self.verification_store.remove(user.id)
             
             embed = discord.Embed(
                 title="✅ Manual Verification Complete",